@@ -0,0 +1,6 @@
+"""
+Benchmarks package.
+
+This package contains micro-benchmarks for the per-turn hot-path functions,
+with realistic Korean fixtures and stored baselines to catch regressions.
+"""
@@ -0,0 +1,166 @@
+"""
+Realistic, deterministic fixtures for the hot-path benchmarks.
+
+All fixtures are generated from a fixed seed, so every run (and every
+version being compared) benchmarks exactly the same inputs.
+"""
+
+import base64
+import json
+import random
+
+# Seed shared by all fixture generators
+SEED = 20251119
+
+# Everyday Korean utterances of seniors and AI replies (typical lengths)
+SENIOR_SENTENCES = [
+    "오늘은 아침 일찍 일어나서 동네 공원을 한 바퀴 걸었어요.",
+    "요즘 무릎이 시려서 계단 오르기가 좀 힘들어요.",
+    "딸이 어제 전화해서 주말에 손주들 데리고 온대요.",
+    "점심에는 시래기 된장국을 끓여서 밥을 말아 먹었지요.",
+    "밤에 자다가 두세 번은 깨서 화장실에 가요.",
+    "경로당에 가면 친구들이랑 화투도 치고 이야기도 해요.",
+    "혈압약은 아침마다 잊지 않고 꼬박꼬박 챙겨 먹고 있어요.",
+    "텔레비전에서 옛날 노래가 나오니까 젊을 때 생각이 나더라고요.",
+]
+
+AI_SENTENCES = [
+    "아침 산책을 하셨다니 정말 잘하셨어요. 공원에 꽃은 많이 피었던가요?",
+    "무릎이 시리시다니 걱정되네요. 따뜻하게 찜질을 해 보시는 건 어떠세요?",
+    "손주들이 온다니 정말 기다려지시겠어요. 무엇을 해 주고 싶으세요?",
+    "된장국 정말 맛있었겠어요. 직접 끓이시는 비법이 있으신가요?",
+    "밤에 자주 깨시면 피곤하시겠어요. 낮에는 좀 쉬실 수 있으세요?",
+    "친구분들과 즐거운 시간을 보내셨군요. 요즘 어떤 이야기를 많이 나누세요?",
+]
+
+
+def clova_speech_response(segment_count: int = 300) -> dict:
+    """
+    Build a long CLOVA Speech response (about 15 minutes of 2-speaker audio).
+
+    Each segment carries word timings, speaker and diarization info, like the
+    real API does.
+    """
+    rng = random.Random(SEED)
+    segments = []
+    position_ms = 0
+    for i in range(segment_count):
+        text = rng.choice(SENIOR_SENTENCES if i % 2 == 0 else AI_SENTENCES)
+        words = []
+        word_start = position_ms
+        for word in text.split():
+            word_end = word_start + rng.randint(200, 600)
+            words.append([word_start, word_end, word])
+            word_start = word_end + rng.randint(20, 120)
+        label = "1" if i % 2 == 0 else "2"
+        segments.append({
+            "start": position_ms,
+            "end": word_start,
+            "text": text,
+            "confidence": round(rng.uniform(0.8, 0.99), 4),
+            "diarization": {"label": label},
+            "speaker": {"label": label, "name": "A" if label == "1" else "B", "edited": False},
+            "words": words,
+            "textEdited": text,
+        })
+        position_ms = word_start + rng.randint(300, 1500)
+
+    return {
+        "result": "COMPLETED",
+        "message": "Succeeded",
+        "token": "bench-token",
+        "version": "ncp_v2_v2.3.0",
+        "params": {"language": "ko-KR", "completion": "sync"},
+        "progress": 100,
+        "segments": segments,
+        "text": " ".join(seg["text"] for seg in segments),
+        "confidence": 0.93,
+        "speakers": [{"label": "1", "name": "A", "edited": False}, {"label": "2", "name": "B", "edited": False}],
+    }
+
+
+def conversation_turns(turn_count: int = 400) -> list[dict]:
+    """Build a long call transcript, alternating AI and senior turns."""
+    rng = random.Random(SEED + 1)
+    return [
+        {
+            "speaker": "ai" if i % 2 == 0 else "senior",
+            "text": rng.choice(AI_SENTENCES if i % 2 == 0 else SENIOR_SENTENCES),
+        }
+        for i in range(turn_count)
+    ]
+
+
+SENIOR_PROFILE = {"name": "홍길동", "age": 78, "preferences": "가족, 건강, 트로트"}
+
+_ANALYSIS = {
+    "summary": "어르신은 아침 산책과 손주 방문 이야기를 하시며 밝은 모습을 보이셨습니다. 무릎 통증과 수면 문제를 언급하셨습니다.",
+    "mood": "happy",
+    "risk_level": "low",
+}
+
+
+def analysis_outputs() -> dict[str, str]:
+    """
+    LLM analysis outputs hitting each branch of `_parse_analysis_json`.
+
+    Returns:
+        dict[str, str]: "clean" (direct JSON), "fenced" (markdown code block
+                        after prose) and "embedded" (JSON inside long prose,
+                        found by the second regex fallback)
+    """
+    analysis_json = json.dumps(_ANALYSIS, ensure_ascii=False)
+    prose = " ".join(conversation_turns(60)[i]["text"] for i in range(60))
+    return {
+        "clean": analysis_json,
+        "fenced": f"분석 결과는 다음과 같습니다.\n\n```json\n{analysis_json}\n```\n\n참고: {prose}",
+        "embedded": f"{prose}\n분석: {analysis_json}\n{prose}",
+    }
+
+
+def tts_audio(size_kb: int = 240) -> bytes:
+    """Return a deterministic MP3-sized audio payload (about 30 seconds at 64 kbps)."""
+    return random.Random(SEED + 2).randbytes(size_kb * 1024)
+
+
+def tts_data_url(size_kb: int = 240) -> str:
+    """Return the base64 data URL the routers build from the TTS audio."""
+    return f"data:audio/mp3;base64,{base64.b64encode(tts_audio(size_kb)).decode('utf-8')}"
+
+
+QUIZ_CATEGORIES = ["orientation", "memory", "language", "calculation", "attention"]
+
+
+def quiz_definition(question_count: int = 20) -> dict:
+    """Build a quiz definition with answer keys, 4 options per question and one unscored question."""
+    rng = random.Random(SEED + 3)
+    questions = []
+    for i in range(question_count):
+        options = [{"id": f"q{i}_opt{j}", "text": f"보기 {j}"} for j in range(4)]
+        questions.append({
+            "id": f"q{i}",
+            "question": f"문제 {i}",
+            "options": options,
+            "category": QUIZ_CATEGORIES[i % len(QUIZ_CATEGORIES)],
+            "answer": None if i == 0 else rng.choice(options)["id"],
+        })
+    return {"id": "bench_quiz", "title": "벤치마크 퀴즈", "questions": questions}
+
+
+def quiz_submissions(count: int = 10000, question_count: int = 20) -> list[dict[str, str]]:
+    """Build quiz submissions (mostly correct, some questions skipped) for `quiz_definition`."""
+    rng = random.Random(SEED + 4)
+    definition = quiz_definition(question_count)
+    submissions = []
+    for _ in range(count):
+        answers = {}
+        for question in definition["questions"]:
+            roll = rng.random()
+            if roll < 0.05:
+                continue
+            if roll < 0.75 and question["answer"]:
+                answers[question["id"]] = question["answer"]
+            else:
+                answers[question["id"]] = rng.choice(question["options"])["id"]
+        submissions.append(answers)
+    return submissions
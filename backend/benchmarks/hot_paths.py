@@ -0,0 +1,242 @@
+"""
+Micro-benchmarks for the functions that run on every conversation turn.
+
+Each benchmark is expressed relative to a fixed calibration workload of the
+same kind, so stored baselines stay comparable across machines of different
+speeds: interpreter-bound benchmarks to a pure-Python workload, and the
+numpy-bound ones (NUMPY_BENCHMARKS) to a numpy workload, as the speed of
+vectorized array code and of the interpreter vary independently across
+machines. Benchmark and calibration are timed in alternating rounds, and the
+median of the per-round ratios is compared with the baseline: a noisy
+neighbour or a CPU frequency change during one round does not move it.
+
+Before comparing, the stability of each calibrated ratio is checked: its
+uncertainty (interquartile range of the per-round ratios over their median,
+divided by the square root of the number of rounds) must stay within
+--max-uncertainty, a third of the threshold by default. Otherwise the machine
+is too noisy for the threshold to mean anything, and the run exits with
+status 2 instead of reporting regressions.
+
+Usage (from the backend directory):
+    python -m benchmarks.hot_paths                      # compare with baselines, exit 1 on regression
+    python -m benchmarks.hot_paths --threshold 0.25     # stricter gate on a quiet machine
+    python -m benchmarks.hot_paths --rounds 31          # more rounds on a noisy machine
+    python -m benchmarks.hot_paths --filter parse       # run a subset
+    python -m benchmarks.hot_paths --update-baseline    # store current results as the baseline
+"""
+
+import argparse
+import base64
+import json
+import math
+import os
+import statistics
+import sys
+import timeit
+from collections.abc import Callable
+
+import numpy as np
+
+from benchmarks import fixtures
+from models.conversation import ConversationReplyResponse
+from services.clova_speech import _extract_transcript
+from services.clova_studio import _build_conversation_prompt, _parse_analysis_json, format_transcript
+from services.quiz_scoring import AnswerKey
+
+BASELINE_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), "baselines.json")
+
+# Number of context turns the conversation router passes to generate_reply
+MAX_CONTEXT_TURNS = 10
+
+# Minimum duration of one timed batch of calls, in seconds
+MIN_BATCH_SECONDS = 0.05
+
+# Benchmarks dominated by vectorized numpy code, calibrated with the numpy workload
+NUMPY_BENCHMARKS = frozenset({"quiz_score_batch_10k"})
+
+
+def _calibration_workload() -> None:
+    # Mix of the operations the hot paths are made of: dict access, string
+    # formatting and joining, JSON parsing
+    data = [{"speaker": "ai", "text": f"문장 {i}"} for i in range(200)]
+    "\n".join(f"{item['speaker']}: {item['text']}" for item in data)
+    json.loads(json.dumps(data, ensure_ascii=False))
+
+
+def _make_numpy_calibration_workload() -> Callable[[], object]:
+    # Operations the vectorized scoring is made of: element-wise comparison of
+    # an int8 matrix, a float32 matrix product and reductions
+    rng = np.random.default_rng(0)
+    matrix = rng.integers(0, 4, size=(10000, 20), dtype=np.int8)
+    row = rng.integers(0, 4, size=20, dtype=np.int8)
+    weights = rng.random((20, 4), dtype=np.float32)
+
+    def workload() -> None:
+        products = (matrix == row).astype(np.float32) @ weights
+        products.sum(axis=1) / weights.sum(axis=0).max()
+
+    return workload
+
+
+def build_benchmarks() -> dict[str, Callable[[], object]]:
+    """Create the benchmark callables, with fixtures built once up front."""
+    speech_response = fixtures.clova_speech_response(300)
+    turns = fixtures.conversation_turns(400)
+    context_turns = turns[-MAX_CONTEXT_TURNS:]
+    analysis_outputs = fixtures.analysis_outputs()
+    audio = fixtures.tts_audio(240)
+    tts_url = fixtures.tts_data_url(240)
+    reply_payload = {
+        "success": True,
+        "ai_text": fixtures.AI_SENTENCES[0],
+        "senior_text": fixtures.SENIOR_SENTENCES[0],
+        "tts_url": tts_url,
+        "message": "Reply processed successfully",
+    }
+    reply_model = ConversationReplyResponse(**reply_payload)
+    answer_key = AnswerKey.from_definition(fixtures.quiz_definition(20))
+    quiz_submissions = fixtures.quiz_submissions(10000, 20)
+    encoded_submissions = answer_key.encode_batch(quiz_submissions)
+
+    return {
+        "extract_transcript_300_segments": lambda: _extract_transcript(speech_response),
+        "parse_analysis_clean": lambda: _parse_analysis_json(analysis_outputs["clean"]),
+        "parse_analysis_fenced": lambda: _parse_analysis_json(analysis_outputs["fenced"]),
+        "parse_analysis_embedded": lambda: _parse_analysis_json(analysis_outputs["embedded"]),
+        "build_conversation_prompt": lambda: _build_conversation_prompt(context_turns, fixtures.SENIOR_PROFILE),
+        "format_transcript_400_turns": lambda: format_transcript(turns),
+        "tts_data_url_240kb": lambda: f"data:audio/mp3;base64,{base64.b64encode(audio).decode('utf-8')}",
+        "reply_response_validate_240kb": lambda: ConversationReplyResponse.model_validate(reply_payload),
+        "reply_response_serialize_240kb": lambda: reply_model.model_dump_json(),
+        "quiz_score_single": lambda: answer_key.score(quiz_submissions[0]),
+        "quiz_score_batch_10k": lambda: answer_key.score_batch(encoded_submissions),
+    }
+
+
+def _batch_size(timer: timeit.Timer) -> int:
+    # Smallest power-of-ten multiple of 1, 2 or 5 calls lasting MIN_BATCH_SECONDS
+    number = 1
+    while True:
+        for factor in (1, 2, 5):
+            if timer.timeit(number * factor) >= MIN_BATCH_SECONDS:
+                return number * factor
+        number *= 10
+
+
+def measure(func: Callable[[], object], calibration: Callable[[], object], rounds: int) -> dict[str, float]:
+    """
+    Time a benchmark against the calibration workload in alternating rounds.
+
+    Args:
+        func: Benchmark callable
+        calibration: Calibration workload
+        rounds: Number of rounds (each times both once)
+
+    Returns:
+        dict[str, float]: Median time per call in µs ("us_per_call"), median
+            of the per-round benchmark/calibration ratios ("relative"), its
+            uncertainty ("uncertainty") and the median calibration time in
+            µs ("calibration_us")
+    """
+    timer, calibration_timer = timeit.Timer(func), timeit.Timer(calibration)
+    number, calibration_number = _batch_size(timer), _batch_size(calibration_timer)
+
+    seconds, calibrations = [], []
+    for _ in range(rounds):
+        calibrations.append(calibration_timer.timeit(calibration_number) / calibration_number)
+        seconds.append(timer.timeit(number) / number)
+
+    ratios = [s / c for s, c in zip(seconds, calibrations)]
+    relative = statistics.median(ratios)
+    quartiles = statistics.quantiles(ratios, n=4)
+    return {
+        "us_per_call": statistics.median(seconds) * 1e6,
+        "relative": relative,
+        "uncertainty": (quartiles[2] - quartiles[0]) / relative / math.sqrt(rounds),
+        "calibration_us": statistics.median(calibrations) * 1e6,
+    }
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Benchmark the per-turn hot-path functions")
+    parser.add_argument("--filter", help="Only run benchmarks whose name contains this string")
+    parser.add_argument("--rounds", type=int, default=21, help="Alternating benchmark/calibration rounds")
+    parser.add_argument("--threshold", type=float, default=0.5, help="Allowed slowdown ratio vs baseline")
+    parser.add_argument("--max-uncertainty", type=float,
+                        help="Largest uncertainty of a calibrated ratio accepted for the comparison "
+                             "(default: a third of the threshold)")
+    parser.add_argument("--update-baseline", action="store_true")
+    parser.add_argument("--baseline", default=BASELINE_PATH)
+    args = parser.parse_args()
+    max_uncertainty = args.max_uncertainty if args.max_uncertainty is not None else args.threshold / 3
+
+    benchmarks = build_benchmarks()
+    if args.filter:
+        benchmarks = {name: func for name, func in benchmarks.items() if args.filter in name}
+
+    workloads = {"python": _calibration_workload, "numpy": _make_numpy_calibration_workload()}
+    results: dict[str, dict] = {}
+    calibrations: dict[str, list[float]] = {kind: [] for kind in workloads}
+    unstable = []
+    for name, func in benchmarks.items():
+        kind = "numpy" if name in NUMPY_BENCHMARKS else "python"
+        measurement = measure(func, workloads[kind], args.rounds)
+        if measurement["uncertainty"] > max_uncertainty:
+            unstable.append(f"{name}: uncertainty {measurement['uncertainty']:.1%}")
+        results[name] = {
+            "us_per_call": measurement["us_per_call"],
+            "relative": measurement["relative"],
+            "calibration": kind,
+        }
+        calibrations[kind].append(measurement["calibration_us"])
+    calibration_us = {kind: statistics.median(values) for kind, values in calibrations.items() if values}
+    for kind, value in calibration_us.items():
+        print(f"{kind} calibration: {value:.1f} µs per workload")
+    print()
+
+    baseline: dict = {}
+    stored_calibration_us: dict = {}
+    if os.path.exists(args.baseline):
+        with open(args.baseline, encoding="utf-8") as f:
+            stored = json.load(f)
+        baseline = stored["benchmarks"]
+        # Older baselines stored a single pure-Python calibration time
+        stored_calibration_us = stored.get("calibration_us") if isinstance(stored.get("calibration_us"), dict) else {}
+
+    regressions = []
+    print(f"{'benchmark':<34}{'µs/call':>12}{'relative':>11}{'baseline':>11}{'change':>9}")
+    for name, result in results.items():
+        line = f"{name:<34}{result['us_per_call']:>12.1f}{result['relative']:>11.4f}"
+        if name in baseline and baseline[name].get("calibration", "python") != result["calibration"]:
+            # Ratios to different workloads are not comparable
+            line += f"{'(recorded with another calibration, update the baseline)':>31}"
+        elif name in baseline:
+            change = result["relative"] / baseline[name]["relative"] - 1
+            line += f"{baseline[name]['relative']:>11.4f}{change:>+9.1%}"
+            if change > args.threshold:
+                regressions.append(f"{name} is {change:.1%} slower than baseline")
+        print(line)
+
+    if unstable:
+        # Ratios measured on an unsteady machine are not comparable
+        for item in unstable:
+            print(f"⚠️  {item}")
+        print(f"\n⚠️  Machine too noisy for a reliable comparison (max uncertainty {max_uncertainty:.1%}); "
+              f"rerun on a quieter machine or with more --rounds")
+        sys.exit(2)
+
+    if args.update_baseline:
+        merged = {**baseline, **results}
+        with open(args.baseline, "w", encoding="utf-8") as f:
+            json.dump({"calibration_us": {**stored_calibration_us, **calibration_us}, "benchmarks": merged}, f, indent=2)
+            f.write("\n")
+        print(f"\n✅ Baseline updated: {args.baseline}")
+        return
+
+    for regression in regressions:
+        print(f"❌ {regression}")
+    sys.exit(1 if regressions else 0)
+
+
+if __name__ == "__main__":
+    main()
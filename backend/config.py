@@ -37,6 +37,9 @@ class Settings(BaseSettings):
     
     google_tts_voice_name: str | None = None
     """Voice name for Google TTS"""
+
+    google_tts_endpoint: str | None = None
+    """Optional custom Google TTS endpoint (e.g., http://127.0.0.1:9103 for a local fake)"""
     
 
     
@@ -57,10 +60,209 @@ class Settings(BaseSettings):
     clova_studio_request_id: str | None = None
     """Request ID for Clova Studio"""
     
+    clova_studio_max_concurrency: int = 10
+    """Concurrent CLOVA Studio requests allowed by the account's quota (0 disables the upstream scheduler)"""
+    
     # Backend security
     backend_api_key: str | None = None
     """API key for backend authentication"""
     
+    signing_key: str | None = None
+    """Secret for signing the IDs issued to clients (e.g., adaptive quiz IDs); defaults to the backend API key"""
+
+    # Upstream record/replay settings
+    upstream_fixture_mode: str = "off"
+    """Upstream fixture mode: "off", "record" (capture exchanges) or "replay" (serve them)"""
+
+    upstream_fixture_path: str = "fixtures/upstream.jsonl"
+    """JSON Lines file holding recorded upstream exchanges"""
+
+    upstream_replay_latency: str = "recorded"
+    """Replay latency: "recorded" to reproduce recorded timings, or a fixed value in milliseconds"""
+
+    # Upstream scheduler settings
+    upstream_interactive_reserve: float = 0.3
+    """Share of an upstream's concurrency kept for interactive requests; background work only uses the rest"""
+    background_worker_threads: int = 2
+    """Threads running blocking background work (e.g., quiz pool refills), apart from the default executor"""
+
+    # Admission control settings
+    admission_enabled: bool = True
+    """Reject new calls (/conversation/start) with 503 + Retry-After when the instance is overloaded"""
+
+    admission_capacity: int = 32
+    """Conversation requests the instance serves concurrently at nominal latency"""
+
+    admission_start_threshold: float = 0.75
+    """Share of admission_capacity in flight above which new calls are rejected, keeping the rest for calls in progress"""
+
+    admission_max_queue_seconds: float = 5.0
+    """Estimated queue time above which new calls are rejected"""
+
+    admission_ewma_alpha: float = 0.2
+    """Weight of the latest request in the moving average of each endpoint's duration"""
+
+    # Rate limiting settings
+    rate_limit_enabled: bool = True
+    """Reject conversation requests over the per-senior and per-client (IP address) rate limits with 429 + Retry-After"""
+
+    rate_limit_reply_per_minute: float = 20.0
+    """/conversation/reply requests and /conversation/stream connections per minute allowed per senior"""
+
+    rate_limit_reply_burst: int = 5
+    """/conversation/reply requests and /conversation/stream connections allowed at once after a pause"""
+
+    rate_limit_call_per_minute: float = 6.0
+    """/conversation/start and /conversation/end requests per minute allowed per senior (each)"""
+
+    rate_limit_call_burst: int = 3
+    """/conversation/start and /conversation/end requests allowed at once after a pause"""
+
+    rate_limit_ip_factor: float = 5.0
+    """Multiplier of the per-senior limits for each client IP address (devices behind one NAT share them)"""
+
+    rate_limit_proxy_hops: int = 1
+    """X-Forwarded-For entries appended by trusted proxies (1 on Cloud Run); 0 to use the connection's address"""
+
+    rate_limit_call_ttl_seconds: float = 21600.0
+    """How long the senior of a call is remembered before it is looked up in Firestore again"""
+
+    rate_limit_backend: str = "memory"
+    """Token bucket store: "memory" (per process) or "redis" (shared by all workers; requires the redis package)"""
+
+    rate_limit_redis_url: str | None = None
+    """Redis URL of the redis rate limit backend (e.g., redis://10.0.0.3:6379/0)"""
+
+    rate_limit_cache_size: int = 100_000
+    """Token buckets (and calls) kept by the memory rate limit backend"""
+
+    # Startup and connection settings
+    warmup_enabled: bool = True
+    """Pre-warm Firestore and upstream connections at startup (/health/ready waits for it)"""
+
+    warmup_timeout_seconds: float = 10.0
+    """Timeout of each warm-up probe"""
+
+    warmup_retry_seconds: float = 5.0
+    """Delay before probing components that failed to warm up again (0 to give up)"""
+
+    upstream_keepalive_seconds: float = 0.0
+    """Interval of keep-alive probes once warm, to keep idle connections open (0 disables them)"""
+
+    upstream_idle_connection_seconds: float = 60.0
+    """How long an idle pooled upstream HTTP connection is kept open"""
+
+    # Quiz settings
+    quiz_catalog_source: str = "file"
+    """Where quiz definitions are loaded from: "file" (bundled JSON) or "firestore" (quizzes collection)"""
+
+    quiz_catalog_path: str = "data/quizzes.json"
+    """Bundled quiz catalog file, relative to the backend directory"""
+
+    quiz_cache_max_age: int = 300
+    """Cache-Control max-age (seconds) for quiz responses; clients revalidate with ETag afterwards"""
+
+    quiz_bank_path: str = "data/question_bank.json"
+    """Bundled question bank (questions with category, difficulty and answer), relative to the backend directory"""
+
+    quiz_questions_per_category: int = 1
+    """Questions per category in a quiz assembled from the question bank"""
+
+    quiz_selection_cache_size: int = 10000
+    """Seniors whose quiz selection state (seen questions, category accuracy) is kept in memory"""
+
+    quiz_seen_flush_seconds: float = 5.0
+    """Delay before seen-question updates are written to Firestore (updates made meanwhile are written in one batch)"""
+
+    quiz_id_max_age_seconds: int = 86400
+    """How long an assembled quiz can be submitted after it was issued"""
+
+    quiz_audio_dir: str = "quiz_audio"
+    """Directory of the pre-synthesized quiz audio bundle, relative to the backend directory"""
+
+    quiz_pool_enabled: bool = False
+    """Run the background job that syncs generated questions into the question bank and tops up the pool"""
+
+    quiz_generation_model: str = "HCX-007"
+    """CLOVA Studio model used for quiz generation (must support structured outputs)"""
+
+    quiz_generation_batch_size: int = 6
+    """Questions requested per CLOVA Studio generation call"""
+
+    quiz_pool_target_per_category: int = 30
+    """Questions per category (bundled plus generated) the background generator keeps in the bank"""
+
+    quiz_pool_interval_seconds: float = 600.0
+    """Seconds between question pool syncs / top-ups"""
+
+    quiz_trend_window: int = 10
+    """Number of recent submissions kept in a senior's quiz trend aggregate"""
+
+    quiz_ewma_alpha: float = 0.3
+    """Smoothing factor of the quiz score EWMAs (weight of the newest submission)"""
+
+    quiz_decline_threshold: float = 0.2
+    """Drop of recent accuracy below the accuracy of earlier submissions that is flagged as a decline"""
+
+    quiz_decline_min_attempts: int = 5
+    """Quiz submissions before the recent window required before decline detection is applied"""
+
+    # Conversation storage settings
+    turn_storage: str = "documents"
+    """Conversation turn layout: "documents" (one document per turn) or "chunks" (turns appended to chunk documents)"""
+
+    turn_chunk_max_turns: int = 50
+    """Maximum number of turns per chunk document (chunks turn storage)"""
+
+    turn_chunk_max_bytes: int = 256_000
+    """Approximate maximum size of the turns of a chunk document, in bytes (Firestore documents are limited to 1 MiB)"""
+
+    # Call history settings
+    history_page_size: int = 20
+    """Default number of calls or turns per page of the call history endpoints"""
+
+    history_max_page_size: int = 100
+    """Maximum page size clients may request from the call history endpoints"""
+
+    export_page_size: int = 100
+    """Calls (and turns) read per Firestore query by transcript exports"""
+
+    risk_feed_cache_seconds: float = 30.0
+    """How long a page of the cross-senior risk feed is served from memory"""
+
+    risk_feed_cache_size: int = 256
+    """Risk feed pages (distinct filters and cursors) kept in memory"""
+
+    # Speculative reply settings
+    speculative_replies_enabled: bool = True
+    """Start generating the reply from partial transcripts of /conversation/stream before the final transcript"""
+
+    speculative_min_chars: int = 4
+    """Minimum length of a partial transcript (without spaces) that may start a speculative reply"""
+
+    speculative_match_threshold: float = 0.9
+    """Similarity (0-1) the final transcript must keep with the speculated one for the speculative reply to be used"""
+
+    # Usage accounting settings
+    usage_calls_cache_size: int = 10_000
+    """Calls whose usage aggregate is kept in memory until /end persists it"""
+
+    usage_seniors_cache_size: int = 10_000
+    """Seniors whose usage totals are kept in memory"""
+
+    usage_max_turns_per_call: int = 100
+    """Turns of a call whose individual usage is stored with the call's aggregate"""
+
+    # Monitoring settings
+    metrics_cache_seconds: float = 1.0
+    """How long a rendered /metrics exposition is reused before re-rendering"""
+
+    profile_output_dir: str = "profiles"
+    """Directory where on-demand request profiles (folded stacks) are written"""
+
+    profile_sample_interval_ms: float = 5.0
+    """Sampling interval of the on-demand request profiler, in milliseconds"""
+
     model_config = SettingsConfigDict(
         env_file=".env",
         env_file_encoding="utf-8",
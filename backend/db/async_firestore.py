@@ -0,0 +1,421 @@
+"""
+Async Firestore data access for async route handlers.
+
+The helpers in db/firestore_client.py use the synchronous Firestore client,
+which blocks the event loop for the whole round trip when called from an
+async handler. This module provides the conversation and quiz operations on
+the Firestore AsyncClient instead, so Firestore latency of one request
+overlaps with the work of others. Documents and layouts (including the
+chunked turn storage, defined in db/firestore_client.py) are the same, so
+both clients can be used on the same data.
+
+Batch and transaction helpers:
+    batch()                   a write batch, committed with `await batch.commit()`
+    run_transaction(fn)       run `async fn(transaction)` in a retried transaction
+
+The SDK is imported and the client created on first use, inside the running
+event loop.
+"""
+
+import os
+import threading
+from collections.abc import Awaitable, Callable
+from typing import TYPE_CHECKING, TypeVar
+
+from config import settings
+from db.firestore_client import (
+    WARMUP_DOCUMENT_ID,
+    initialize_firebase,
+    latest_chunk_query,
+    new_chunk_turn,
+    plan_chunk_append,
+)
+
+if TYPE_CHECKING:
+    from google.cloud.firestore import AsyncClient
+    from google.cloud.firestore_v1.async_batch import AsyncWriteBatch
+    from google.cloud.firestore_v1.async_transaction import AsyncTransaction
+
+T = TypeVar("T")
+
+_client: 'AsyncClient | None' = None
+_client_lock = threading.Lock()
+
+
+def get_async_db() -> 'AsyncClient':
+    """Return the async Firestore client, importing the SDK and creating it on first use."""
+    global _client
+    if _client is None:
+        with _client_lock:
+            if _client is None:
+                if os.environ.get("FIRESTORE_EMULATOR_HOST"):
+                    from google.auth.credentials import AnonymousCredentials
+                    from google.cloud.firestore import AsyncClient
+
+                    _client = AsyncClient(
+                        project=settings.google_project_id or "demo-cooltiger",
+                        credentials=AnonymousCredentials(),
+                    )
+                else:
+                    from firebase_admin import firestore_async
+
+                    initialize_firebase()
+                    _client = firestore_async.client()
+    return _client
+
+
+async def ping(timeout: float | None = None) -> None:
+    """
+    Make a minimal Firestore round trip on the async client.
+
+    Async counterpart of db.firestore_client.ping.
+
+    Args:
+        timeout: Deadline of the read, in seconds (it is not retried)
+    """
+    await get_async_db().collection('seniors').document(WARMUP_DOCUMENT_ID).get(retry=None, timeout=timeout)
+
+
+def batch() -> 'AsyncWriteBatch':
+    """
+    Create a write batch (up to 500 writes, committed atomically).
+
+    Example:
+        >>> write_batch = batch()
+        >>> write_batch.set(ref, {"status": "done"})
+        >>> await write_batch.commit()
+    """
+    return get_async_db().batch()
+
+
+async def run_transaction(fn: Callable[['AsyncTransaction'], Awaitable[T]]) -> T:
+    """
+    Run `fn` in a transaction, retrying it on contention.
+
+    All reads in `fn` must happen before its writes, and `fn` may run more
+    than once.
+
+    Args:
+        fn: Async function receiving the transaction
+
+    Returns:
+        The value returned by `fn`
+
+    Example:
+        >>> async def _increment(transaction):
+        ...     snapshot = await ref.get(transaction=transaction)
+        ...     transaction.update(ref, {"count": snapshot.get("count") + 1})
+        >>> await run_transaction(_increment)
+    """
+    from google.cloud.firestore_v1 import async_transactional
+
+    return await async_transactional(fn)(get_async_db().transaction())
+
+
+def _call_ref(senior_id: str, call_id: str):
+    return get_async_db().collection('seniors').document(senior_id).collection('calls').document(call_id)
+
+
+async def create_call_doc(senior_id: str) -> str:
+    """
+    Create a new call document for a senior.
+
+    Creates a document under the path seniors/{senior_id}/calls with initial
+    fields including the senior ID and start timestamp.
+
+    Args:
+        senior_id: The unique identifier for the senior
+
+    Returns:
+        str: The newly created call document ID (callId)
+
+    Example:
+        >>> call_id = await create_call_doc("senior_123")
+    """
+    from google.cloud.firestore_v1 import SERVER_TIMESTAMP
+
+    call_ref = get_async_db().collection('seniors').document(senior_id).collection('calls').document()
+
+    await call_ref.set({
+        'seniorId': senior_id,
+        'startedAt': SERVER_TIMESTAMP,
+    })
+
+    return call_ref.id
+
+
+async def call_exists(senior_id: str, call_id: str) -> bool:
+    """
+    Check whether a call document exists under a senior.
+
+    Args:
+        senior_id: The unique identifier for the senior
+        call_id: The call document ID
+
+    Returns:
+        bool: True if seniors/{senior_id}/calls/{call_id} exists
+
+    Example:
+        >>> if not await call_exists("senior_123", "call_456"): ...
+    """
+    snapshot = await _call_ref(senior_id, call_id).get(field_paths=['seniorId'])
+    return snapshot.exists
+
+
+async def append_turn(senior_id: str, call_id: str, speaker: str, text: str) -> None:
+    """
+    Append a conversation turn to a call.
+
+    With the "documents" turn storage, adds a new turn document under
+    seniors/{senior_id}/calls/{call_id}/turns. With "chunks", appends the turn
+    to the call's latest turn chunk, or starts a new chunk when the latest one
+    is full; the chunk is picked in a transaction, so turns are never lost or
+    reordered.
+
+    Args:
+        senior_id: The unique identifier for the senior
+        call_id: The call document ID
+        speaker: Identifier for who is speaking (e.g., "senior", "ai")
+        text: The text content of what was said
+
+    Example:
+        >>> await append_turn("senior_123", "call_456", "senior", "Hello, how are you?")
+    """
+    from google.cloud.firestore_v1 import SERVER_TIMESTAMP
+
+    call_ref = _call_ref(senior_id, call_id)
+
+    if settings.turn_storage != 'chunks':
+        await call_ref.collection('turns').add({
+            'speaker': speaker,
+            'text': text,
+            'timestamp': SERVER_TIMESTAMP,
+        })
+        return
+
+    turn = new_chunk_turn(speaker, text)
+    chunks_ref = call_ref.collection('turnChunks')
+
+    async def _append(transaction: 'AsyncTransaction') -> None:
+        latest = [snapshot async for snapshot in latest_chunk_query(chunks_ref).stream(transaction=transaction)]
+        new_chunk_id, fields = plan_chunk_append(latest[0] if latest else None, turn)
+        if new_chunk_id is None:
+            transaction.update(latest[0].reference, fields)
+        else:
+            transaction.set(chunks_ref.document(new_chunk_id), fields)
+
+    await run_transaction(_append)
+
+
+async def get_all_turns(senior_id: str, call_id: str) -> list[dict]:
+    """
+    Retrieve all conversation turns for a call, in chronological order.
+
+    Reads the turn chunks of the call if it has any (one read per chunk),
+    otherwise its per-turn documents ordered by timestamp.
+
+    Args:
+        senior_id: The unique identifier for the senior
+        call_id: The call document ID
+
+    Returns:
+        list[dict]: Turns with speaker, text, and timestamp (ISO format string)
+
+    Example:
+        >>> turns = await get_all_turns("senior_123", "call_456")
+    """
+    call_ref = _call_ref(senior_id, call_id)
+
+    turns = []
+    # Chunks are read whatever the current layout (see db.firestore_client)
+    async for snapshot in call_ref.collection('turnChunks').order_by('__name__').stream():
+        turns.extend(dict(turn) for turn in snapshot.get('turns'))
+
+    if not turns:
+        turns = [doc.to_dict() async for doc in call_ref.collection('turns').order_by('timestamp').stream()]
+
+    for turn_data in turns:
+        # Convert Firestore timestamp to ISO format string for JSON serialization
+        if 'timestamp' in turn_data and turn_data['timestamp']:
+            turn_data['timestamp'] = turn_data['timestamp'].isoformat()
+
+    return turns
+
+
+async def finalize_call(
+    senior_id: str,
+    call_id: str,
+    summary: str,
+    mood: str,
+    risk_level: str,
+    usage: dict | None = None,
+) -> None:
+    """
+    Finalize a call with summary information.
+
+    Updates the call document with end timestamp and analysis results including
+    summary, mood assessment, and risk level evaluation.
+
+    Args:
+        senior_id: The unique identifier for the senior
+        call_id: The call document ID
+        summary: Summary of the conversation
+        mood: Assessed mood of the senior
+        risk_level: Risk assessment level ("low", "medium" or "high")
+        usage: Usage aggregate of the call (monitoring.usage.pop_call_usage),
+               stored in the `usage` field when given
+
+    Example:
+        >>> await finalize_call("senior_123", "call_456", "Pleasant conversation", "happy", "low")
+    """
+    from google.cloud.firestore_v1 import SERVER_TIMESTAMP
+
+    fields = {
+        'endedAt': SERVER_TIMESTAMP,
+        'summary': summary,
+        'mood': mood,
+        'riskLevel': risk_level,
+    }
+    if usage is not None:
+        fields['usage'] = usage
+    await _call_ref(senior_id, call_id).update(fields)
+
+
+async def record_quiz_submission(
+    senior_id: str,
+    submission: dict,
+    update_stats: Callable[[dict | None], dict],
+) -> tuple[str, dict]:
+    """
+    Store a quiz submission and update the senior's quiz aggregate atomically.
+
+    Submissions are append-only documents under seniors/{senior_id}/quizzes
+    (auto IDs, so repeated attempts of a quiz are all kept). The aggregate at
+    seniors/{senior_id}/stats/quiz is read and rewritten in the same
+    transaction, so concurrent submissions never lose an update, and retries
+    on contention wait without blocking the event loop.
+
+    Args:
+        senior_id: The unique identifier for the senior
+        submission: Submission document to store
+        update_stats: Computes the new aggregate from the current one (None
+                      if the senior has no aggregate yet); may be re-run if
+                      the transaction is retried
+
+    Returns:
+        tuple[str, dict]: The submission document ID and the new aggregate
+
+    Example:
+        >>> submission_id, stats = await record_quiz_submission(
+        ...     "senior_123",
+        ...     {"quizId": "quiz_001", "score": 0.5, "submittedAt": SERVER_TIMESTAMP},
+        ...     lambda current: {"attempts": (current or {}).get("attempts", 0) + 1},
+        ... )
+    """
+    from google.cloud.firestore_v1 import SERVER_TIMESTAMP
+
+    senior_ref = get_async_db().collection('seniors').document(senior_id)
+    submission_ref = senior_ref.collection('quizzes').document()
+    stats_ref = senior_ref.collection('stats').document('quiz')
+
+    async def _record(transaction: 'AsyncTransaction') -> dict:
+        snapshot = await stats_ref.get(transaction=transaction)
+        stats = update_stats(snapshot.to_dict() if snapshot.exists else None)
+        transaction.create(submission_ref, submission)
+        transaction.set(stats_ref, {**stats, 'updatedAt': SERVER_TIMESTAMP})
+        return stats
+
+    stats = await run_transaction(_record)
+    return submission_ref.id, stats
+
+
+async def get_quiz_stats(senior_id: str) -> dict | None:
+    """
+    Retrieve a senior's quiz trend aggregate.
+
+    Args:
+        senior_id: The unique identifier for the senior
+
+    Returns:
+        dict | None: The aggregate document, or None if the senior has not
+                     submitted any quiz yet
+
+    Example:
+        >>> stats = await get_quiz_stats("senior_123")
+    """
+    snapshot = await (
+        get_async_db().collection('seniors')
+        .document(senior_id)
+        .collection('stats')
+        .document('quiz')
+        .get()
+    )
+    return snapshot.to_dict() if snapshot.exists else None
+
+
+async def get_quiz_selection_state(senior_id: str) -> tuple[list[str] | None, dict | None]:
+    """
+    Retrieve what adaptive quiz selection needs about a senior, in one round trip.
+
+    Reads the IDs of the questions the senior has seen
+    (seniors/{senior_id}/stats/quizSelection) and the quiz trend aggregate
+    (seniors/{senior_id}/stats/quiz) together.
+
+    Args:
+        senior_id: The unique identifier for the senior
+
+    Returns:
+        tuple[list[str] | None, dict | None]: The seen question IDs and the
+                                              trend aggregate, each None if
+                                              not stored yet
+
+    Example:
+        >>> seen_ids, stats = await get_quiz_selection_state("senior_123")
+    """
+    stats_ref = get_async_db().collection('seniors').document(senior_id).collection('stats')
+    selection_ref = stats_ref.document('quizSelection')
+
+    seen_ids, stats = None, None
+    async for snapshot in get_async_db().get_all([selection_ref, stats_ref.document('quiz')]):
+        if not snapshot.exists:
+            continue
+        if snapshot.id == 'quizSelection':
+            seen_ids = snapshot.to_dict().get('seenIds')
+        else:
+            stats = snapshot.to_dict()
+
+    return seen_ids, stats
+
+
+async def save_quiz_seen(seen_by_senior: dict[str, list[str]]) -> None:
+    """
+    Store the seen questions of several seniors in write batches.
+
+    Questions are stored by ID, not by question bank index, which depends
+    on the order each worker loaded the bank in. A legacy `seen` bitset is
+    replaced.
+
+    Args:
+        seen_by_senior: IDs of the questions already shown, by senior ID
+
+    Example:
+        >>> await save_quiz_seen({"senior_123": ["mem_2_01", "lang_2_01"]})
+    """
+    from google.cloud.firestore_v1 import SERVER_TIMESTAMP
+
+    seniors = list(seen_by_senior.items())
+    # A batch holds up to 500 writes
+    for start in range(0, len(seniors), 500):
+        write_batch = batch()
+        for senior_id, seen_ids in seniors[start:start + 500]:
+            selection_ref = (
+                get_async_db().collection('seniors')
+                .document(senior_id)
+                .collection('stats')
+                .document('quizSelection')
+            )
+            write_batch.set(selection_ref, {
+                'seenIds': seen_ids,
+                'updatedAt': SERVER_TIMESTAMP,
+            })
+        await write_batch.commit()
@@ -0,0 +1,56 @@
+"""
+Opaque pagination cursors for Firestore-backed list endpoints.
+
+List queries are ordered by a timestamp field and the document ID (to break
+ties), and resume with start_after() from the last document of the previous
+page. The cursor handed to clients encodes that position as URL-safe
+base64 JSON, so paging never re-reads earlier pages (no offsets).
+"""
+
+import base64
+import binascii
+import json
+from datetime import datetime
+
+
+class InvalidCursorError(ValueError):
+    """Raised when a client sends a malformed pagination cursor."""
+
+
+def encode_cursor(timestamp: datetime, document_id: str) -> str:
+    """
+    Encode the position after a document as an opaque cursor.
+
+    Args:
+        timestamp: Value of the ordering timestamp field of the document
+        document_id: ID (or path, for collection group queries) of the document
+
+    Returns:
+        str: URL-safe cursor string
+
+    Example:
+        >>> cursor = encode_cursor(call["startedAt"], call_id)
+    """
+    payload = json.dumps([timestamp.isoformat(), document_id], separators=(",", ":"))
+    return base64.urlsafe_b64encode(payload.encode("utf-8")).decode("ascii").rstrip("=")
+
+
+def decode_cursor(cursor: str) -> tuple[datetime, str]:
+    """
+    Decode a cursor produced by encode_cursor.
+
+    Args:
+        cursor: Cursor string sent by the client
+
+    Returns:
+        tuple[datetime, str]: The timestamp and document ID to start after
+
+    Raises:
+        InvalidCursorError: If the cursor is malformed
+    """
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        timestamp, document_id = json.loads(base64.urlsafe_b64decode(padded.encode("ascii")))
+        return datetime.fromisoformat(timestamp), str(document_id)
+    except (binascii.Error, UnicodeError, TypeError, ValueError) as e:
+        raise InvalidCursorError(f"Invalid cursor: {cursor!r}") from e
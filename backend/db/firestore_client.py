@@ -1,178 +1,619 @@
 """
 Firestore database client for the FastAPI backend application.
 
-This module initializes Firebase Admin SDK and provides helper functions
-for managing senior call records and conversation turns in Firestore.
+This module provides the Firestore client, the turn storage layouts, and the
+helpers of the synchronous (threadpool) endpoints, jobs and tools: call
+history, exports, the question pool and migrations. The conversation
+endpoints create calls, append turns and finalize calls on the async client
+(db/async_firestore.py). The Firebase Admin and Firestore SDKs are imported,
+and the client initialized, on first use (get_db() and inside the helpers),
+not when this module is imported.
+
+Conversation turns are stored in one of two layouts (settings.turn_storage):
+    documents   one document per turn under seniors/{id}/calls/{callId}/turns
+    chunks      turns appended to the `turns` array of chunk documents under
+                seniors/{id}/calls/{callId}/turnChunks/{seq} (zero-padded
+                sequence IDs), each holding up to settings.turn_chunk_max_turns
+                turns or settings.turn_chunk_max_bytes of text
+
+The setting only selects the layout new turns are written in. Readers
+handle both whatever it is set to: a call's chunks are read if it has any,
+otherwise its per-turn documents, so calls recorded before switching
+layouts (see db/migrate_turns.py to backfill them), or after switching back,
+stay readable.
 """
 
-import firebase_admin
-from firebase_admin import credentials, firestore, initialize_app
-from google.auth import default as google_auth_default
-from google.cloud.firestore_v1 import SERVER_TIMESTAMP
+from datetime import datetime, timezone
+from typing import TYPE_CHECKING
+import math
 import os
+import threading
 from config import settings
 
+if TYPE_CHECKING:
+    from google.cloud.firestore import Client as FirestoreClient
+
+# Call fields read by history listings: a projection that skips any other
+# (potentially large) call fields
+CALL_SUMMARY_FIELDS = ['startedAt', 'endedAt', 'summary', 'mood', 'riskLevel']
+
+# Separates the chunk ID and the position in the chunk in the IDs of chunked
+# turns (e.g. "000002:17")
+CHUNK_TURN_SEPARATOR = ':'
+
+# Document read by ping() (it does not need to exist)
+WARMUP_DOCUMENT_ID = '_warmup'
 
-# Initialize Firebase app (only once)
-_app_initialized = False
 
-if not _app_initialized:
-    if not firebase_admin._apps:
+# Firestore client, created on first use (or at startup, see services/warmup.py)
+_db: 'FirestoreClient | None' = None
+_db_lock = threading.Lock()
+
+
+def initialize_firebase() -> None:
+    """
+    Initialize the Firebase Admin app, once per process.
+    
+    Uses the service account key in settings.google_application_credentials
+    when it exists, otherwise Application Default Credentials (Cloud Run).
+    Nothing is initialized when the Firestore emulator is used (load tests).
+    Credential discovery (and importing the SDK) can take a while, so it is
+    done on first use rather than on import.
+    """
+    if os.environ.get("FIRESTORE_EMULATOR_HOST"):
+        return
+    
+    import firebase_admin
+    from firebase_admin import credentials, initialize_app
+    from google.auth import default as google_auth_default
+    
+    with _db_lock:
+        if firebase_admin._apps:
+            return
+        
         if settings.google_application_credentials and os.path.exists(settings.google_application_credentials):
             cred = credentials.Certificate(settings.google_application_credentials)
             initialize_app(cred, {
                 'projectId': settings.google_project_id,
             })
-
+        
         else:
             # Cloud Run / ADC
             cred, project_id = google_auth_default()
             initialize_app(cred, {
                 'projectId': project_id,
             })
-            # cred = credentials.ApplicationDefault()
 
-            # firebase_admin.initialize_app(cred)
-            
 
+def get_db() -> 'FirestoreClient':
+    """
+    Return the Firestore client, initializing Firebase on first use.
+    
+    Returns:
+        FirestoreClient: The process-wide Firestore client (an anonymous
+                         client for the emulator when FIRESTORE_EMULATOR_HOST is set)
+    """
+    global _db
+    if _db is None:
+        initialize_firebase()
+        with _db_lock:
+            if _db is None:
+                if os.environ.get("FIRESTORE_EMULATOR_HOST"):
+                    from google.auth.credentials import AnonymousCredentials
+                    from google.cloud.firestore import Client as FirestoreClient
+                    
+                    _db = FirestoreClient(
+                        project=settings.google_project_id or "demo-cooltiger",
+                        credentials=AnonymousCredentials(),
+                    )
+                else:
+                    from firebase_admin import firestore
+                    
+                    _db = firestore.client()
+    return _db
 
-db = firestore.client()
 
+class _LazyClient:
+    """Module-level stand-in for the Firestore client, resolved on first attribute access."""
+    
+    def __getattr__(self, name: str):
+        return getattr(get_db(), name)
 
-def create_call_doc(senior_id: str) -> str:
+
+db = _LazyClient()
+
+
+def ping(timeout: float | None = None) -> None:
     """
-    Create a new call document for a senior.
+    Make a minimal Firestore round trip (one read of a document that need not exist).
     
-    Creates a document under the path seniors/{senior_id}/calls with initial
-    fields including the senior ID and start timestamp.
+    Used by the startup warm-up and keep-alive probes: the first call sets up
+    credentials and the gRPC channel.
     
     Args:
-        senior_id: The unique identifier for the senior
+        timeout: Deadline of the read, in seconds (it is not retried)
+    
+    Raises:
+        google.api_core.exceptions.GoogleAPICallError: If Firestore cannot be reached
+    """
+    db.collection('seniors').document(WARMUP_DOCUMENT_ID).get(retry=None, timeout=timeout)
+
+
+def _turns_ref(senior_id: str, call_id: str):
+    return (
+        db.collection('seniors')
+        .document(senior_id)
+        .collection('calls')
+        .document(call_id)
+        .collection('turns')
+    )
+
+
+def _turn_chunks_ref(senior_id: str, call_id: str):
+    return (
+        db.collection('seniors')
+        .document(senior_id)
+        .collection('calls')
+        .document(call_id)
+        .collection('turnChunks')
+    )
+
+
+def chunk_id(sequence: int) -> str:
+    """Document ID of the turn chunk with the given sequence number (sorts in sequence order)."""
+    return f"{sequence:06d}"
+
+
+def turn_size(turn: dict) -> int:
+    """Approximate stored size of a turn in a chunk document, in bytes."""
+    # Field names and the timestamp add a few dozen bytes to the text
+    return len(turn['speaker'].encode('utf-8')) + len(turn['text'].encode('utf-8')) + 48
+
+
+def chunk_turns(turns: list[dict]) -> list[list[dict]]:
+    """
+    Split turns into chunks within the configured turn count and size limits.
+    
+    Args:
+        turns: Turns in chronological order
         
     Returns:
-        str: The newly created call document ID (callId)
+        list[list[dict]]: The turns of each chunk, in order
+    """
+    chunks, current, current_bytes = [], [], 0
+    for turn in turns:
+        size = turn_size(turn)
+        if current and (
+            len(current) >= settings.turn_chunk_max_turns
+            or current_bytes + size > settings.turn_chunk_max_bytes
+        ):
+            chunks.append(current)
+            current, current_bytes = [], 0
+        current.append(turn)
+        current_bytes += size
+    if current:
+        chunks.append(current)
+    return chunks
+
+
+def new_chunk_turn(speaker: str, text: str) -> dict:
+    """Build a turn to append to a chunk."""
+    # Server timestamps are not allowed inside arrays: use the client clock
+    return {
+        'speaker': speaker,
+        'text': text,
+        'timestamp': datetime.now(timezone.utc),
+    }
+
+
+def latest_chunk_query(chunks_ref):
+    """Query for the counters of a call's latest turn chunk (sync or async collection reference)."""
+    from google.cloud.firestore_v1 import Query
+    
+    # Only the chunk's counters are read, not its turns
+    return chunks_ref.select(['turnCount', 'bytes']).order_by('__name__', direction=Query.DESCENDING).limit(1)
+
+
+def plan_chunk_append(latest, turn: dict) -> tuple[str | None, dict]:
+    """
+    Decide where a turn is appended in the chunked layout, and with which fields.
+    
+    Shared by the sync and async append transactions, which only differ in
+    how they read the latest chunk.
+    
+    Args:
+        latest: Snapshot of the call's latest chunk (latest_chunk_query), or None
+        turn: The turn (new_chunk_turn)
         
+    Returns:
+        tuple[str | None, dict]: None and the update of the latest chunk if
+            the turn fits in it, otherwise the ID of the new chunk and its
+            document
+    """
+    from google.cloud.firestore_v1 import SERVER_TIMESTAMP, ArrayUnion, Increment
+    
+    size = turn_size(turn)
+    sequence = 0
+    if latest is not None:
+        chunk = latest.to_dict()
+        if (
+            chunk['turnCount'] < settings.turn_chunk_max_turns
+            and chunk['bytes'] + size <= settings.turn_chunk_max_bytes
+        ):
+            return None, {
+                'turns': ArrayUnion([turn]),
+                'turnCount': Increment(1),
+                'bytes': Increment(size),
+                'updatedAt': SERVER_TIMESTAMP,
+            }
+        sequence = int(latest.id) + 1
+    
+    return chunk_id(sequence), {
+        'turns': [turn],
+        'turnCount': 1,
+        'bytes': size,
+        'updatedAt': SERVER_TIMESTAMP,
+    }
+
+
+def get_quiz_definitions() -> list[dict]:
+    """
+    Retrieve all quiz definitions from the quizzes collection.
+
+    Each document holds a quiz's title and questions; the document ID is
+    used as the quiz ID.
+
+    Returns:
+        list[dict]: Quiz definitions with id, title and questions
+
     Example:
-        >>> call_id = create_call_doc("senior_123")
-        >>> print(f"Created call: {call_id}")
+        >>> for quiz in get_quiz_definitions():
+        ...     print(f"{quiz['id']}: {len(quiz['questions'])} questions")
     """
-    call_ref = db.collection('seniors').document(senior_id).collection('calls').document()
+    return [
+        {**doc.to_dict(), 'id': doc.id}
+        for doc in db.collection('quizzes').stream()
+    ]
+
+
+def get_question_pool(created_from: datetime | None = None) -> list[dict]:
+    """
+    Retrieve generated quiz questions from the questionPool collection.
+    
+    Questions are returned in creation order. The lower bound is inclusive,
+    so questions sharing the timestamp of the last sync are never skipped;
+    callers drop the ones they already have by ID.
+    
+    Args:
+        created_from: Only return questions created at or after this time (None for all)
+        
+    Returns:
+        list[dict]: Question definitions, including their createdAt timestamp
+        
+    Example:
+        >>> questions = get_question_pool()
+        >>> newer = get_question_pool(created_from=questions[-1]["createdAt"])
+    """
+    from google.cloud.firestore_v1.base_query import FieldFilter
     
-    call_ref.set({
-        'seniorId': senior_id,
-        'startedAt': SERVER_TIMESTAMP,
-    })
+    query = db.collection('questionPool')
+    if created_from is not None:
+        query = query.where(filter=FieldFilter('createdAt', '>=', created_from))
     
-    return call_ref.id
+    return [
+        {**doc.to_dict(), 'id': doc.id}
+        for doc in query.order_by('createdAt').stream()
+    ]
 
 
-def append_turn(senior_id: str, call_id: str, speaker: str, text: str) -> None:
+def add_pool_questions(questions: list[dict]) -> int:
     """
-    Append a conversation turn to a call.
+    Add generated quiz questions to the questionPool collection.
     
-    Adds a new turn document under seniors/{senior_id}/calls/{call_id}/turns
-    with the speaker identifier, spoken text, and timestamp.
+    Question IDs are derived from the question content, so a question that
+    is already in the pool (e.g. generated by another worker) is skipped.
     
     Args:
-        senior_id: The unique identifier for the senior
-        call_id: The call document ID
-        speaker: Identifier for who is speaking (e.g., "senior", "assistant")
-        text: The text content of what was said
+        questions: Question definitions with id, category, difficulty,
+                   question, options and answer
+        
+    Returns:
+        int: Number of questions added
         
     Example:
-        >>> append_turn("senior_123", "call_456", "senior", "Hello, how are you?")
-        >>> append_turn("senior_123", "call_456", "assistant", "I'm doing well, thank you!")
+        >>> add_pool_questions([{"id": "gen_memory_1a2b3c4d5e", "category": "memory", ...}])
     """
-    turns_ref = (
-        db.collection('seniors')
-        .document(senior_id)
-        .collection('calls')
-        .document(call_id)
-        .collection('turns')
-    )
+    from google.cloud.firestore_v1 import SERVER_TIMESTAMP
+    from google.api_core.exceptions import AlreadyExists
     
-    turns_ref.add({
-        'speaker': speaker,
-        'text': text,
-        'timestamp': SERVER_TIMESTAMP,
-    })
+    added = 0
+    for question in questions:
+        data = {key: value for key, value in question.items() if key != 'id'}
+        try:
+            db.collection('questionPool').document(question['id']).create({
+                **data,
+                'createdAt': SERVER_TIMESTAMP,
+            })
+            added += 1
+        except AlreadyExists:
+            continue
+    
+    return added
+
 
+def _isoformat(value: datetime | None) -> str | None:
+    return value.isoformat() if value else None
 
-def finalize_call(senior_id: str, call_id: str, summary: str, mood: str, risk_level: str) -> None:
+
+def _call_summary(snapshot) -> dict:
+    """Summary fields of a call snapshot, with timestamps as ISO strings."""
+    call = snapshot.to_dict()
+    return {
+        'id': snapshot.id,
+        # The parent of calls/{id} is seniors/{seniorId}
+        'seniorId': call.get('seniorId') or snapshot.reference.parent.parent.id,
+        'startedAt': _isoformat(call.get('startedAt')),
+        'endedAt': _isoformat(call.get('endedAt')),
+        'summary': call.get('summary'),
+        'mood': call.get('mood'),
+        'riskLevel': call.get('riskLevel'),
+    }
+
+
+def get_calls_page(
+    senior_id: str,
+    limit: int,
+    start_after: tuple[datetime, str] | None = None,
+) -> tuple[list[dict], tuple[datetime, str] | None]:
     """
-    Finalize a call with summary information.
+    Retrieve one page of a senior's calls, newest first.
     
-    Updates the call document with end timestamp and analysis results including
-    summary, mood assessment, and risk level evaluation.
+    Only the summary fields of each call are read (CALL_SUMMARY_FIELDS
+    projection), never the turns, so listing calls costs one small
+    document read per call returned.
     
     Args:
         senior_id: The unique identifier for the senior
-        call_id: The call document ID
-        summary: Summary of the conversation
-        mood: Assessed mood of the senior (e.g., "happy", "sad", "neutral")
-        risk_level: Risk assessment level (e.g., "low", "medium", "high")
+        limit: Maximum number of calls to return
+        start_after: (startedAt, call ID) of the last call of the previous
+                     page, or None for the first page
+        
+    Returns:
+        tuple[list[dict], tuple[datetime, str] | None]: Calls (id, seniorId and
+            summary fields, timestamps as ISO strings), and the position to
+            pass as start_after for the next page (None on the last page)
         
     Example:
-        >>> finalize_call(
-        ...     "senior_123",
-        ...     "call_456",
-        ...     "Pleasant conversation about family",
-        ...     "happy",
-        ...     "low"
-        ... )
-    """
-    call_ref = (
+        >>> calls, after = get_calls_page("senior_123", 20)
+        >>> while after:
+        ...     more, after = get_calls_page("senior_123", 20, after)
+    """
+    from google.cloud.firestore_v1 import Query
+    
+    query = (
         db.collection('seniors')
         .document(senior_id)
         .collection('calls')
-        .document(call_id)
+        .select(CALL_SUMMARY_FIELDS)
+        .order_by('startedAt', direction=Query.DESCENDING)
+        .order_by('__name__', direction=Query.DESCENDING)
     )
+    if start_after is not None:
+        query = query.start_after({'startedAt': start_after[0], '__name__': start_after[1]})
+    
+    # One extra document tells whether there is a next page
+    snapshots = list(query.limit(limit + 1).stream())
+    has_more = len(snapshots) > limit
+    snapshots = snapshots[:limit]
+    
+    calls = [_call_summary(snapshot) for snapshot in snapshots]
+    
+    next_after = None
+    if has_more:
+        next_after = (snapshots[-1].get('startedAt'), snapshots[-1].id)
+    return calls, next_after
+
+
+def _chunked_turns_page(
+    senior_id: str,
+    call_id: str,
+    limit: int,
+    start_after_id: str | None,
+) -> list[dict]:
+    """Read up to `limit` + 1 chunked turns, starting after the turn with the given ID."""
+    chunks_ref = _turn_chunks_ref(senior_id, call_id).order_by('__name__')
+    query = chunks_ref
+    after_chunk, after_index = None, -1
+    if start_after_id is not None:
+        after_chunk, index = start_after_id.split(CHUNK_TURN_SEPARATOR, 1)
+        after_index = int(index)
+        query = query.start_at({'__name__': after_chunk})
     
-    call_ref.update({
-        'endedAt': SERVER_TIMESTAMP,
-        'summary': summary,
-        'mood': mood,
-        'riskLevel': risk_level,
-    })
+    # Chunks are read a few at a time, as many as the missing turns need when
+    # full (plus the partly read first one), rather than one chunk per turn
+    turns = []
+    while True:
+        needed = limit + 1 - len(turns)
+        batch_size = math.ceil(needed / settings.turn_chunk_max_turns) + 1
+        snapshots = list(query.limit(batch_size).stream())
+        for snapshot in snapshots:
+            for index, turn in enumerate(snapshot.get('turns')):
+                if snapshot.id == after_chunk and index <= after_index:
+                    continue
+                turns.append({**turn, 'id': f"{snapshot.id}{CHUNK_TURN_SEPARATOR}{index}"})
+                if len(turns) > limit:
+                    return turns
+        if len(snapshots) < batch_size:
+            return turns
+        query = chunks_ref.start_after({'__name__': snapshots[-1].id})
 
 
-def get_all_turns(senior_id: str, call_id: str) -> list[dict]:
+def get_turns_page(
+    senior_id: str,
+    call_id: str,
+    limit: int,
+    start_after: tuple[datetime, str] | None = None,
+) -> tuple[list[dict], tuple[datetime, str] | None]:
     """
-    Retrieve all conversation turns for a call.
+    Retrieve one page of a call's conversation turns, in chronological order.
     
-    Fetches all turn documents for a specific call, ordered by timestamp
-    in ascending order (chronological).
+    Reads the call's turn chunks if it has any (turn IDs are then
+    "{chunkId}:{position}"), otherwise its per-turn documents.
     
     Args:
         senior_id: The unique identifier for the senior
         call_id: The call document ID
+        limit: Maximum number of turns to return
+        start_after: (timestamp, turn ID) of the last turn of the previous
+                     page, or None for the first page
         
     Returns:
-        list[dict]: List of turn dictionaries containing speaker, text, and timestamp.
-                   Timestamps are converted to ISO format strings for JSON serialization.
+        tuple[list[dict], tuple[datetime, str] | None]: Turns (id, speaker,
+            text, timestamp as ISO string), and the position to pass as
+            start_after for the next page (None on the last page)
         
     Example:
-        >>> turns = get_all_turns("senior_123", "call_456")
-        >>> for turn in turns:
-        ...     print(f"{turn['speaker']}: {turn['text']}")
+        >>> turns, after = get_turns_page("senior_123", "call_456", 50)
     """
-    turns_ref = (
-        db.collection('seniors')
-        .document(senior_id)
-        .collection('calls')
-        .document(call_id)
-        .collection('turns')
-        .order_by('timestamp')
+    turns = []
+    if start_after is not None and CHUNK_TURN_SEPARATOR in start_after[1]:
+        turns = _chunked_turns_page(senior_id, call_id, limit, start_after[1])
+    elif start_after is None:
+        # Whatever the current layout (calls written in chunk mode stay readable)
+        turns = _chunked_turns_page(senior_id, call_id, limit, None)
+    
+    if not turns and (start_after is None or CHUNK_TURN_SEPARATOR not in start_after[1]):
+        query = _turns_ref(senior_id, call_id).order_by('timestamp').order_by('__name__')
+        if start_after is not None:
+            query = query.start_after({'timestamp': start_after[0], '__name__': start_after[1]})
+        turns = [{**doc.to_dict(), 'id': doc.id} for doc in query.limit(limit + 1).stream()]
+    
+    has_more = len(turns) > limit
+    turns = turns[:limit]
+    
+    next_after = None
+    if has_more:
+        next_after = (turns[-1]['timestamp'], turns[-1]['id'])
+    
+    return [
+        {
+            'id': turn['id'],
+            'speaker': turn.get('speaker'),
+            'text': turn.get('text'),
+            'timestamp': _isoformat(turn.get('timestamp')),
+        }
+        for turn in turns
+    ], next_after
+
+
+def get_risk_calls_page(
+    risk_levels: list[str],
+    ended_after: datetime,
+    limit: int,
+    start_after: tuple[datetime, str] | None = None,
+) -> tuple[list[dict], tuple[datetime, str] | None]:
+    """
+    Retrieve one page of recent calls with the given risk levels, across all seniors.
+    
+    A single collection group query over every senior's calls subcollection,
+    newest first. It needs the composite index on calls (riskLevel ascending,
+    endedAt descending, collection group scope) defined in
+    firestore.indexes.json.
+    
+    Args:
+        risk_levels: Risk levels to include (e.g. ["high"])
+        ended_after: Only include calls that ended after this time
+        limit: Maximum number of calls to return
+        start_after: (endedAt, call document path) of the last call of the
+                     previous page, or None for the first page
+        
+    Returns:
+        tuple[list[dict], tuple[datetime, str] | None]: Calls (id, seniorId and
+            summary fields, timestamps as ISO strings), and the position to
+            pass as start_after for the next page (None on the last page)
+        
+    Example:
+        >>> since = datetime.now(timezone.utc) - timedelta(hours=24)
+        >>> calls, after = get_risk_calls_page(["high"], since, 50)
+    """
+    from google.cloud.firestore_v1 import Query
+    from google.cloud.firestore_v1.base_query import FieldFilter
+    
+    query = (
+        db.collection_group('calls')
+        .where(filter=FieldFilter('riskLevel', 'in', risk_levels))
+        .where(filter=FieldFilter('endedAt', '>', ended_after))
+        .select(['seniorId', *CALL_SUMMARY_FIELDS])
+        .order_by('endedAt', direction=Query.DESCENDING)
+        .order_by('__name__', direction=Query.DESCENDING)
     )
+    if start_after is not None:
+        # Collection group cursors need the full document reference
+        query = query.start_after({'endedAt': start_after[0], '__name__': db.document(start_after[1])})
     
-    turns = []
-    for doc in turns_ref.stream():
-        turn_data = doc.to_dict()
+    snapshots = list(query.limit(limit + 1).stream())
+    has_more = len(snapshots) > limit
+    snapshots = snapshots[:limit]
+    
+    calls = [_call_summary(snapshot) for snapshot in snapshots]
+    
+    next_after = None
+    if has_more:
+        next_after = (snapshots[-1].get('endedAt'), snapshots[-1].reference.path)
+    return calls, next_after
+
+
+def get_export_calls_page(
+    senior_id: str | None,
+    started_from: datetime | None,
+    started_before: datetime | None,
+    limit: int,
+    start_after: tuple[datetime, str] | None = None,
+) -> tuple[list[dict], tuple[datetime, str] | None]:
+    """
+    Retrieve one page of calls for export, oldest first.
+    
+    Reads a senior's calls, or with no senior every senior's calls (a
+    collection group query, which needs the collection group startedAt index
+    enabled in firestore.indexes.json), optionally limited to a start time
+    range. Only summary fields are read.
+    
+    Args:
+        senior_id: The unique identifier for the senior, or None for all seniors
+        started_from: Only include calls started at or after this time
+        started_before: Only include calls started before this time
+        limit: Maximum number of calls to return
+        start_after: (startedAt, call document path) of the last call of the
+                     previous page, or None for the first page
         
-        # Convert Firestore timestamp to ISO format string for JSON serialization
-        if 'timestamp' in turn_data and turn_data['timestamp']:
-            turn_data['timestamp'] = turn_data['timestamp'].isoformat()
+    Returns:
+        tuple[list[dict], tuple[datetime, str] | None]: Calls (id, seniorId and
+            summary fields, timestamps as ISO strings), and the position to
+            pass as start_after for the next page (None on the last page)
         
-        turns.append(turn_data)
+    Example:
+        >>> calls, after = get_export_calls_page("senior_123", None, None, 100)
+    """
+    from google.cloud.firestore_v1.base_query import FieldFilter
+    
+    if senior_id is not None:
+        query = db.collection('seniors').document(senior_id).collection('calls')
+    else:
+        query = db.collection_group('calls')
+    if started_from is not None:
+        query = query.where(filter=FieldFilter('startedAt', '>=', started_from))
+    if started_before is not None:
+        query = query.where(filter=FieldFilter('startedAt', '<', started_before))
+    
+    query = query.select(['seniorId', *CALL_SUMMARY_FIELDS]).order_by('startedAt').order_by('__name__')
+    if start_after is not None:
+        query = query.start_after({'startedAt': start_after[0], '__name__': db.document(start_after[1])})
+    
+    snapshots = list(query.limit(limit + 1).stream())
+    has_more = len(snapshots) > limit
+    snapshots = snapshots[:limit]
     
-    return turns
+    next_after = None
+    if has_more:
+        next_after = (snapshots[-1].get('startedAt'), snapshots[-1].reference.path)
+    return [_call_summary(snapshot) for snapshot in snapshots], next_after
@@ -0,0 +1,121 @@
+"""
+Backfill chunked turn storage from per-turn documents.
+
+Copies the per-turn documents of existing calls (seniors/{id}/calls/{callId}/turns)
+into turn chunks (seniors/{id}/calls/{callId}/turnChunks), so calls recorded
+before switching settings.turn_storage to "chunks" are read with one read per
+chunk instead of one per turn. Calls that already have chunks are skipped, so
+the migration can be re-run safely.
+
+Usage (from the backend directory):
+    python -m db.migrate_turns --all --dry-run
+    python -m db.migrate_turns --senior-id senior_123
+    python -m db.migrate_turns --all --delete-legacy
+
+Per-turn documents are kept unless --delete-legacy is given; readers prefer
+chunks whenever a call has them.
+"""
+
+import argparse
+import logging
+
+from db.firestore_client import chunk_id, chunk_turns, db, turn_size
+
+# Configure logger
+logger = logging.getLogger(__name__)
+
+# Firestore batches hold at most 500 writes
+BATCH_SIZE = 400
+
+
+def migrate_call(call_ref, delete_legacy: bool = False, dry_run: bool = False) -> tuple[int, int]:
+    """
+    Copy a call's per-turn documents into turn chunks.
+
+    Args:
+        call_ref: Reference of the call document
+        delete_legacy: Delete the per-turn documents once the chunks are written
+        dry_run: Only count what would be migrated
+
+    Returns:
+        tuple[int, int]: Number of turns and of chunks written (0, 0 if the
+                         call has no per-turn documents or already has chunks)
+    """
+    chunks_ref = call_ref.collection('turnChunks')
+    if list(chunks_ref.select([]).limit(1).stream()):
+        return 0, 0
+
+    snapshots = list(call_ref.collection('turns').order_by('timestamp').stream())
+    if not snapshots:
+        return 0, 0
+
+    turns = []
+    for snapshot in snapshots:
+        turn = snapshot.to_dict()
+        turns.append({
+            'speaker': turn.get('speaker', ''),
+            'text': turn.get('text', ''),
+            'timestamp': turn.get('timestamp'),
+        })
+    chunks = chunk_turns(turns)
+    if dry_run:
+        return len(turns), len(chunks)
+
+    # All chunks of a call are written together, so a call never ends up
+    # half-migrated (readers would otherwise see only part of it)
+    batch = db.batch()
+    for sequence, chunk in enumerate(chunks):
+        batch.set(chunks_ref.document(chunk_id(sequence)), {
+            'turns': chunk,
+            'turnCount': len(chunk),
+            'bytes': sum(turn_size(turn) for turn in chunk),
+        })
+    batch.commit()
+
+    if delete_legacy:
+        for start in range(0, len(snapshots), BATCH_SIZE):
+            batch = db.batch()
+            for snapshot in snapshots[start:start + BATCH_SIZE]:
+                batch.delete(snapshot.reference)
+            batch.commit()
+
+    return len(turns), len(chunks)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Backfill chunked turn storage from per-turn documents")
+    target = parser.add_mutually_exclusive_group(required=True)
+    target.add_argument("--senior-id", help="Migrate the calls of one senior")
+    target.add_argument("--all", action="store_true", help="Migrate the calls of every senior")
+    parser.add_argument("--call-id", help="Only migrate this call (with --senior-id)")
+    parser.add_argument("--delete-legacy", action="store_true", help="Delete per-turn documents after copying them")
+    parser.add_argument("--dry-run", action="store_true", help="Only report what would be migrated")
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.INFO, format="%(levelname)s %(message)s")
+
+    if args.all:
+        call_refs = (snapshot.reference for snapshot in db.collection_group('calls').select([]).stream())
+    else:
+        calls_ref = db.collection('seniors').document(args.senior_id).collection('calls')
+        if args.call_id:
+            call_refs = iter([calls_ref.document(args.call_id)])
+        else:
+            call_refs = (snapshot.reference for snapshot in calls_ref.select([]).stream())
+
+    calls, migrated, total_turns, total_chunks = 0, 0, 0, 0
+    for call_ref in call_refs:
+        calls += 1
+        turns, chunks = migrate_call(call_ref, args.delete_legacy, args.dry_run)
+        if turns:
+            migrated += 1
+            total_turns += turns
+            total_chunks += chunks
+            logger.info(f"{call_ref.path}: {turns} turns -> {chunks} chunks")
+
+    action = "Would migrate" if args.dry_run else "Migrated"
+    print(f"✅ {action} {migrated} of {calls} calls: {total_turns} turns into {total_chunks} chunks")
+
+
+if __name__ == "__main__":
+    main()
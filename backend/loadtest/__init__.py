@@ -0,0 +1,7 @@
+"""
+Load-testing package.
+
+This package contains fake upstream servers (CLOVA Speech, CLOVA Studio,
+Google TTS) and an end-to-end load driver that runs the backend against them
+and the Firestore emulator to measure throughput and latency percentiles.
+"""
@@ -0,0 +1,237 @@
+"""
+Fake upstream servers for load testing.
+
+Each fake mimics the request/response shape the service modules expect, with
+a configurable latency distribution and error rate, so the backend can be
+exercised end-to-end without spending CLOVA or Google quota:
+
+    - stt:    CLOVA Speech   POST /recognizer/upload
+    - studio: CLOVA Studio   POST /v3/chat-completions/{model}
+    - tts:    Google TTS     POST /v1/text:synthesize (REST transport)
+
+Latency specs:
+    fixed:<ms>                 every response takes <ms>
+    uniform:<min_ms>:<max_ms>  uniformly distributed
+    lognormal:<p50_ms>:<p95_ms> long-tailed, like real LLM/STT latencies
+
+Usage:
+    python -m loadtest.fake_upstreams stt --port 9101 --latency lognormal:700:1800
+    python -m loadtest.fake_upstreams studio --port 9102 --latency lognormal:1200:3500 --error-rate 0.01
+    python -m loadtest.fake_upstreams tts --port 9103 --latency uniform:150:400
+"""
+
+import argparse
+import asyncio
+import base64
+import json
+import math
+import random
+import re
+
+import uvicorn
+from fastapi import FastAPI, Request
+from fastapi.responses import JSONResponse
+
+# Replies returned by the fakes (realistic Korean length and content)
+SENIOR_UTTERANCES = [
+    "오늘은 아침에 공원에 산책을 다녀왔어요. 날씨가 참 좋더라고요.",
+    "요즘 무릎이 좀 아파서 병원에 다녀왔어요.",
+    "손주가 주말에 놀러 온다고 해서 기분이 좋아요.",
+    "점심은 된장찌개를 끓여서 먹었어요.",
+    "어젯밤에 잠을 잘 못 자서 좀 피곤하네요.",
+]
+
+AI_REPLIES = [
+    "산책을 다녀오셨다니 정말 좋네요. 오늘 공원에서 어떤 것을 보셨나요?",
+    "무릎이 아프셨다니 걱정되네요. 병원에서는 뭐라고 하던가요?",
+    "손주가 온다니 정말 기쁘시겠어요. 함께 무엇을 하실 계획이세요?",
+    "된장찌개 맛있으셨겠어요. 요리를 직접 하시는 걸 좋아하세요?",
+]
+
+ANALYSIS_REPLY = json.dumps(
+    {
+        "summary": "어르신은 산책과 가족 이야기를 하시며 전반적으로 편안한 대화를 나누셨습니다.",
+        "mood": "happy",
+        "risk_level": "low",
+    },
+    ensure_ascii=False,
+)
+
+
+def _fake_quiz_questions(prompt: str) -> str:
+    """Structured-output reply for quiz generation: random arithmetic questions."""
+    match = re.search(r"(\d+)개", prompt)
+    questions = []
+    for _ in range(int(match.group(1)) if match else 5):
+        a, b = random.randint(2, 99), random.randint(2, 99)
+        answer = a + b
+        options = [answer, answer + 1, answer - 1, answer + 10]
+        random.shuffle(options)
+        questions.append({
+            "question": f"{a} 더하기 {b}는 얼마인가요?",
+            "options": [str(option) for option in options],
+            "answer_index": options.index(answer),
+            "difficulty": 1 if max(a, b) < 10 else 2 if max(a, b) < 50 else 3,
+        })
+    return json.dumps({"questions": questions}, ensure_ascii=False)
+
+
+class LatencyModel:
+    """
+    Random latency distribution parsed from a spec string.
+
+    Attributes:
+        kind: Distribution kind ("fixed", "uniform" or "lognormal")
+        params: Distribution parameters in milliseconds
+
+    Example:
+        >>> model = LatencyModel.parse("lognormal:800:2000")
+        >>> delay_seconds = model.sample()
+    """
+
+    def __init__(self, kind: str, params: list[float]):
+        self.kind = kind
+        self.params = params
+
+    @classmethod
+    def parse(cls, spec: str) -> "LatencyModel":
+        kind, *raw_params = spec.split(":")
+        params = [float(p) for p in raw_params]
+        expected = {"fixed": 1, "uniform": 2, "lognormal": 2}
+        if kind not in expected or len(params) != expected[kind]:
+            raise ValueError(f"Invalid latency spec: {spec}")
+        return cls(kind, params)
+
+    def sample(self) -> float:
+        """Draw one latency, in seconds."""
+        if self.kind == "fixed":
+            ms = self.params[0]
+        elif self.kind == "uniform":
+            ms = random.uniform(self.params[0], self.params[1])
+        else:
+            median, p95 = self.params
+            mu = math.log(median)
+            sigma = max(math.log(p95) - mu, 0.0) / 1.645
+            ms = random.lognormvariate(mu, sigma)
+        return ms / 1000
+
+
+def create_app(service: str, latency: LatencyModel, error_rate: float) -> FastAPI:
+    """
+    Create the FastAPI app for one fake upstream.
+
+    Args:
+        service: Which upstream to fake ("stt", "studio" or "tts")
+        latency: Latency distribution applied to every response
+        error_rate: Fraction of requests answered with a 500 error
+
+    Returns:
+        FastAPI: The fake server application
+    """
+    app = FastAPI(title=f"fake-{service}")
+
+    async def simulate() -> JSONResponse | None:
+        await asyncio.sleep(latency.sample())
+        if random.random() < error_rate:
+            return JSONResponse({"error": "injected failure"}, status_code=500)
+        return None
+
+    if service == "stt":
+        @app.post("/recognizer/upload")
+        async def recognize(request: Request):
+            form = await request.form()
+            media = form.get("media")
+            if media is None:
+                return JSONResponse({"error": "media is required"}, status_code=400)
+            audio_size = len(await media.read())
+
+            error = await simulate()
+            if error is not None:
+                return error
+
+            text = random.choice(SENIOR_UTTERANCES)
+            # Roughly 16 KB of compressed audio per second of speech
+            duration_ms = max(1000, audio_size // 16)
+            return {
+                "result": "COMPLETED",
+                "message": "Succeeded",
+                "segments": [
+                    {
+                        "start": 0,
+                        "end": duration_ms,
+                        "text": text,
+                        "confidence": 0.95,
+                        "speaker": {"label": "1", "name": "A", "edited": False},
+                        "textEdited": text,
+                    }
+                ],
+                "text": text,
+            }
+
+    elif service == "studio":
+        @app.post("/v3/chat-completions/{model}")
+        async def chat_completions(model: str, request: Request):
+            payload = await request.json()
+            error = await simulate()
+            if error is not None:
+                return error
+
+            system_text = payload["messages"][0]["content"][0]["text"]
+            if "responseFormat" in payload:
+                content = _fake_quiz_questions(payload["messages"][1]["content"][0]["text"])
+            elif "JSON" in system_text:
+                content = ANALYSIS_REPLY
+            else:
+                content = random.choice(AI_REPLIES)
+            prompt_chars = sum(
+                len(part["text"])
+                for message in payload["messages"]
+                for part in message["content"]
+            )
+            return {
+                "status": {"code": "20000", "message": "OK"},
+                "result": {
+                    "message": {"role": "assistant", "content": content},
+                    "finishReason": "stop",
+                    "usage": {
+                        "promptTokens": prompt_chars // 2,
+                        "completionTokens": len(content) // 2,
+                        "totalTokens": (prompt_chars + len(content)) // 2,
+                    },
+                },
+            }
+
+    elif service == "tts":
+        @app.post("/v1/text:synthesize")
+        async def synthesize(request: Request):
+            payload = await request.json()
+            error = await simulate()
+            if error is not None:
+                return error
+
+            # Roughly 1 KB of MP3 per character of Korean speech
+            text = payload.get("input", {}).get("text", "")
+            audio = random.randbytes(max(1024, len(text) * 1024))
+            return {"audioContent": base64.b64encode(audio).decode("ascii")}
+
+    else:
+        raise ValueError(f"Unknown service: {service}")
+
+    return app
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Run a fake upstream server for load tests")
+    parser.add_argument("service", choices=["stt", "studio", "tts"])
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, required=True)
+    parser.add_argument("--latency", default="fixed:100", help="Latency spec (see module docstring)")
+    parser.add_argument("--error-rate", type=float, default=0.0)
+    args = parser.parse_args()
+
+    app = create_app(args.service, LatencyModel.parse(args.latency), args.error_rate)
+    uvicorn.run(app, host=args.host, port=args.port, log_level="warning")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,155 @@
+"""
+Deterministic conversation replay for performance regression checks.
+
+Records one scripted conversation (greeting, N senior replies, analysis)
+against the real upstreams, then replays it from the fixture file as many
+times as needed, measuring wall time, CPU time and memory allocations of
+our own code. The upstream latency is taken from the recording or fixed,
+so the numbers are comparable across versions.
+
+The conversation runs through the same service calls, in the same order, as
+the /conversation routers (Firestore is not involved).
+
+Usage (from the backend directory):
+    # 1. Record against the upstreams configured in .env (or the load-test fakes)
+    python -m loadtest.replay record --audio test_input.m4a --turns 3
+
+    # 2. Replay and store the results
+    python -m loadtest.replay replay --runs 20 --latency 0 --output replay_main.json
+
+    # 3. On another version, compare against the stored results
+    python -m loadtest.replay replay --runs 20 --latency 0 --baseline replay_main.json --max-regression 0.15
+"""
+
+import argparse
+import base64
+import json
+import os
+import statistics
+import sys
+import time
+import tracemalloc
+
+from config import settings
+from models.conversation import ConversationReplyResponse
+from services.clova_speech import transcribe_audio
+from services.clova_studio import analyze_conversation, format_transcript, generate_reply
+from services.google_tts import synthesize_speech
+
+# Same dummy profile and context limit as the conversation router
+SENIOR_PROFILE = {"name": "어르신", "age": 75, "preferences": "가족, 건강"}
+MAX_CONTEXT_TURNS = 10
+
+
+def run_conversation(audio: bytes, turns: int) -> None:
+    """Run one scripted conversation through the service layer."""
+    history: list[dict] = []
+
+    greeting = generate_reply(history, SENIOR_PROFILE)
+    history.append({"speaker": "ai", "text": greeting})
+    synthesize_speech("안녕하세요. 오늘은 어떠신가요?")
+
+    for _ in range(turns):
+        senior_text = transcribe_audio(audio, "audio/m4a")
+        history.append({"speaker": "senior", "text": senior_text})
+
+        ai_text = generate_reply(history[-MAX_CONTEXT_TURNS:], SENIOR_PROFILE)
+        history.append({"speaker": "ai", "text": ai_text})
+
+        audio_bytes = synthesize_speech(ai_text)
+        tts_url = f"data:audio/mp3;base64,{base64.b64encode(audio_bytes).decode('utf-8')}"
+        ConversationReplyResponse(success=True, ai_text=ai_text, senior_text=senior_text, tts_url=tts_url)
+
+    analyze_conversation(format_transcript(history), SENIOR_PROFILE)
+
+
+def measure(audio: bytes, turns: int, runs: int) -> dict:
+    """Replay the conversation `runs` times and summarize wall, CPU and memory."""
+    wall_times, cpu_times = [], []
+    for _ in range(runs):
+        wall_start, cpu_start = time.perf_counter(), time.process_time()
+        run_conversation(audio, turns)
+        wall_times.append(time.perf_counter() - wall_start)
+        cpu_times.append(time.process_time() - cpu_start)
+
+    # Memory is measured in a separate run, as tracemalloc slows everything down
+    tracemalloc.start()
+    before = tracemalloc.take_snapshot()
+    run_conversation(audio, turns)
+    after = tracemalloc.take_snapshot()
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    allocated = sum(stat.size_diff for stat in after.compare_to(before, "filename") if stat.size_diff > 0)
+
+    return {
+        "runs": runs,
+        "turns": turns,
+        "wall_ms_median": statistics.median(wall_times) * 1000,
+        "wall_ms_min": min(wall_times) * 1000,
+        "cpu_ms_median": statistics.median(cpu_times) * 1000,
+        "cpu_ms_min": min(cpu_times) * 1000,
+        "peak_traced_kb": peak / 1024,
+        "retained_kb": allocated / 1024,
+    }
+
+
+def compare(results: dict, baseline: dict, max_regression: float) -> list[str]:
+    """Return the metrics that regressed by more than `max_regression` (a ratio)."""
+    regressions = []
+    for metric in ("wall_ms_median", "cpu_ms_median", "peak_traced_kb"):
+        old, new = baseline[metric], results[metric]
+        change = (new - old) / old if old else 0.0
+        print(f"  {metric:<16} {old:>10.2f} -> {new:>10.2f}  ({change:+.1%})")
+        if change > max_regression:
+            regressions.append(f"{metric} regressed by {change:.1%}")
+    return regressions
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Record or replay a scripted conversation")
+    parser.add_argument("mode", choices=["record", "replay"])
+    parser.add_argument("--fixtures", default="fixtures/conversation.jsonl", help="Fixture file")
+    parser.add_argument("--audio", default="test_input.m4a", help="Audio uploaded for every senior turn")
+    parser.add_argument("--turns", type=int, default=3)
+    parser.add_argument("--runs", type=int, default=10, help="Replay runs (replay mode)")
+    parser.add_argument("--latency", default="0", help='"recorded" or a fixed latency in ms (replay mode)')
+    parser.add_argument("--output", help="Write replay results as JSON to this path")
+    parser.add_argument("--baseline", help="Compare against replay results from another version")
+    parser.add_argument("--max-regression", type=float, default=0.15)
+    args = parser.parse_args()
+
+    with open(args.audio, "rb") as f:
+        audio = f.read()
+
+    settings.upstream_fixture_path = args.fixtures
+    settings.upstream_fixture_mode = args.mode
+
+    if args.mode == "record":
+        if os.path.exists(args.fixtures):
+            os.remove(args.fixtures)
+        run_conversation(audio, args.turns)
+        print(f"✅ Recorded conversation ({args.turns} turns) to {args.fixtures}")
+        return
+
+    settings.upstream_replay_latency = args.latency
+    # Warm-up run (imports, client construction, caches)
+    run_conversation(audio, args.turns)
+    results = measure(audio, args.turns, args.runs)
+    print(json.dumps(results, indent=2))
+
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as f:
+            json.dump(results, f, indent=2)
+
+    if args.baseline:
+        with open(args.baseline, encoding="utf-8") as f:
+            baseline = json.load(f)
+        print(f"\nComparison with {args.baseline}:")
+        regressions = compare(results, baseline, args.max_regression)
+        for regression in regressions:
+            print(f"❌ {regression}")
+        sys.exit(1 if regressions else 0)
+
+
+if __name__ == "__main__":
+    main()
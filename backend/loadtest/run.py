@@ -0,0 +1,395 @@
+"""
+End-to-end load test for the conversation API.
+
+Starts the fake upstreams (see `loadtest.fake_upstreams`), the Firestore
+emulator and the backend itself, then drives N concurrent simulated seniors
+through full calls (start -> replies -> end) and reports throughput and
+p50/p95/p99 latency for each endpoint.
+
+While the load runs, a probe polls GET /health/ every 100 ms. The health
+endpoint does no work, so if its latency rises with load, something is
+blocking the event loop.
+
+Usage (from the backend directory):
+    python -m loadtest.run --seniors 50 --turns 5
+    python -m loadtest.run --seniors 200 --studio-latency lognormal:1500:4000 --error-rate 0.02
+    python -m loadtest.run --target http://127.0.0.1:8000 --seniors 20   # already running server
+
+The Firestore emulator is started with the gcloud CLI (cloud-firestore-emulator
+component) unless FIRESTORE_EMULATOR_HOST already points at a running one.
+Exits with status 1 when a --max-* budget is exceeded, so it can gate deploys.
+"""
+
+import argparse
+import asyncio
+import json
+import os
+import random
+import socket
+import subprocess
+import sys
+import time
+from collections import defaultdict
+
+import httpx
+
+# Backend root directory (where main.py lives)
+BACKEND_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+class ManagedProcess:
+    """
+    A subprocess started for the duration of the load test.
+
+    Attributes:
+        name: Display name used in log lines
+        command: Command line to run
+        env: Environment variables for the process
+    """
+
+    def __init__(self, name: str, command: list[str], env: dict[str, str] | None = None):
+        self.name = name
+        self.command = command
+        self.env = env
+        self.process: subprocess.Popen | None = None
+
+    def start(self) -> None:
+        print(f"Starting {self.name}: {' '.join(self.command)}")
+        self.process = subprocess.Popen(
+            self.command,
+            cwd=BACKEND_DIR,
+            env=self.env,
+            stdout=subprocess.DEVNULL,
+            stderr=subprocess.STDOUT,
+        )
+
+    def stop(self) -> None:
+        if self.process is None or self.process.poll() is not None:
+            return
+        self.process.terminate()
+        try:
+            self.process.wait(timeout=10)
+        except subprocess.TimeoutExpired:
+            self.process.kill()
+
+
+class EndpointStats:
+    """
+    Latency samples and error counts collected for each endpoint.
+
+    Attributes:
+        latencies: Successful request latencies in seconds, per endpoint
+        errors: Error counts per endpoint, keyed by status code (or exception name)
+    """
+
+    def __init__(self):
+        self.latencies: dict[str, list[float]] = defaultdict(list)
+        self.errors: dict[str, dict[str, int]] = defaultdict(lambda: defaultdict(int))
+
+    def record(self, endpoint: str, latency: float, error: str | None = None) -> None:
+        if error is None:
+            self.latencies[endpoint].append(latency)
+        else:
+            self.errors[endpoint][error] += 1
+
+    def summary(self, wall_time: float) -> dict[str, dict]:
+        """Compute count, error rate, throughput and percentiles per endpoint."""
+        results = {}
+        for endpoint in sorted(set(self.latencies) | set(self.errors)):
+            samples = sorted(self.latencies[endpoint])
+            errors = sum(self.errors[endpoint].values())
+            total = len(samples) + errors
+            results[endpoint] = {
+                "requests": total,
+                "errors": dict(self.errors[endpoint]),
+                "error_rate": errors / total if total else 0.0,
+                "throughput_rps": total / wall_time if wall_time else 0.0,
+                "p50_ms": _percentile(samples, 50) * 1000,
+                "p95_ms": _percentile(samples, 95) * 1000,
+                "p99_ms": _percentile(samples, 99) * 1000,
+                "max_ms": (samples[-1] if samples else 0.0) * 1000,
+            }
+        return results
+
+
+def _percentile(sorted_samples: list[float], percent: float) -> float:
+    """Nearest-rank percentile of pre-sorted samples (0.0 when empty)."""
+    if not sorted_samples:
+        return 0.0
+    rank = max(0, min(len(sorted_samples) - 1, round(percent / 100 * len(sorted_samples)) - 1))
+    return sorted_samples[rank]
+
+
+def _free_port() -> int:
+    with socket.socket() as s:
+        s.bind(("127.0.0.1", 0))
+        return s.getsockname()[1]
+
+
+def _wait_for_port(host: str, port: int, timeout: float) -> None:
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        try:
+            with socket.create_connection((host, port), timeout=1):
+                return
+        except OSError:
+            time.sleep(0.2)
+    raise TimeoutError(f"Nothing listening on {host}:{port} after {timeout}s")
+
+
+async def _timed_request(
+    client: httpx.AsyncClient,
+    stats: EndpointStats,
+    endpoint: str,
+    method: str,
+    url: str,
+    **kwargs,
+) -> httpx.Response | None:
+    """Send a request, record its latency (or error) and return the response if successful."""
+    start = time.perf_counter()
+    try:
+        response = await client.request(method, url, **kwargs)
+    except httpx.HTTPError as e:
+        stats.record(endpoint, 0.0, error=type(e).__name__)
+        return None
+
+    latency = time.perf_counter() - start
+    if response.status_code >= 400:
+        stats.record(endpoint, latency, error=str(response.status_code))
+        return None
+    stats.record(endpoint, latency)
+    return response
+
+
+async def simulate_senior(
+    client: httpx.AsyncClient,
+    index: int,
+    args: argparse.Namespace,
+    audio: bytes,
+    stats: EndpointStats,
+) -> None:
+    """Run one simulated senior through `args.calls` complete calls."""
+    senior_id = f"loadtest_senior_{index:05d}"
+
+    # Stagger the arrival of seniors over the ramp-up period
+    await asyncio.sleep(random.uniform(0, args.ramp_up))
+
+    for _ in range(args.calls):
+        response = await _timed_request(
+            client, stats, "start", "POST", "/conversation/start",
+            json={"senior_id": senior_id},
+        )
+        if response is None:
+            continue
+        call_id = response.json()["call_id"]
+
+        for _ in range(args.turns):
+            await asyncio.sleep(random.uniform(0, 2 * args.think_time))
+            await _timed_request(
+                client, stats, "reply", "POST", "/conversation/reply",
+                data={"senior_id": senior_id, "call_id": call_id},
+                files={"audio": ("turn.m4a", audio, "audio/m4a")},
+            )
+
+        await _timed_request(
+            client, stats, "end", "POST", "/conversation/end",
+            json={"senior_id": senior_id, "call_id": call_id},
+        )
+
+
+async def probe_event_loop(client: httpx.AsyncClient, stats: EndpointStats, stop: asyncio.Event) -> None:
+    """Poll the health endpoint until `stop` is set, recording its latency."""
+    while not stop.is_set():
+        await _timed_request(client, stats, "health_probe", "GET", "/health/")
+        try:
+            await asyncio.wait_for(stop.wait(), timeout=0.1)
+        except asyncio.TimeoutError:
+            pass
+
+
+async def run_load(args: argparse.Namespace, base_url: str) -> tuple[dict[str, dict], float]:
+    """Drive the simulated seniors against `base_url` and return the summary and wall time."""
+    if args.audio_file:
+        with open(args.audio_file, "rb") as f:
+            audio = f.read()
+    else:
+        audio = random.randbytes(args.audio_kb * 1024)
+
+    stats = EndpointStats()
+    limits = httpx.Limits(max_connections=args.seniors + 1, max_keepalive_connections=args.seniors + 1)
+    async with httpx.AsyncClient(base_url=base_url, timeout=args.timeout, limits=limits) as client:
+        stop = asyncio.Event()
+        probe = asyncio.create_task(probe_event_loop(client, stats, stop))
+
+        start = time.perf_counter()
+        await asyncio.gather(*(
+            simulate_senior(client, i, args, audio, stats) for i in range(args.seniors)
+        ))
+        wall_time = time.perf_counter() - start
+
+        stop.set()
+        await probe
+
+    return stats.summary(wall_time), wall_time
+
+
+def print_report(summary: dict[str, dict], wall_time: float, args: argparse.Namespace) -> None:
+    print(f"\n{'=' * 86}")
+    print(
+        f"{args.seniors} seniors x {args.calls} calls x {args.turns} turns "
+        f"in {wall_time:.1f}s"
+    )
+    print(f"{'=' * 86}")
+    print(f"{'endpoint':<14}{'requests':>9}{'errors':>8}{'rps':>9}{'p50 ms':>11}{'p95 ms':>11}{'p99 ms':>11}{'max ms':>11}")
+    for endpoint, row in summary.items():
+        print(
+            f"{endpoint:<14}{row['requests']:>9}{sum(row['errors'].values()):>8}"
+            f"{row['throughput_rps']:>9.2f}{row['p50_ms']:>11.1f}{row['p95_ms']:>11.1f}"
+            f"{row['p99_ms']:>11.1f}{row['max_ms']:>11.1f}"
+        )
+        if row["errors"]:
+            print(f"{'':<14}errors by status: {row['errors']}")
+
+
+def check_budgets(summary: dict[str, dict], args: argparse.Namespace) -> list[str]:
+    """Return a description of every exceeded budget."""
+    failures = []
+    for endpoint, row in summary.items():
+        if endpoint != "health_probe" and row["error_rate"] > args.max_error_rate:
+            failures.append(f"{endpoint}: error rate {row['error_rate']:.2%} > {args.max_error_rate:.2%}")
+
+    probe = summary.get("health_probe")
+    if args.max_health_p99_ms is not None and probe and probe["p99_ms"] > args.max_health_p99_ms:
+        failures.append(
+            f"health_probe: p99 {probe['p99_ms']:.1f} ms > {args.max_health_p99_ms} ms "
+            "(event loop is being blocked)"
+        )
+
+    reply = summary.get("reply")
+    if args.max_reply_p95_ms is not None and reply and reply["p95_ms"] > args.max_reply_p95_ms:
+        failures.append(f"reply: p95 {reply['p95_ms']:.1f} ms > {args.max_reply_p95_ms} ms")
+
+    return failures
+
+
+def start_upstreams(args: argparse.Namespace) -> tuple[list[ManagedProcess], dict[str, str]]:
+    """
+    Start the fake upstreams and (if needed) the Firestore emulator.
+
+    Returns:
+        tuple: The started processes, and the environment variables that point
+               the backend settings at them
+    """
+    processes: list[ManagedProcess] = []
+    ports = {service: _free_port() for service in ("stt", "studio", "tts")}
+    latencies = {"stt": args.stt_latency, "studio": args.studio_latency, "tts": args.tts_latency}
+
+    for service, port in ports.items():
+        processes.append(ManagedProcess(
+            f"fake {service}",
+            [
+                sys.executable, "-m", "loadtest.fake_upstreams", service,
+                "--port", str(port),
+                "--latency", latencies[service],
+                "--error-rate", str(args.error_rate),
+            ],
+        ))
+
+    emulator_host = os.environ.get("FIRESTORE_EMULATOR_HOST")
+    if not emulator_host:
+        emulator_host = f"127.0.0.1:{_free_port()}"
+        processes.append(ManagedProcess(
+            "Firestore emulator",
+            ["gcloud", "emulators", "firestore", "start", f"--host-port={emulator_host}"],
+        ))
+
+    for process in processes:
+        process.start()
+    for port in ports.values():
+        _wait_for_port("127.0.0.1", port, timeout=30)
+    emulator_ip, emulator_port = emulator_host.rsplit(":", 1)
+    _wait_for_port(emulator_ip, int(emulator_port), timeout=60)
+
+    upstream_env = {
+        "CLOVA_SPEECH_ENDPOINT": f"http://127.0.0.1:{ports['stt']}",
+        "CLOVA_SPEECH_API_KEY": "loadtest",
+        "CLOVA_STUDIO_ENDPOINT": f"http://127.0.0.1:{ports['studio']}/",
+        "CLOVA_STUDIO_API_KEY": "loadtest",
+        "GOOGLE_TTS_ENDPOINT": f"http://127.0.0.1:{ports['tts']}",
+        "GOOGLE_TTS_LANGUAGE_CODE": "ko-KR",
+        "GOOGLE_TTS_VOICE_NAME": "ko-KR-Standard-A",
+        "GOOGLE_PROJECT_ID": "demo-cooltiger",
+        "FIRESTORE_EMULATOR_HOST": emulator_host,
+    }
+    return processes, upstream_env
+
+
+def start_environment(args: argparse.Namespace) -> tuple[list[ManagedProcess], str]:
+    """Start fakes, emulator and backend; return the processes and backend base URL."""
+    processes, upstream_env = start_upstreams(args)
+
+    app_port = _free_port()
+    backend = ManagedProcess(
+        "backend",
+        [
+            sys.executable, "-m", "uvicorn", "main:app",
+            "--host", "127.0.0.1", "--port", str(app_port),
+            "--workers", str(args.workers), "--log-level", "warning",
+        ],
+        env={**os.environ, **upstream_env},
+    )
+    backend.start()
+    processes.append(backend)
+    _wait_for_port("127.0.0.1", app_port, timeout=60)
+
+    return processes, f"http://127.0.0.1:{app_port}"
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="End-to-end load test with fake upstreams")
+    parser.add_argument("--target", help="Base URL of an already running backend (skips spawning)")
+    parser.add_argument("--seniors", type=int, default=20, help="Concurrent simulated seniors")
+    parser.add_argument("--calls", type=int, default=1, help="Calls per senior")
+    parser.add_argument("--turns", type=int, default=5, help="Replies per call")
+    parser.add_argument("--think-time", type=float, default=0.5, help="Mean pause between turns (s)")
+    parser.add_argument("--ramp-up", type=float, default=5.0, help="Period over which seniors arrive (s)")
+    parser.add_argument("--audio-kb", type=int, default=96, help="Size of the synthetic audio upload")
+    parser.add_argument("--audio-file", help="Upload this file instead of synthetic audio")
+    parser.add_argument("--timeout", type=float, default=120.0, help="Client timeout per request (s)")
+    parser.add_argument("--workers", type=int, default=1, help="uvicorn workers for the backend")
+    parser.add_argument("--stt-latency", default="lognormal:700:1800")
+    parser.add_argument("--studio-latency", default="lognormal:1200:3500")
+    parser.add_argument("--tts-latency", default="lognormal:250:600")
+    parser.add_argument("--error-rate", type=float, default=0.0, help="Injected upstream error rate")
+    parser.add_argument("--max-error-rate", type=float, default=1.0)
+    parser.add_argument("--max-reply-p95-ms", type=float)
+    parser.add_argument("--max-health-p99-ms", type=float)
+    parser.add_argument("--json-output", help="Write the summary as JSON to this path")
+    args = parser.parse_args()
+
+    processes: list[ManagedProcess] = []
+    try:
+        if args.target:
+            base_url = args.target
+        else:
+            processes, base_url = start_environment(args)
+
+        summary, wall_time = asyncio.run(run_load(args, base_url))
+    finally:
+        for process in reversed(processes):
+            process.stop()
+
+    print_report(summary, wall_time, args)
+
+    if args.json_output:
+        with open(args.json_output, "w", encoding="utf-8") as f:
+            json.dump({"wall_time_s": wall_time, "endpoints": summary}, f, indent=2)
+
+    failures = check_budgets(summary, args)
+    for failure in failures:
+        print(f"❌ Budget exceeded: {failure}")
+    sys.exit(1 if failures else 0)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,244 @@
+"""
+Memory soak test for long-running workers.
+
+Runs the backend in-process (through httpx's ASGI transport) against the
+local fake upstreams and the Firestore emulator, and drives tens of thousands
+of /conversation/reply turns through it while sampling the process RSS and
+tracemalloc. Every turn allocates the upload, the multipart copy sent to STT,
+the MP3, its base64 data URL and the response model, so any of those being
+retained shows up as steady growth.
+
+Reports:
+    - baseline, peak and steady-state RSS, and steady-state memory per concurrent call
+    - RSS and traced-memory growth per 1,000 turns after warm-up (least squares slope)
+    - top allocation sites that grew between the end of warm-up and the end of the run
+
+Usage (from the backend directory):
+    python -m loadtest.soak --turns 20000 --concurrency 20
+    python -m loadtest.soak --turns 50000 --max-growth-kb-per-1k 128 --json-output soak.json
+
+Exits with status 1 when memory keeps growing past --max-growth-kb-per-1k.
+"""
+
+import argparse
+import asyncio
+import json
+import os
+import random
+import resource
+import statistics
+import sys
+import threading
+import time
+import tracemalloc
+
+import httpx
+
+from loadtest.run import ManagedProcess, start_upstreams
+
+
+def read_rss_bytes() -> int:
+    """Current resident set size of this process (peak RSS where /proc is unavailable)."""
+    try:
+        with open("/proc/self/statm") as f:
+            return int(f.read().split()[1]) * os.sysconf("SC_PAGE_SIZE")
+    except OSError:
+        # No /proc (macOS), where ru_maxrss is already in bytes
+        return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+
+
+def _slope_per_1k(samples: list[tuple[int, int]]) -> float:
+    """Least-squares slope of (turns, bytes) samples, in KiB per 1,000 turns."""
+    if len(samples) < 2:
+        return 0.0
+    xs = [turns for turns, _ in samples]
+    ys = [value for _, value in samples]
+    mean_x, mean_y = statistics.fmean(xs), statistics.fmean(ys)
+    denominator = sum((x - mean_x) ** 2 for x in xs)
+    if not denominator:
+        return 0.0
+    slope = sum((x - mean_x) * (y - mean_y) for x, y in zip(xs, ys)) / denominator
+    return slope * 1000 / 1024
+
+
+class SoakState:
+    """Shared counters and memory samples of a soak run."""
+
+    def __init__(self, total_turns: int, warmup_turns: int):
+        self.total_turns = total_turns
+        self.warmup_turns = warmup_turns
+        self.turns_done = 0
+        self.errors = 0
+        self.samples: list[dict] = []
+        self.warmup_snapshot: tracemalloc.Snapshot | None = None
+
+    @property
+    def finished(self) -> bool:
+        return self.turns_done >= self.total_turns
+
+
+async def simulate_caller(client: httpx.AsyncClient, index: int, args: argparse.Namespace, audio: bytes, state: SoakState) -> None:
+    """Make back-to-back calls until the soak reaches its target number of turns."""
+    senior_id = f"soak_senior_{index:04d}"
+    while not state.finished:
+        response = await client.post("/conversation/start", json={"senior_id": senior_id})
+        if response.status_code != 200:
+            state.errors += 1
+            continue
+        call_id = response.json()["call_id"]
+
+        for _ in range(args.turns_per_call):
+            if state.finished:
+                break
+            response = await client.post(
+                "/conversation/reply",
+                data={"senior_id": senior_id, "call_id": call_id},
+                files={"audio": ("turn.m4a", audio, "audio/m4a")},
+            )
+            state.turns_done += 1
+            if response.status_code != 200:
+                state.errors += 1
+
+            if state.turns_done == state.warmup_turns:
+                state.warmup_snapshot = tracemalloc.take_snapshot() if tracemalloc.is_tracing() else None
+
+        await client.post("/conversation/end", json={"senior_id": senior_id, "call_id": call_id})
+
+
+def sample_memory(state: SoakState, interval: float, stop: threading.Event) -> None:
+    """
+    Record RSS and traced memory every `interval` seconds until `stop` is set.
+
+    Runs in its own thread: handlers that block the event loop would otherwise
+    starve the sampler exactly when memory is being allocated.
+    """
+    start = time.monotonic()
+    while True:
+        traced = tracemalloc.get_traced_memory()[0] if tracemalloc.is_tracing() else 0
+        state.samples.append({
+            "elapsed_s": round(time.monotonic() - start, 1),
+            "turns": state.turns_done,
+            "rss_bytes": read_rss_bytes(),
+            "traced_bytes": traced,
+        })
+        if stop.wait(interval):
+            return
+
+
+async def run_soak(args: argparse.Namespace) -> dict:
+    # Import the app only now, so settings pick up the fake upstream environment
+    from main import app
+
+    audio = random.randbytes(args.audio_kb * 1024)
+    state = SoakState(args.turns, warmup_turns=int(args.turns * args.warmup))
+
+    if args.tracemalloc_frames:
+        tracemalloc.start(args.tracemalloc_frames)
+    baseline_rss = read_rss_bytes()
+
+    transport = httpx.ASGITransport(app=app)
+    async with httpx.AsyncClient(transport=transport, base_url="http://soak", timeout=args.timeout) as client:
+        stop = threading.Event()
+        sampler = threading.Thread(target=sample_memory, args=(state, args.sample_interval, stop), daemon=True)
+        sampler.start()
+        started = time.monotonic()
+        await asyncio.gather(*(
+            simulate_caller(client, i, args, audio, state) for i in range(args.concurrency)
+        ))
+        wall_time = time.monotonic() - started
+        stop.set()
+        sampler.join()
+
+    top_sites = []
+    if tracemalloc.is_tracing():
+        final_snapshot = tracemalloc.take_snapshot()
+        if state.warmup_snapshot is not None:
+            for stat in final_snapshot.compare_to(state.warmup_snapshot, "lineno")[: args.top]:
+                top_sites.append({
+                    "site": str(stat.traceback[0]),
+                    "size_diff_kb": round(stat.size_diff / 1024, 1),
+                    "count_diff": stat.count_diff,
+                })
+        tracemalloc.stop()
+
+    steady = [s for s in state.samples if s["turns"] >= state.warmup_turns]
+    steady_rss = statistics.median(s["rss_bytes"] for s in steady) if steady else baseline_rss
+    return {
+        "turns": state.turns_done,
+        "errors": state.errors,
+        "concurrency": args.concurrency,
+        "wall_time_s": round(wall_time, 1),
+        "turns_per_s": round(state.turns_done / wall_time, 1) if wall_time else 0.0,
+        "baseline_rss_mb": round(baseline_rss / 2**20, 1),
+        "peak_rss_mb": round(max(s["rss_bytes"] for s in state.samples) / 2**20, 1),
+        "steady_rss_mb": round(steady_rss / 2**20, 1),
+        "steady_mb_per_concurrent_call": round((steady_rss - baseline_rss) / 2**20 / args.concurrency, 2),
+        "rss_growth_kb_per_1k_turns": round(_slope_per_1k([(s["turns"], s["rss_bytes"]) for s in steady]), 1),
+        "traced_growth_kb_per_1k_turns": round(_slope_per_1k([(s["turns"], s["traced_bytes"]) for s in steady]), 1),
+        "top_growth_sites": top_sites,
+        "samples": state.samples,
+    }
+
+
+def print_report(report: dict) -> None:
+    print(f"\n{'=' * 70}")
+    print(
+        f"{report['turns']} turns, {report['concurrency']} concurrent calls, "
+        f"{report['wall_time_s']}s ({report['turns_per_s']} turns/s), {report['errors']} errors"
+    )
+    print(f"{'=' * 70}")
+    print(f"Baseline RSS:                 {report['baseline_rss_mb']} MB")
+    print(f"Peak RSS:                     {report['peak_rss_mb']} MB")
+    print(f"Steady-state RSS:             {report['steady_rss_mb']} MB")
+    print(f"Steady-state per call:        {report['steady_mb_per_concurrent_call']} MB")
+    print(f"RSS growth after warm-up:     {report['rss_growth_kb_per_1k_turns']} KB / 1k turns")
+    print(f"Traced growth after warm-up:  {report['traced_growth_kb_per_1k_turns']} KB / 1k turns")
+    if report["top_growth_sites"]:
+        print("\nTop allocation sites (growth since warm-up):")
+        for site in report["top_growth_sites"]:
+            print(f"  {site['size_diff_kb']:>10.1f} KB  {site['count_diff']:>+8}  {site['site']}")
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Memory soak test of /conversation/reply")
+    parser.add_argument("--turns", type=int, default=20000, help="Total reply turns to drive")
+    parser.add_argument("--concurrency", type=int, default=20, help="Concurrent calls")
+    parser.add_argument("--turns-per-call", type=int, default=30)
+    parser.add_argument("--audio-kb", type=int, default=96)
+    parser.add_argument("--warmup", type=float, default=0.1, help="Fraction of turns excluded as warm-up")
+    parser.add_argument("--sample-interval", type=float, default=2.0, help="Seconds between memory samples")
+    parser.add_argument("--tracemalloc-frames", type=int, default=1, help="0 disables tracemalloc")
+    parser.add_argument("--top", type=int, default=15, help="Allocation sites to report")
+    parser.add_argument("--timeout", type=float, default=60.0)
+    parser.add_argument("--stt-latency", default="fixed:5")
+    parser.add_argument("--studio-latency", default="fixed:5")
+    parser.add_argument("--tts-latency", default="fixed:5")
+    parser.add_argument("--error-rate", type=float, default=0.0)
+    parser.add_argument("--max-growth-kb-per-1k", type=float, default=256.0,
+                        help="Fail when RSS grows faster than this after warm-up")
+    parser.add_argument("--json-output", help="Write the report (with all samples) to this path")
+    args = parser.parse_args()
+
+    processes: list[ManagedProcess] = []
+    try:
+        processes, upstream_env = start_upstreams(args)
+        os.environ.update(upstream_env)
+        report = asyncio.run(run_soak(args))
+    finally:
+        for process in reversed(processes):
+            process.stop()
+
+    print_report(report)
+    if args.json_output:
+        with open(args.json_output, "w", encoding="utf-8") as f:
+            json.dump(report, f, indent=2)
+
+    growth = report["rss_growth_kb_per_1k_turns"]
+    if growth > args.max_growth_kb_per_1k:
+        print(f"❌ Possible leak: RSS grows {growth} KB per 1k turns (> {args.max_growth_kb_per_1k})")
+        sys.exit(1)
+    print("✅ No sustained memory growth detected")
+
+
+if __name__ == "__main__":
+    main()
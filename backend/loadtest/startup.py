@@ -0,0 +1,209 @@
+"""
+Cold-start benchmark: import time and time to first response.
+
+Measures, in fresh interpreters, what a scale-from-zero instance pays before
+it can answer:
+    - import time of the app module (`python -X importtime -c "import main"`),
+      with the packages that contribute most to it
+    - time from spawning uvicorn to the first successful GET /health/ (and,
+      with --wait-ready, to the first 200 from GET /health/ready)
+
+Heavy SDKs (Firebase Admin, Firestore, Google TTS, gRPC) must be imported on
+first use or by the startup warm-up, not when the app module is imported;
+the benchmark fails if any of them shows up in the import of main.
+
+Usage (from the backend directory):
+    python -m loadtest.startup --runs 5
+    python -m loadtest.startup --runs 5 --max-import-ms 800 --max-first-response-ms 2500 --json-output startup.json
+
+Exits with status 1 when a heavy SDK is imported eagerly or a --max-* budget
+is exceeded, so it can gate deploys.
+"""
+
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+import time
+from collections import defaultdict
+
+import httpx
+
+from loadtest.run import BACKEND_DIR, ManagedProcess, _free_port
+
+# Modules that must not be imported by `import main`
+HEAVY_MODULES = (
+    "firebase_admin",
+    "google.cloud.firestore",
+    "google.cloud.firestore_v1",
+    "google.cloud.texttospeech",
+    "grpc",
+)
+
+
+def parse_importtime(output: str) -> list[tuple[str, int, int]]:
+    """
+    Parse `-X importtime` output.
+
+    Returns:
+        list[tuple[str, int, int]]: (module, self µs, cumulative µs) per imported module
+    """
+    modules = []
+    for line in output.splitlines():
+        if not line.startswith("import time:") or "self [us]" in line:
+            continue
+        self_us, cumulative_us, name = line[len("import time:"):].split("|")
+        modules.append((name.strip(), int(self_us), int(cumulative_us)))
+    return modules
+
+
+def measure_imports(module: str) -> dict:
+    """Import `module` in a fresh interpreter and summarize its import time."""
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", f"import {module}"],
+        cwd=BACKEND_DIR,
+        capture_output=True,
+        text=True,
+        check=True,
+    )
+    modules = parse_importtime(result.stderr)
+    total_us = next(cumulative for name, _, cumulative in modules if name == module)
+
+    # Self time summed per top-level package ("google.cloud.firestore" for google.cloud.*)
+    packages: dict[str, int] = defaultdict(int)
+    for name, self_us, _ in modules:
+        parts = name.split(".")
+        package = ".".join(parts[:3] if parts[:2] == ["google", "cloud"] else parts[:1])
+        packages[package] += self_us
+
+    names = {name for name, _, _ in modules}
+    return {
+        "import_ms": total_us / 1000,
+        "modules": len(modules),
+        "packages_ms": {package: us / 1000 for package, us in packages.items()},
+        "eager_heavy": sorted(heavy for heavy in HEAVY_MODULES if heavy in names),
+    }
+
+
+def measure_first_response(wait_ready: bool, timeout: float) -> dict:
+    """Start uvicorn and time the first successful health (and readiness) responses."""
+    port = _free_port()
+    server = ManagedProcess(
+        "backend",
+        [sys.executable, "-m", "uvicorn", "main:app", "--host", "127.0.0.1", "--port", str(port)],
+        env=os.environ.copy(),
+    )
+    base_url = f"http://127.0.0.1:{port}"
+    started = time.perf_counter()
+    server.start()
+    try:
+        first_response = _poll(f"{base_url}/health/", started, timeout)
+        ready = _poll(f"{base_url}/health/ready", started, timeout) if wait_ready else None
+    finally:
+        server.stop()
+    return {"first_response_ms": first_response * 1000, "ready_ms": None if ready is None else ready * 1000}
+
+
+def _poll(url: str, started: float, timeout: float) -> float:
+    """Poll `url` until it answers 200; return the seconds elapsed since `started`."""
+    deadline = started + timeout
+    with httpx.Client(timeout=1.0) as client:
+        while time.perf_counter() < deadline:
+            try:
+                if client.get(url).status_code == 200:
+                    return time.perf_counter() - started
+            except httpx.HTTPError:
+                pass
+            time.sleep(0.01)
+    raise TimeoutError(f"{url} did not answer 200 within {timeout}s")
+
+
+def run_benchmark(args: argparse.Namespace) -> dict:
+    """Repeat the measurements `args.runs` times and summarize them (medians)."""
+    imports = [measure_imports(args.module) for _ in range(args.runs)]
+    responses = [measure_first_response(args.wait_ready, args.timeout) for _ in range(args.runs)]
+
+    packages = defaultdict(list)
+    for run in imports:
+        for package, ms in run["packages_ms"].items():
+            packages[package].append(ms)
+    top_packages = sorted(
+        ((package, statistics.median(samples)) for package, samples in packages.items()),
+        key=lambda item: item[1],
+        reverse=True,
+    )[: args.top]
+
+    ready_samples = [run["ready_ms"] for run in responses if run["ready_ms"] is not None]
+    return {
+        "runs": args.runs,
+        "module": args.module,
+        "import_ms_median": statistics.median(run["import_ms"] for run in imports),
+        "import_ms_min": min(run["import_ms"] for run in imports),
+        "modules_imported": imports[0]["modules"],
+        "eager_heavy_modules": imports[0]["eager_heavy"],
+        "first_response_ms_median": statistics.median(run["first_response_ms"] for run in responses),
+        "first_response_ms_max": max(run["first_response_ms"] for run in responses),
+        "ready_ms_median": statistics.median(ready_samples) if ready_samples else None,
+        "top_packages": [{"package": package, "self_ms": round(ms, 1)} for package, ms in top_packages],
+    }
+
+
+def print_report(report: dict) -> None:
+    print(f"\n{'=' * 60}")
+    print(f"Cold start of `{report['module']}` ({report['runs']} runs, medians)")
+    print(f"{'=' * 60}")
+    print(f"Import time:            {report['import_ms_median']:8.1f} ms  (min {report['import_ms_min']:.1f}, {report['modules_imported']} modules)")
+    print(f"Time to first response: {report['first_response_ms_median']:8.1f} ms  (max {report['first_response_ms_max']:.1f})")
+    if report["ready_ms_median"] is not None:
+        print(f"Time to ready:          {report['ready_ms_median']:8.1f} ms")
+    print(f"Heavy SDKs imported eagerly: {', '.join(report['eager_heavy_modules']) or 'none'}")
+    print("\nSlowest packages to import (self time):")
+    for row in report["top_packages"]:
+        print(f"  {row['self_ms']:>8.1f} ms  {row['package']}")
+
+
+def check_budgets(report: dict, args: argparse.Namespace) -> list[str]:
+    """Return a description of every exceeded budget."""
+    failures = []
+    if report["eager_heavy_modules"]:
+        failures.append(f"heavy SDKs imported by `import {report['module']}`: {', '.join(report['eager_heavy_modules'])}")
+    if args.max_import_ms is not None and report["import_ms_median"] > args.max_import_ms:
+        failures.append(f"import time {report['import_ms_median']:.1f} ms > {args.max_import_ms} ms")
+    if args.max_first_response_ms is not None and report["first_response_ms_median"] > args.max_first_response_ms:
+        failures.append(
+            f"time to first response {report['first_response_ms_median']:.1f} ms > {args.max_first_response_ms} ms"
+        )
+    return failures
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Measure import time and time to first response of the backend")
+    parser.add_argument("--runs", type=int, default=5, help="Fresh interpreters / servers to measure")
+    parser.add_argument("--module", default="main", help="Module to import (the ASGI app module)")
+    parser.add_argument("--wait-ready", action="store_true", help="Also time GET /health/ready (needs reachable upstreams)")
+    parser.add_argument("--timeout", type=float, default=60.0, help="Seconds to wait for the server to answer")
+    parser.add_argument("--top", type=int, default=10, help="Packages listed in the report")
+    parser.add_argument("--max-import-ms", type=float, default=None)
+    parser.add_argument("--max-first-response-ms", type=float, default=None)
+    parser.add_argument("--json-output", help="Write the report as JSON to this path")
+    args = parser.parse_args()
+
+    report = run_benchmark(args)
+    print_report(report)
+
+    if args.json_output:
+        with open(args.json_output, "w") as f:
+            json.dump(report, f, indent=2)
+
+    failures = check_budgets(report, args)
+    for failure in failures:
+        print(f"❌ Budget exceeded: {failure}")
+    if not failures:
+        print("✅ Cold start within budget")
+    sys.exit(1 if failures else 0)
+
+
+if __name__ == "__main__":
+    main()
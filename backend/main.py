@@ -14,19 +14,81 @@ For production deployment:
     uvicorn main:app --host 0.0.0.0 --port 8000 --workers 4
 """
 
+import asyncio
+from contextlib import asynccontextmanager, suppress
+
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
 
 from config import settings
-from routers import health, conversation, quiz
+from middleware.admission import AdmissionControlMiddleware
+from middleware.rate_limit import RateLimitMiddleware, close_rate_limit_backend, get_rate_limit_backend
+from monitoring.timing import ServerTimingMiddleware
+from routers import health, conversation, quiz, seniors, metrics
+from services import warmup
+from services.quiz_selection import flush_quiz_selections
+from services.upstream_scheduler import shutdown_background_executor
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    """
+    Start and stop the application's background jobs.
+    
+    The warm-up job initializes Firebase and the upstream clients and opens
+    their connections in the background, so the server accepts connections
+    right away and /health/ready turns green once the first requests will
+    not pay the cold-start setup. On shutdown, pending quiz selection
+    updates are written and shared clients are closed.
+    
+    When enabled, the question pool job keeps the quiz question bank synced
+    with (and topped up by) generated questions, off the request path.
+    
+    The rate limit backend is created before serving, so a misconfigured
+    shared backend fails the startup instead of every request.
+    """
+    if settings.rate_limit_enabled:
+        get_rate_limit_backend()
+    
+    background_tasks = []
+    if settings.warmup_enabled:
+        background_tasks.append(asyncio.create_task(warmup.run_warmup()))
+    else:
+        warmup.mark_ready()
+    
+    if settings.quiz_pool_enabled:
+        from services.question_bank import get_question_bank
+        from services.quiz_generator import QuizPoolGenerator
+        background_tasks.append(asyncio.create_task(QuizPoolGenerator(get_question_bank()).run()))
+    
+    yield
+    
+    for task in background_tasks:
+        task.cancel()
+        with suppress(asyncio.CancelledError):
+            await task
+    
+    shutdown_background_executor()
+    await flush_quiz_selections()
+    await warmup.close_clients()
+    await close_rate_limit_backend()
+
 
 # Create FastAPI application instance
 app = FastAPI(
     title=settings.app_name,
     description="Backend API for Hyosimi - AI-powered senior care and conversation system",
     version="1.0.0",
+    lifespan=lifespan,
 )
 
+# Shed new calls under overload (added first so it runs inside CORS and
+# rejections still carry the CORS headers)
+app.add_middleware(AdmissionControlMiddleware)
+
+# Rate limit conversation requests per senior and per client (outside
+# admission control, so rejected requests do not count as load)
+app.add_middleware(RateLimitMiddleware)
+
 # Configure CORS middleware
 # TODO: Restrict origins in production to specific domains
 # For MVP, allowing all origins for easier frontend development
@@ -36,12 +98,18 @@ app.add_middleware(
     allow_credentials=True,
     allow_methods=["*"],  # Allows all HTTP methods (GET, POST, PUT, DELETE, etc.)
     allow_headers=["*"],  # Allows all headers
+    expose_headers=["Server-Timing", "X-Profile-Id", "ETag"],  # Readable by browser clients
 )
 
+# Report per-stage durations (and on-demand profiles) for the feature routers
+app.add_middleware(ServerTimingMiddleware, path_prefixes=("/conversation", "/quiz", "/seniors"))
+
 # Include routers
 app.include_router(health.router)
 app.include_router(conversation.router)
 app.include_router(quiz.router)
+app.include_router(seniors.router)
+app.include_router(metrics.router)
 
 
 @app.get("/")
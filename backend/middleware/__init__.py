@@ -0,0 +1,6 @@
+"""
+Middleware package.
+
+This package contains the ASGI middleware that protects the backend
+application under load (admission control and load shedding).
+"""
@@ -0,0 +1,203 @@
+"""
+Admission control and load shedding for the conversation endpoints.
+
+Under overload, accepting every request only makes all of them wait for
+upstream slots until they time out. The admission controller tracks the
+requests in flight and a moving average (EWMA) of each endpoint's duration,
+and sheds load where it hurts least: a new call (/conversation/start) is
+rejected early with 503 and a Retry-After header, while the requests of
+calls already in progress (/reply, /end, and /stream connections, each of
+which runs one turn) are always admitted, so seniors who are talking are not
+cut off, but counted.
+
+A new call is rejected when either
+    - the conversation requests in flight reach settings.admission_start_threshold
+      of settings.admission_capacity, keeping the rest for calls in progress
+    - the estimated queue time of a conversation turn exceeds
+      settings.admission_max_queue_seconds
+
+The estimated queue time is the time for the requests beyond capacity to
+drain: (in flight - capacity + 1) x EWMA turn duration / capacity, where the
+turn duration is the longer of the /reply and /stream averages (a streamed
+turn also lasts while the senior speaks, so under streaming load the
+estimate errs on the side of shedding).
+Rejections are counted in cooltiger_rejected_requests_total.
+"""
+
+import logging
+import math
+import time
+
+from starlette.responses import JSONResponse
+from starlette.types import ASGIApp, Receive, Scope, Send
+
+from config import settings
+from monitoring.metrics import record_rejected_request
+
+# Configure logger
+logger = logging.getLogger(__name__)
+
+# Admission policy per endpoint: "shed" endpoints are rejected under load,
+# "protected" ones (calls in progress) are always admitted
+POLICIES = {
+    "/conversation/start": "shed",
+    "/conversation/reply": "protected",
+    "/conversation/end": "protected",
+    "/conversation/stream": "protected",
+}
+
+# Endpoints running conversation turns, whose duration decides whether the
+# instance can take a new call
+_TURN_ENDPOINTS = ("/conversation/reply", "/conversation/stream")
+
+# Bounds of the Retry-After header, in seconds
+_MIN_RETRY_AFTER = 1
+_MAX_RETRY_AFTER = 60
+
+
+class EndpointLoad:
+    """
+    Load of one endpoint.
+
+    Attributes:
+        in_flight: Requests being processed
+        ewma_seconds: Moving average of the request duration (None until one completes)
+    """
+
+    __slots__ = ("in_flight", "ewma_seconds")
+
+    def __init__(self):
+        self.in_flight = 0
+        self.ewma_seconds: float | None = None
+
+    def observe(self, duration: float, alpha: float) -> None:
+        if self.ewma_seconds is None:
+            self.ewma_seconds = duration
+        else:
+            self.ewma_seconds += alpha * (duration - self.ewma_seconds)
+
+
+class AdmissionController:
+    """
+    In-flight and duration tracking of the admission-controlled endpoints.
+
+    Only used from the event loop, so no locking is needed.
+
+    Example:
+        >>> controller = AdmissionController()
+        >>> retry_after = controller.check("/conversation/start")
+    """
+
+    def __init__(self):
+        self.endpoints: dict[str, EndpointLoad] = {path: EndpointLoad() for path in POLICIES}
+
+    @property
+    def in_flight(self) -> int:
+        return sum(load.in_flight for load in self.endpoints.values())
+
+    def turn_seconds(self) -> float | None:
+        """Moving average of a conversation turn's duration (None until a turn completes)."""
+        averages = [
+            self.endpoints[path].ewma_seconds for path in _TURN_ENDPOINTS
+            if self.endpoints[path].ewma_seconds is not None
+        ]
+        return max(averages) if averages else None
+
+    def queue_seconds(self) -> float:
+        """Estimated time a new conversation turn waits for capacity, in seconds."""
+        ewma = self.turn_seconds()
+        capacity = settings.admission_capacity
+        ahead = self.in_flight - capacity + 1
+        if ewma is None or ahead <= 0:
+            return 0.0
+        return ahead * ewma / capacity
+
+    def check(self, path: str) -> int | None:
+        """
+        Decide whether to admit a request.
+
+        Args:
+            path: Request path (one of POLICIES)
+
+        Returns:
+            int | None: None to admit the request, or the Retry-After delay
+                        in seconds to reject it with
+        """
+        if POLICIES[path] == "protected":
+            return None
+
+        capacity = settings.admission_capacity
+        start_limit = max(1, math.floor(capacity * settings.admission_start_threshold))
+        in_flight = self.in_flight
+        queue_seconds = self.queue_seconds()
+        if in_flight < start_limit and queue_seconds <= settings.admission_max_queue_seconds:
+            return None
+
+        # Time for the requests above the limit to drain, at the average turn duration
+        ewma = self.turn_seconds() or 1.0
+        drain_seconds = max(queue_seconds, (in_flight - start_limit + 1) * ewma / capacity)
+        return min(_MAX_RETRY_AFTER, max(_MIN_RETRY_AFTER, math.ceil(drain_seconds)))
+
+    def started(self, path: str) -> None:
+        self.endpoints[path].in_flight += 1
+
+    def finished(self, path: str, duration: float) -> None:
+        load = self.endpoints[path]
+        load.in_flight -= 1
+        load.observe(duration, settings.admission_ewma_alpha)
+
+
+class AdmissionControlMiddleware:
+    """
+    ASGI middleware applying admission control to the conversation endpoints.
+
+    Requests are checked before their body is read. /stream WebSocket
+    connections are admitted and counted for as long as their turn runs.
+    Other paths and non-POST requests are passed through untouched.
+
+    Attributes:
+        app: The wrapped ASGI application
+        controller: Load tracking and admission decisions
+
+    Example:
+        >>> app.add_middleware(AdmissionControlMiddleware)
+    """
+
+    def __init__(self, app: ASGIApp):
+        self.app = app
+        self.controller = AdmissionController()
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        path = scope.get("path")
+        if (
+            not settings.admission_enabled
+            or path not in POLICIES
+            or not (
+                (scope["type"] == "http" and scope["method"] == "POST")
+                or (scope["type"] == "websocket" and POLICIES[path] == "protected")
+            )
+        ):
+            await self.app(scope, receive, send)
+            return
+
+        retry_after = self.controller.check(path)
+        if retry_after is not None:
+            logger.warning(
+                f"Rejecting {path}: {self.controller.in_flight} requests in flight, "
+                f"retry after {retry_after}s"
+            )
+            record_rejected_request(path, "overloaded")
+            response = JSONResponse(
+                {"detail": "Server is busy. Please try again shortly."},
+                status_code=503,
+                headers={"Retry-After": str(retry_after)},
+            )
+            await response(scope, receive, send)
+            return
+
+        self.controller.started(path)
+        start = time.perf_counter()
+        try:
+            await self.app(scope, receive, send)
+        finally:
+            self.controller.finished(path, time.perf_counter() - start)
@@ -0,0 +1,529 @@
+"""
+Per-senior and per-client rate limiting of the conversation endpoints.
+
+Every conversation turn costs upstream quota (a /reply upload or a /stream
+connection runs STT, LLM and TTS calls), so a client stuck in a retry loop
+is stopped at the edge, before the request's audio is read. Each request
+takes a token from two token buckets, and is rejected with 429 and a
+Retry-After header (a /stream connection is closed with code 1013 before it
+is accepted) unless both have one:
+    senior  keyed by the senior the call belongs to: the senior_id of a
+            /start request, and for the requests of a call (/reply, /end,
+            /stream) the senior who started it. The senior and call IDs are
+            read from the small JSON body of /start and /end, the
+            X-Senior-Id and X-Call-Id headers of /reply (required, as they
+            must be known before the audio upload) and the query string of
+            /stream. The call must be in the call registry, or exist in
+            Firestore under that senior (it is then registered); requests of
+            other calls are rejected with 404.
+    client  keyed by the client IP address (with a larger allowance, as
+            devices behind one NAT share it). Behind a proxy, the address is
+            the X-Forwarded-For entry appended by the trusted proxy
+            (settings.rate_limit_proxy_hops from the right), never one the
+            client could have sent.
+
+/reply and /stream share the senior's turn bucket. Buckets refill at the
+endpoint's rate per minute up to its burst size (settings.rate_limit_*).
+Rejections are counted in cooltiger_rejected_requests_total with the reason
+"rate_limited". The senior of a new call is registered by the /start handler
+(`register_call`) in the backend, so checking the requests of a call usually
+needs no Firestore read.
+
+Backends:
+    MemoryRateLimitBackend  buckets and calls in this process (the default)
+    RedisRateLimitBackend   buckets and calls shared by all workers and
+                            instances, in Redis (settings.rate_limit_backend
+                            = "redis"); requires the optional redis package,
+                            or a client (or a local stand-in for tests)
+                            passed in
+
+Example:
+    >>> app.add_middleware(RateLimitMiddleware)
+    >>> set_rate_limit_backend(MemoryRateLimitBackend())
+    >>> await register_call(call_id, request.senior_id)
+"""
+
+import json
+import logging
+import math
+import time
+from abc import ABC, abstractmethod
+
+from cachetools import LRUCache
+from fastapi import HTTPException, Request, status
+from starlette.datastructures import Headers, QueryParams
+from starlette.responses import JSONResponse
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+from config import settings
+from db.async_firestore import call_exists
+from monitoring.metrics import record_rejected_request
+
+# Configure logger
+logger = logging.getLogger(__name__)
+
+# Bounds of the Retry-After header, in seconds
+_MIN_RETRY_AFTER = 1
+_MAX_RETRY_AFTER = 3600
+
+# Largest JSON body read to identify a /start or /end request, in bytes
+_MAX_JSON_BODY = 16 * 1024
+
+# Senior bucket of each rate limited endpoint (turns share one)
+_SENIOR_BUCKETS = {
+    "/conversation/start": "start",
+    "/conversation/end": "end",
+    "/conversation/reply": "turn",
+    "/conversation/stream": "turn",
+}
+
+_REJECTED_DETAIL = "Too many requests. Please try again shortly."
+
+
+class Limit:
+    """
+    Token bucket parameters.
+
+    Attributes:
+        rate: Tokens added per second
+        burst: Bucket size (requests allowed at once after a pause)
+    """
+
+    __slots__ = ("rate", "burst")
+
+    def __init__(self, per_minute: float, burst: int):
+        self.rate = per_minute / 60
+        self.burst = max(1, burst)
+
+    def scaled(self, factor: float) -> "Limit":
+        return Limit(self.rate * 60 * factor, math.ceil(self.burst * factor))
+
+
+def endpoint_limit(path: str) -> Limit | None:
+    """
+    Return the per-senior limit of a conversation endpoint.
+
+    Args:
+        path: Request path
+
+    Returns:
+        Limit | None: The endpoint's limit, or None if it is not rate limited
+    """
+    if path in ("/conversation/reply", "/conversation/stream"):
+        return Limit(settings.rate_limit_reply_per_minute, settings.rate_limit_reply_burst)
+    if path in ("/conversation/start", "/conversation/end"):
+        return Limit(settings.rate_limit_call_per_minute, settings.rate_limit_call_burst)
+    return None
+
+
+class RateLimitBackend(ABC):
+    """Base class of token bucket and call registry stores."""
+
+    @abstractmethod
+    async def acquire(self, buckets: list[tuple[str, Limit]]) -> float:
+        """
+        Take one token from each bucket, only if all of them have one.
+
+        Args:
+            buckets: Bucket keys with their limits
+
+        Returns:
+            float: 0 if the tokens were taken, otherwise the seconds until
+                   every bucket has a token again
+        """
+
+    @abstractmethod
+    async def register_call(self, call_id: str, senior_id: str, ttl: float) -> None:
+        """Record the senior of a call for `ttl` seconds."""
+
+    @abstractmethod
+    async def call_senior(self, call_id: str) -> str | None:
+        """Return the senior of a registered call, or None if the call is unknown."""
+
+    async def close(self) -> None:
+        """Release the backend's connections, if any."""
+
+
+class MemoryRateLimitBackend(RateLimitBackend):
+    """Token buckets and calls of this process, for single-instance deployments and tests."""
+
+    def __init__(self, max_keys: int | None = None):
+        max_keys = max_keys or settings.rate_limit_cache_size
+        # key -> [tokens, refilled_at]; evicted buckets start full again
+        self._buckets: LRUCache = LRUCache(maxsize=max_keys)
+        # call ID -> (senior ID, expires_at); evicted calls are looked up again
+        self._calls: LRUCache = LRUCache(maxsize=max_keys)
+
+    async def acquire(self, buckets: list[tuple[str, Limit]]) -> float:
+        now = time.monotonic()
+        states = []
+        wait = 0.0
+        for key, limit in buckets:
+            state = self._buckets.get(key)
+            if state is None:
+                state = self._buckets[key] = [float(limit.burst), now]
+            state[0] = min(limit.burst, state[0] + (now - state[1]) * limit.rate)
+            state[1] = now
+            if state[0] < 1:
+                wait = max(wait, (1 - state[0]) / limit.rate)
+            states.append(state)
+
+        if wait > 0:
+            return wait
+        for state in states:
+            state[0] -= 1
+        return 0.0
+
+    async def register_call(self, call_id: str, senior_id: str, ttl: float) -> None:
+        self._calls[call_id] = (senior_id, time.monotonic() + ttl)
+
+    async def call_senior(self, call_id: str) -> str | None:
+        entry = self._calls.get(call_id)
+        if entry is None or entry[1] < time.monotonic():
+            return None
+        return entry[0]
+
+
+# Takes one token from each bucket KEYS[i] (limit ARGV[2i-1] tokens per
+# second, ARGV[2i] burst) if all have one; returns the wait in seconds as a
+# string (Lua numbers are truncated to integers on return)
+_ACQUIRE_SCRIPT = """
+local time = redis.call('TIME')
+local now = tonumber(time[1]) + tonumber(time[2]) / 1000000
+local tokens = {}
+local wait = 0
+for i, key in ipairs(KEYS) do
+    local rate = tonumber(ARGV[2 * i - 1])
+    local burst = tonumber(ARGV[2 * i])
+    local state = redis.call('HMGET', key, 'tokens', 'ts')
+    local available = burst
+    if state[1] then
+        available = math.min(burst, tonumber(state[1]) + (now - tonumber(state[2])) * rate)
+    end
+    if available < 1 then
+        wait = math.max(wait, (1 - available) / rate)
+    end
+    tokens[i] = available
+end
+if wait > 0 then
+    return tostring(wait)
+end
+for i, key in ipairs(KEYS) do
+    local rate = tonumber(ARGV[2 * i - 1])
+    local burst = tonumber(ARGV[2 * i])
+    redis.call('HSET', key, 'tokens', tokens[i] - 1, 'ts', now)
+    redis.call('EXPIRE', key, math.ceil(burst / rate) + 1)
+end
+return '0'
+"""
+
+
+class RedisRateLimitBackend(RateLimitBackend):
+    """
+    Token buckets and calls in Redis, shared by every worker and instance.
+
+    Buckets are updated atomically by a Lua script using the Redis server's
+    clock, and expire once they would be full again. Calls expire after
+    settings.rate_limit_call_ttl_seconds.
+
+    Attributes:
+        client: redis.asyncio client (or any object with compatible `eval`,
+                `set` and `get`)
+    """
+
+    def __init__(self, client=None, url: str | None = None, key_prefix: str = "cooltiger:ratelimit:"):
+        if client is None:
+            url = url or settings.rate_limit_redis_url
+            if not url:
+                raise ValueError("RATE_LIMIT_REDIS_URL is required for the redis rate limit backend")
+            try:
+                import redis.asyncio as redis_asyncio
+            except ImportError as e:
+                raise RuntimeError("The redis rate limit backend requires the redis package") from e
+            client = redis_asyncio.from_url(url)
+        self.client = client
+        self.key_prefix = key_prefix
+
+    async def acquire(self, buckets: list[tuple[str, Limit]]) -> float:
+        keys = [self.key_prefix + key for key, _ in buckets]
+        args = [value for _, limit in buckets for value in (limit.rate, limit.burst)]
+        wait = await self.client.eval(_ACQUIRE_SCRIPT, len(keys), *keys, *args)
+        return float(wait.decode() if isinstance(wait, bytes) else wait)
+
+    async def register_call(self, call_id: str, senior_id: str, ttl: float) -> None:
+        await self.client.set(f"{self.key_prefix}call:{call_id}", senior_id, ex=max(1, math.ceil(ttl)))
+
+    async def call_senior(self, call_id: str) -> str | None:
+        senior_id = await self.client.get(f"{self.key_prefix}call:{call_id}")
+        return senior_id.decode() if isinstance(senior_id, bytes) else senior_id
+
+    async def close(self) -> None:
+        close = getattr(self.client, "aclose", None)
+        if close is not None:
+            await close()
+
+
+_backend: RateLimitBackend | None = None
+
+
+def get_rate_limit_backend() -> RateLimitBackend:
+    """Return the rate limit backend, creating the configured one on first use."""
+    global _backend
+    if _backend is None:
+        if settings.rate_limit_backend == "redis":
+            _backend = RedisRateLimitBackend()
+        else:
+            _backend = MemoryRateLimitBackend()
+        logger.info(f"Using rate limit backend: {type(_backend).__name__}")
+    return _backend
+
+
+def set_rate_limit_backend(backend: RateLimitBackend) -> None:
+    """
+    Install the rate limit backend (e.g., a shared backend or a test stand-in).
+
+    Example:
+        >>> set_rate_limit_backend(RedisRateLimitBackend(client=redis_client))
+    """
+    global _backend
+    _backend = backend
+    logger.info(f"Using rate limit backend: {type(backend).__name__}")
+
+
+async def close_rate_limit_backend() -> None:
+    """Close the rate limit backend's connections (at shutdown)."""
+    if _backend is not None:
+        await _backend.close()
+
+
+async def _acquire(buckets: list[tuple[str, Limit]], path: str) -> int:
+    """Take the tokens, returning 0 or the Retry-After of the rejection (admits on backend errors)."""
+    try:
+        wait = await get_rate_limit_backend().acquire(buckets)
+    except Exception as e:
+        logger.error(f"Rate limit backend failed, admitting {path}: {str(e)}")
+        return 0
+    if wait <= 0:
+        return 0
+
+    retry_after = min(_MAX_RETRY_AFTER, max(_MIN_RETRY_AFTER, math.ceil(wait)))
+    logger.warning(f"Rate limited {path} ({', '.join(key for key, _ in buckets)}), retry after {retry_after}s")
+    record_rejected_request(path, "rate_limited")
+    return retry_after
+
+
+async def register_call(call_id: str, senior_id: str) -> None:
+    """
+    Record the senior of a new call, whose later requests use that senior's bucket.
+
+    Called by the /start handler, so the requests of the call are checked
+    without reading the call from Firestore.
+
+    Args:
+        call_id: The call session ID
+        senior_id: Senior the call was started for
+    """
+    if not settings.rate_limit_enabled:
+        return
+    try:
+        await get_rate_limit_backend().register_call(call_id, senior_id, settings.rate_limit_call_ttl_seconds)
+    except Exception as e:
+        logger.error(f"Failed to register call {call_id} for rate limiting: {str(e)}")
+
+
+def verify_call(request: Request, senior_id: str, call_id: str) -> None:
+    """
+    Check the senior and call ID of a request against those the rate limit was applied to.
+
+    Args:
+        request: The HTTP request
+        senior_id: senior_id of the request body
+        call_id: call_id of the request body
+
+    Raises:
+        HTTPException: 403 if the body names another senior or call than
+                       the one rate limited (e.g., other X-Call-Id and
+                       X-Senior-Id headers than the /reply form fields)
+
+    Example:
+        >>> verify_call(request, senior_id, call_id)
+    """
+    verified = request.scope.get("state", {}).get("rate_limited_call")
+    if verified is not None and verified != (call_id, senior_id):
+        raise HTTPException(
+            status_code=status.HTTP_403_FORBIDDEN,
+            detail="Call does not belong to this senior",
+        )
+
+
+def client_address(scope: Scope) -> str:
+    """
+    Return the address of the client of a request.
+
+    Behind settings.rate_limit_proxy_hops trusted proxies, each appending the
+    address it received the request from to X-Forwarded-For, that is the
+    entry the first proxy appended; the entries before it were sent by the
+    client and are ignored.
+
+    Args:
+        scope: ASGI scope of the request
+
+    Returns:
+        str: Client IP address ("unknown" if there is none)
+    """
+    hops = settings.rate_limit_proxy_hops
+    if hops > 0:
+        forwarded = [
+            address.strip()
+            for value in Headers(scope=scope).getlist("x-forwarded-for")
+            for address in value.split(",")
+            if address.strip()
+        ]
+        if len(forwarded) >= hops:
+            return forwarded[-hops]
+    client = scope.get("client")
+    return client[0] if client else "unknown"
+
+
+async def _read_json_body(receive: Receive) -> tuple[dict | None, list[Message]]:
+    # Reads a small JSON body, returning it (None if it is not a JSON object)
+    # with the messages received, to pass on to the application
+    messages, body = [], b""
+    while True:
+        message = await receive()
+        messages.append(message)
+        if message["type"] != "http.request":
+            return None, messages
+        body += message.get("body", b"")
+        if len(body) > _MAX_JSON_BODY:
+            raise ValueError("Request body too large")
+        if not message.get("more_body"):
+            break
+    try:
+        data = json.loads(body)
+    except ValueError:
+        return None, messages
+    return (data if isinstance(data, dict) else None), messages
+
+
+async def _call_owner(senior_id: str, call_id: str) -> str | None:
+    # The call's senior if the call belongs to `senior_id`, else None
+    backend = get_rate_limit_backend()
+    owner = await backend.call_senior(call_id)
+    if owner is None and await call_exists(senior_id, call_id):
+        # Started before a restart, or on an instance with its own registry
+        owner = senior_id
+        await backend.register_call(call_id, senior_id, settings.rate_limit_call_ttl_seconds)
+    return owner if owner == senior_id else None
+
+
+def _replay(messages: list[Message], receive: Receive) -> Receive:
+    async def replay() -> Message:
+        if messages:
+            return messages.pop(0)
+        return await receive()
+    return replay
+
+
+class RateLimitMiddleware:
+    """
+    ASGI middleware applying the per-senior and per-client rate limits.
+
+    Requests are checked before the handler runs and before any audio is
+    read. Other paths and non-POST requests are passed through untouched.
+    If the backend fails (e.g., Redis is unreachable), requests are admitted.
+
+    Attributes:
+        app: The wrapped ASGI application
+
+    Example:
+        >>> app.add_middleware(RateLimitMiddleware)
+    """
+
+    def __init__(self, app: ASGIApp):
+        self.app = app
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        path = scope.get("path")
+        limit = endpoint_limit(path)
+        if (
+            not settings.rate_limit_enabled
+            or limit is None
+            or not (
+                (scope["type"] == "http" and scope["method"] == "POST" and path != "/conversation/stream")
+                or (scope["type"] == "websocket" and path == "/conversation/stream")
+            )
+        ):
+            await self.app(scope, receive, send)
+            return
+
+        # Identify the senior (and call) the request is for
+        senior_id, call_id = None, None
+        if path in ("/conversation/start", "/conversation/end"):
+            try:
+                body, messages = await _read_json_body(receive)
+            except ValueError:
+                await self._respond(scope, receive, send, 413, "Request body too large")
+                return
+            receive = _replay(messages, receive)
+            if body is not None and isinstance(body.get("senior_id"), str):
+                senior_id = body["senior_id"]
+            if path == "/conversation/end":
+                call_id = body.get("call_id") if body is not None else None
+        elif path == "/conversation/reply":
+            headers = Headers(scope=scope)
+            senior_id, call_id = headers.get("x-senior-id"), headers.get("x-call-id")
+            if not senior_id or not call_id:
+                await self._respond(scope, receive, send, 400, "X-Senior-Id and X-Call-Id headers are required")
+                return
+        else:
+            query = QueryParams(scope.get("query_string", b""))
+            senior_id, call_id = query.get("senior_id"), query.get("call_id")
+
+        buckets = [(f"ip:{client_address(scope)}:{path}", limit.scaled(settings.rate_limit_ip_factor))]
+        if path != "/conversation/start" and isinstance(senior_id, str) and isinstance(call_id, str):
+            try:
+                owner = await _call_owner(senior_id, call_id)
+            except Exception as e:
+                logger.error(f"Call lookup failed, admitting {path}: {str(e)}")
+                await self.app(scope, receive, send)
+                return
+            if owner is None:
+                logger.warning(f"Rejected {path} of an unknown call: {call_id} (senior {senior_id})")
+                await self._respond(scope, receive, send, status.HTTP_404_NOT_FOUND, "Call not found")
+                return
+            # The handler checks its body against the call rate limited here
+            scope.setdefault("state", {})["rate_limited_call"] = (call_id, senior_id)
+        elif path != "/conversation/start":
+            # Malformed request, rejected by the handler's validation
+            senior_id = None
+        if isinstance(senior_id, str):
+            buckets.append((f"senior:{senior_id}:{_SENIOR_BUCKETS[path]}", limit))
+
+        retry_after = await _acquire(buckets, path)
+        if retry_after:
+            await self._respond(
+                scope, receive, send, status.HTTP_429_TOO_MANY_REQUESTS, _REJECTED_DETAIL,
+                headers={"Retry-After": str(retry_after)},
+            )
+            return
+
+        await self.app(scope, receive, send)
+
+    async def _respond(
+        self,
+        scope: Scope,
+        receive: Receive,
+        send: Send,
+        status_code: int,
+        detail: str,
+        headers: dict[str, str] | None = None,
+    ) -> None:
+        if scope["type"] == "websocket":
+            # Closed before the handshake completes: the client gets an HTTP 403
+            retry_after = (headers or {}).get("Retry-After")
+            reason = f"{detail} (retry after {retry_after}s)" if retry_after else detail
+            await send({"type": "websocket.close", "code": 1013 if retry_after else 1008, "reason": reason})
+            return
+        response = JSONResponse({"detail": detail}, status_code=status_code, headers=headers)
+        await response(scope, receive, send)
@@ -0,0 +1,144 @@
+"""
+Call history models.
+
+This module defines Pydantic models for the caregiver-facing call history
+endpoints (past calls of a senior and their conversation turns).
+"""
+
+from pydantic import BaseModel
+
+
+class CallSummary(BaseModel):
+    """
+    Summary of a past call, without its transcript.
+
+    Attributes:
+        call_id: Unique identifier of the call
+        started_at: ISO timestamp of the start of the call
+        ended_at: ISO timestamp of the end of the call (None if still in progress)
+        summary: Summary of the conversation
+        mood: Assessed mood of the senior
+        risk_level: Risk assessment level ("low", "medium" or "high")
+
+    Example:
+        >>> call = CallSummary(
+        ...     call_id="call_456",
+        ...     started_at="2025-11-20T09:00:00+00:00",
+        ...     ended_at="2025-11-20T09:12:30+00:00",
+        ...     summary="Talked about the grandchildren's visit",
+        ...     mood="happy",
+        ...     risk_level="low"
+        ... )
+    """
+    call_id: str
+    started_at: str | None = None
+    ended_at: str | None = None
+    summary: str | None = None
+    mood: str | None = None
+    risk_level: str | None = None
+
+
+class CallListResponse(BaseModel):
+    """
+    Response model for one page of a senior's calls.
+
+    Attributes:
+        success: Whether the calls were successfully retrieved
+        calls: Calls of the page, newest first
+        next_cursor: Cursor of the next page (None on the last page)
+        message: Optional message with additional context or error details
+
+    Example:
+        >>> response = CallListResponse(success=True, calls=[call], next_cursor="WyIyMDI1...")
+    """
+    success: bool
+    calls: list[CallSummary] = []
+    next_cursor: str | None = None
+    message: str | None = None
+
+
+class RiskFeedCall(CallSummary):
+    """
+    A call in the cross-senior risk feed.
+
+    Attributes:
+        senior_id: Unique identifier of the senior the call belongs to
+        (plus all CallSummary attributes)
+
+    Example:
+        >>> call = RiskFeedCall(
+        ...     senior_id="senior_123",
+        ...     call_id="call_456",
+        ...     ended_at="2025-11-20T09:12:30+00:00",
+        ...     summary="Mentioned feeling dizzy since the morning",
+        ...     mood="anxious",
+        ...     risk_level="high"
+        ... )
+    """
+    senior_id: str
+
+
+class RiskFeedResponse(BaseModel):
+    """
+    Response model for one page of the cross-senior risk feed.
+
+    Attributes:
+        success: Whether the feed was successfully retrieved
+        calls: Calls of the page, most recently ended first
+        since: ISO timestamp of the start of the time window
+        next_cursor: Cursor of the next page (None on the last page)
+        message: Optional message with additional context or error details
+
+    Example:
+        >>> response = RiskFeedResponse(success=True, calls=[call], since="2025-11-19T09:15:00+00:00")
+    """
+    success: bool
+    calls: list[RiskFeedCall] = []
+    since: str | None = None
+    next_cursor: str | None = None
+    message: str | None = None
+
+
+class CallTurn(BaseModel):
+    """
+    One conversation turn of a call.
+
+    Attributes:
+        turn_id: Unique identifier of the turn
+        speaker: Who spoke ("senior" or "assistant")
+        text: What was said
+        timestamp: ISO timestamp of the turn
+
+    Example:
+        >>> turn = CallTurn(
+        ...     turn_id="turn_001",
+        ...     speaker="senior",
+        ...     text="오늘 손주가 왔어요",
+        ...     timestamp="2025-11-20T09:00:05+00:00"
+        ... )
+    """
+    turn_id: str
+    speaker: str | None = None
+    text: str | None = None
+    timestamp: str | None = None
+
+
+class CallTurnsResponse(BaseModel):
+    """
+    Response model for one page of a call's turns.
+
+    Attributes:
+        success: Whether the turns were successfully retrieved
+        call_id: Unique identifier of the call
+        turns: Turns of the page, in chronological order
+        next_cursor: Cursor of the next page (None on the last page)
+        message: Optional message with additional context or error details
+
+    Example:
+        >>> response = CallTurnsResponse(success=True, call_id="call_456", turns=[turn])
+    """
+    success: bool
+    call_id: str
+    turns: list[CallTurn] = []
+    next_cursor: str | None = None
+    message: str | None = None
@@ -129,15 +129,26 @@ class QuizSubmitResponse(BaseModel):
     """
     Response model for quiz submission endpoint.
     
-    Indicates whether the quiz answers were successfully recorded.
+    Indicates whether the quiz answers were successfully recorded, together
+    with the score computed against the quiz's answer key.
     
     Attributes:
         success: Whether the submission was successfully processed
+        score: Fraction of scored questions answered correctly (0.0-1.0)
+        correct_count: Number of scored questions answered correctly
+        scored_count: Number of scored questions in the quiz
+        results: Correctness per scored question ID
+        category_accuracy: Accuracy per question category
         message: Optional message with additional context or error details
         
     Example:
         >>> response = QuizSubmitResponse(
         ...     success=True,
+        ...     score=0.5,
+        ...     correct_count=1,
+        ...     scored_count=2,
+        ...     results={"q2": True, "q3": False},
+        ...     category_accuracy={"language": 1.0, "calculation": 0.0},
         ...     message="Quiz submitted successfully"
         ... )
         >>> error_response = QuizSubmitResponse(
@@ -146,4 +157,119 @@ class QuizSubmitResponse(BaseModel):
         ... )
     """
     success: bool
+    score: float | None = None
+    correct_count: int | None = None
+    scored_count: int | None = None
+    results: dict[str, bool] | None = None
+    category_accuracy: dict[str, float] | None = None
+    message: str | None = None
+
+
+class QuizCategoryTrend(BaseModel):
+    """
+    Trend of a senior's accuracy in one question category.
+    
+    Attributes:
+        attempts: Number of submissions with scored questions in this category
+        ewma: Exponentially weighted moving average of the category accuracy
+        last_accuracy: Accuracy in the most recent submission
+        
+    Example:
+        >>> trend = QuizCategoryTrend(attempts=4, ewma=0.82, last_accuracy=1.0)
+    """
+    attempts: int
+    ewma: float
+    last_accuracy: float
+
+
+class QuizTrendResponse(BaseModel):
+    """
+    Response model for a senior's cognitive quiz trend.
+    
+    Built from the senior's incrementally maintained aggregate, without
+    reading the submission history.
+    
+    Attributes:
+        success: Whether the trend was successfully retrieved
+        attempts: Number of quiz submissions
+        accuracy: Lifetime accuracy over all scored questions
+        rolling_accuracy: Accuracy over the recent submissions
+        ewma_score: Exponentially weighted moving average of the score
+        recent_scores: Scores of the recent submissions, oldest first
+        categories: Trend per question category
+        decline_detected: Whether recent accuracy dropped notably below earlier accuracy
+        last_submitted_at: ISO timestamp of the latest submission
+        message: Optional message with additional context or error details
+        
+    Example:
+        >>> response = QuizTrendResponse(
+        ...     success=True,
+        ...     attempts=12,
+        ...     accuracy=0.78,
+        ...     rolling_accuracy=0.55,
+        ...     ewma_score=0.52,
+        ...     recent_scores=[0.8, 0.6, 0.5],
+        ...     categories={"memory": QuizCategoryTrend(attempts=12, ewma=0.5, last_accuracy=0.5)},
+        ...     decline_detected=True
+        ... )
+    """
+    success: bool
+    attempts: int = 0
+    accuracy: float | None = None
+    rolling_accuracy: float | None = None
+    ewma_score: float | None = None
+    recent_scores: list[float] = []
+    categories: dict[str, QuizCategoryTrend] = {}
+    decline_detected: bool = False
+    last_submitted_at: str | None = None
+    message: str | None = None
+
+
+class QuizQuestionAudio(BaseModel):
+    """
+    Audio clip URLs of one quiz question.
+    
+    Attributes:
+        question: URL of the clip reading the question
+        options: URL of the clip reading each option, by option ID
+        
+    Example:
+        >>> audio = QuizQuestionAudio(
+        ...     question="/quiz/audio/5d0c2f6e9a1b4c7d8e3f2a1b0c9d8e7f.mp3",
+        ...     options={"q1_opt1": "/quiz/audio/0a1b2c3d4e5f60718293a4b5c6d7e8f9.mp3"}
+        ... )
+    """
+    question: str
+    options: dict[str, str]
+
+
+class QuizAudioManifestResponse(BaseModel):
+    """
+    Response model for the pre-synthesized audio of a quiz.
+    
+    Clip URLs are content-addressed and never change, so clients can cache
+    the clips indefinitely.
+    
+    Attributes:
+        success: Whether the manifest was successfully retrieved
+        quiz_id: ID of the quiz
+        version: Version of the audio bundle the clips belong to
+        questions: Clip URLs per question ID
+        missing: IDs of questions without pre-synthesized audio
+        message: Optional message with additional context or error details
+        
+    Example:
+        >>> response = QuizAudioManifestResponse(
+        ...     success=True,
+        ...     quiz_id="quiz_001",
+        ...     version="9c1e4b2a7f3d5e60",
+        ...     questions={"q1": audio},
+        ...     missing=[]
+        ... )
+    """
+    success: bool
+    quiz_id: str
+    version: str | None = None
+    questions: dict[str, QuizQuestionAudio] = {}
+    missing: list[str] = []
     message: str | None = None
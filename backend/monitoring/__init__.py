@@ -0,0 +1,6 @@
+"""
+Monitoring package.
+
+This package contains observability utilities for the backend application
+(Prometheus metrics, request timing, and profiling helpers).
+"""
@@ -0,0 +1,264 @@
+"""
+Prometheus metrics for the FastAPI backend application.
+
+This module defines the collectors used to break down conversation latency
+by pipeline stage (STT, LLM, TTS, Firestore), count upstream API responses
+by status code, and record payload sizes. Metrics are exposed in the
+Prometheus text format through GET /metrics.
+
+When the server runs with several uvicorn workers, set the
+PROMETHEUS_MULTIPROC_DIR environment variable so each worker writes its
+samples to a shared directory and the exposition aggregates all workers.
+"""
+
+import logging
+import os
+import threading
+import time
+from collections.abc import Iterator
+from contextlib import contextmanager
+
+from prometheus_client import (
+    CONTENT_TYPE_LATEST,
+    CollectorRegistry,
+    Counter,
+    Histogram,
+    generate_latest,
+)
+from prometheus_client import multiprocess
+
+from config import settings
+from monitoring.timing import record_timing
+from monitoring.usage import record_stage_usage
+
+# Configure logger
+logger = logging.getLogger(__name__)
+
+# Registry holding all application metrics (kept separate from the default
+# registry so the exposition only contains what this module defines)
+REGISTRY = CollectorRegistry(auto_describe=True)
+
+# Latency buckets tuned for the conversation pipeline: Firestore writes take
+# tens of milliseconds, while STT/LLM/TTS calls take from 0.5s to tens of seconds
+_LATENCY_BUCKETS = (
+    0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5,
+    1.0, 2.0, 3.0, 5.0, 8.0, 13.0, 20.0, 30.0, 60.0,
+)
+
+# Payload buckets from 1 KiB to 16 MiB (audio uploads and base64 TTS payloads)
+_PAYLOAD_BUCKETS = tuple(1024 * 4 ** i for i in range(8))
+
+STAGE_LATENCY = Histogram(
+    "cooltiger_stage_duration_seconds",
+    "Duration of each processing stage of a conversation endpoint",
+    ["endpoint", "stage"],
+    buckets=_LATENCY_BUCKETS,
+    registry=REGISTRY,
+)
+
+UPSTREAM_RESPONSES = Counter(
+    "cooltiger_upstream_responses_total",
+    "Responses received from upstream APIs, by status code",
+    ["upstream", "status_code"],
+    registry=REGISTRY,
+)
+
+PAYLOAD_SIZE = Histogram(
+    "cooltiger_payload_size_bytes",
+    "Size of payloads exchanged with clients and upstream APIs",
+    ["target", "direction"],
+    buckets=_PAYLOAD_BUCKETS,
+    registry=REGISTRY,
+)
+
+UPSTREAM_QUEUE_WAIT = Histogram(
+    "cooltiger_upstream_queue_wait_seconds",
+    "Time upstream requests waited for a slot of the upstream scheduler, by priority class",
+    ["upstream", "priority"],
+    buckets=_LATENCY_BUCKETS,
+    registry=REGISTRY,
+)
+
+REJECTED_REQUESTS = Counter(
+    "cooltiger_rejected_requests_total",
+    "Requests rejected before being processed, by endpoint and reason",
+    ["endpoint", "reason"],
+    registry=REGISTRY,
+)
+
+SPECULATIVE_REPLIES = Counter(
+    "cooltiger_speculative_replies_total",
+    "Outcomes of speculative reply generation (hit, restart, miss)",
+    ["outcome"],
+    registry=REGISTRY,
+)
+
+SPECULATIVE_HEAD_START = Histogram(
+    "cooltiger_speculative_head_start_seconds",
+    "Time a used speculative reply started before the final transcript arrived",
+    buckets=_LATENCY_BUCKETS,
+    registry=REGISTRY,
+)
+
+CANCELLED_TURNS = Counter(
+    "cooltiger_cancelled_turns_total",
+    "Conversation turns cancelled before their reply was delivered, by reason",
+    ["reason"],
+    registry=REGISTRY,
+)
+
+CANCELLED_UPSTREAM_CALLS = Counter(
+    "cooltiger_cancelled_upstream_calls_total",
+    "Upstream calls of cancelled turns: aborted in flight, skipped (never made), or discarded (completed in a worker thread, result unused)",
+    ["upstream", "state"],
+    registry=REGISTRY,
+)
+
+
+@contextmanager
+def track_stage(endpoint: str, stage: str) -> Iterator[None]:
+    """
+    Measure the duration of a pipeline stage.
+
+    The duration is recorded in the stage latency histogram whether the
+    stage succeeds or raises, so slow failures remain visible, and is added
+    to the current request's Server-Timing header and turn usage.
+
+    Args:
+        endpoint: Name of the endpoint running the stage (e.g., "reply")
+        stage: Name of the stage (e.g., "transcribe_audio")
+
+    Example:
+        >>> with track_stage("reply", "transcribe_audio"):
+        ...     senior_text = transcribe_audio(audio_bytes, mime_type)
+    """
+    start = time.perf_counter()
+    try:
+        yield
+    finally:
+        duration = time.perf_counter() - start
+        STAGE_LATENCY.labels(endpoint, stage).observe(duration)
+        record_timing(stage, duration)
+        record_stage_usage(stage, duration)
+
+
+def record_upstream_response(upstream: str, status_code: int | str) -> None:
+    """
+    Count a response (or connection failure) from an upstream API.
+
+    Args:
+        upstream: Upstream name (e.g., "clova_speech", "clova_studio", "google_tts")
+        status_code: HTTP status code, or a short error label such as "error"
+    """
+    UPSTREAM_RESPONSES.labels(upstream, str(status_code)).inc()
+
+
+def record_payload_size(target: str, direction: str, size: int) -> None:
+    """
+    Record the size of a payload.
+
+    Args:
+        target: Peer of the exchange (e.g., "client", "clova_speech")
+        direction: "request" for data sent to the peer, "response" for data received
+        size: Payload size in bytes
+    """
+    PAYLOAD_SIZE.labels(target, direction).observe(size)
+
+
+def record_queue_wait(upstream: str, priority: str, seconds: float) -> None:
+    """
+    Record how long an upstream request waited for a scheduler slot.
+
+    Args:
+        upstream: Upstream name (e.g., "clova_studio")
+        priority: Priority class ("interactive" or "background")
+        seconds: Time from queuing to being granted a slot
+    """
+    UPSTREAM_QUEUE_WAIT.labels(upstream, priority).observe(seconds)
+
+
+def record_rejected_request(endpoint: str, reason: str) -> None:
+    """
+    Count a request rejected by admission control or rate limiting.
+
+    Args:
+        endpoint: Request path (e.g., "/conversation/start")
+        reason: Why it was rejected (e.g., "overloaded")
+    """
+    REJECTED_REQUESTS.labels(endpoint, reason).inc()
+
+
+def record_cancelled_turn(
+    reason: str,
+    aborted: list[str],
+    skipped: list[str],
+    discarded: list[str] | None = None,
+) -> None:
+    """
+    Count a cancelled turn and what became of its upstream calls.
+
+    Only aborted and skipped calls are upstream work saved; discarded ones
+    were still made and billed.
+
+    Args:
+        reason: Why the turn was cancelled (e.g., "new_turn", "disconnect")
+        aborted: Upstreams whose call was in flight and closed when the turn was cancelled
+        skipped: Upstreams the turn would still have called
+        discarded: Upstreams whose call was in flight in a worker thread, which
+                   could not be stopped; its result is thrown away
+    """
+    CANCELLED_TURNS.labels(reason).inc()
+    for upstream in aborted:
+        CANCELLED_UPSTREAM_CALLS.labels(upstream, "aborted").inc()
+    for upstream in skipped:
+        CANCELLED_UPSTREAM_CALLS.labels(upstream, "skipped").inc()
+    for upstream in discarded or ():
+        CANCELLED_UPSTREAM_CALLS.labels(upstream, "discarded").inc()
+
+
+def record_speculation(outcome: str, head_start: float | None = None) -> None:
+    """
+    Count the outcome of a speculative reply.
+
+    Args:
+        outcome: "hit" (speculative reply used), "restart" (regenerated because
+                 the final transcript diverged or the speculation failed) or
+                 "miss" (no speculation started before the final transcript)
+        head_start: Seconds the used speculative reply started before the final
+                    transcript (hits only)
+    """
+    SPECULATIVE_REPLIES.labels(outcome).inc()
+    if head_start is not None:
+        SPECULATIVE_HEAD_START.observe(head_start)
+
+
+# Cached exposition output, so frequent scrapes under load do not
+# re-render every histogram on each request
+_exposition_lock = threading.Lock()
+_exposition_cache: bytes = b""
+_exposition_rendered_at: float = 0.0
+
+
+def render_latest() -> tuple[bytes, str]:
+    """
+    Render all metrics in the Prometheus text exposition format.
+
+    The rendered output is cached for `settings.metrics_cache_seconds`
+    (set it to 0 to render on every scrape).
+
+    Returns:
+        tuple[bytes, str]: The exposition body and its content type
+    """
+    global _exposition_cache, _exposition_rendered_at
+
+    with _exposition_lock:
+        now = time.monotonic()
+        if not _exposition_cache or now - _exposition_rendered_at >= settings.metrics_cache_seconds:
+            if os.environ.get("PROMETHEUS_MULTIPROC_DIR"):
+                registry = CollectorRegistry()
+                multiprocess.MultiProcessCollector(registry)
+            else:
+                registry = REGISTRY
+            _exposition_cache = generate_latest(registry)
+            _exposition_rendered_at = now
+        return _exposition_cache, CONTENT_TYPE_LATEST
@@ -0,0 +1,155 @@
+"""
+On-demand sampling profiler for individual requests.
+
+An authenticated caller can ask for a single request to be profiled by sending
+`X-Profile: 1` (or `?profile=1`) together with `X-API-Key: <BACKEND_API_KEY>`.
+While the request runs, a background thread samples the Python stacks of all
+busy threads every few milliseconds; nothing is instrumented, so the overhead
+on the profiled request is small and other requests pay nothing.
+
+Profiles are written to `settings.profile_output_dir` in the folded stacks
+format (one `frame;frame;frame count` line per unique stack), which
+flamegraph.pl, speedscope and inferno read directly. The profile ID is
+returned to the caller in the `X-Profile-Id` response header.
+
+Note:
+    Samples cover the whole process, so concurrent requests running on the
+    event loop during the profiled request show up in the same profile.
+"""
+
+import logging
+import os
+import sys
+import threading
+import time
+import uuid
+from types import FrameType
+
+from starlette.requests import Request
+
+from config import settings
+from security import api_key_matches
+
+# Configure logger
+logger = logging.getLogger(__name__)
+
+# Only one request is profiled at a time per process
+_profile_lock = threading.Lock()
+
+# Leaf frames from these modules belong to parked worker threads
+_IDLE_MODULES = ("threading.py", "queue.py")
+
+
+class RequestProfile:
+    """
+    Sampling profile of a single request.
+
+    Attributes:
+        profile_id: Unique identifier, also used as the output file name
+        label: Human-readable request label (method and path)
+        interval: Sampling interval in seconds
+    """
+
+    def __init__(self, label: str, interval: float):
+        self.profile_id = f"{time.strftime('%Y%m%dT%H%M%S')}-{uuid.uuid4().hex[:8]}"
+        self.label = label
+        self.interval = interval
+        self._counts: dict[str, int] = {}
+        self._stop = threading.Event()
+        self._thread = threading.Thread(target=self._run, name="request-profiler", daemon=True)
+
+    def start(self) -> None:
+        """Start sampling in a background thread."""
+        self._thread.start()
+
+    def _run(self) -> None:
+        own_ident = threading.get_ident()
+        while not self._stop.wait(self.interval):
+            thread_names = {thread.ident: thread.name for thread in threading.enumerate()}
+            for ident, frame in sys._current_frames().items():
+                if ident == own_ident or frame.f_code.co_filename.endswith(_IDLE_MODULES):
+                    continue
+                stack = f"{thread_names.get(ident, ident)};{_fold_stack(frame)}"
+                self._counts[stack] = self._counts.get(stack, 0) + 1
+
+    def stop_and_save(self) -> str | None:
+        """
+        Stop sampling and write the folded stacks to the output directory.
+
+        Returns:
+            str | None: Path of the written profile, or None if writing failed
+        """
+        try:
+            self._stop.set()
+            self._thread.join()
+
+            os.makedirs(settings.profile_output_dir, exist_ok=True)
+            path = os.path.join(settings.profile_output_dir, f"{self.profile_id}.folded")
+            with open(path, "w", encoding="utf-8") as f:
+                for stack, count in sorted(self._counts.items()):
+                    f.write(f"{stack} {count}\n")
+
+            logger.info(
+                f"Saved profile for {self.label}: {path} "
+                f"({sum(self._counts.values())} samples)"
+            )
+            return path
+
+        except OSError as e:
+            logger.error(f"Failed to save profile {self.profile_id}: {e}")
+            return None
+
+        finally:
+            _profile_lock.release()
+
+
+def _fold_stack(frame: FrameType) -> str:
+    """Render a frame and its callers as a root-first, semicolon-separated stack."""
+    frames = []
+    current: FrameType | None = frame
+    while current is not None:
+        code = current.f_code
+        frames.append(f"{code.co_name} ({os.path.basename(code.co_filename)}:{code.co_firstlineno})")
+        current = current.f_back
+    return ";".join(reversed(frames))
+
+
+def _is_profile_requested(request: Request) -> bool:
+    flag = request.headers.get("x-profile") or request.query_params.get("profile")
+    return flag is not None and flag.lower() in ("1", "true")
+
+
+def _is_authorized(request: Request) -> bool:
+    # Profiling is disabled entirely unless a backend API key is configured
+    return api_key_matches(request.headers.get("x-api-key"))
+
+
+def start_request_profile(request: Request) -> RequestProfile | None:
+    """
+    Start profiling a request if the caller asked for it and is authorized.
+
+    Args:
+        request: The incoming request (only headers and query are inspected)
+
+    Returns:
+        RequestProfile | None: The running profile, or None if profiling was
+                               not requested, not authorized, or already in use
+    """
+    if not _is_profile_requested(request):
+        return None
+
+    if not _is_authorized(request):
+        logger.warning(f"Rejected unauthorized profiling request for {request.url.path}")
+        return None
+
+    if not _profile_lock.acquire(blocking=False):
+        logger.info(f"Skipping profile for {request.url.path}: another profile is running")
+        return None
+
+    profile = RequestProfile(
+        label=f"{request.method} {request.url.path}",
+        interval=settings.profile_sample_interval_ms / 1000,
+    )
+    profile.start()
+    logger.info(f"Started profile {profile.profile_id} for {profile.label}")
+    return profile
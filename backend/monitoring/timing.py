@@ -0,0 +1,110 @@
+"""
+Per-request stage timing and Server-Timing response headers.
+
+This module collects the duration of each pipeline stage measured during a
+request (see `monitoring.metrics.track_stage`) and reports them to the client
+in a `Server-Timing` header, e.g.:
+
+    Server-Timing: transcribe_audio;dur=812.4, generate_reply;dur=1530.2, total;dur=2790.8
+
+It also lets an authenticated caller opt in to sampling-profiling a single
+request (see `monitoring.profiler`).
+"""
+
+import asyncio
+import logging
+import time
+from contextvars import ContextVar
+
+from starlette.datastructures import MutableHeaders
+from starlette.requests import Request
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+from monitoring.profiler import start_request_profile
+
+# Configure logger
+logger = logging.getLogger(__name__)
+
+# Stage durations (in seconds) of the request being processed, keyed by stage
+# name. The dict is shared with child tasks and threadpool workers, which get a
+# copy of the context but still see the same object.
+_request_timings: ContextVar[dict[str, float] | None] = ContextVar("request_timings", default=None)
+
+
+def record_timing(stage: str, duration: float) -> None:
+    """
+    Add a stage duration to the current request's timings.
+
+    Repeated stages (e.g., two `append_turn` calls) are summed. Outside of a
+    timed request this is a no-op.
+
+    Args:
+        stage: Stage name (must be a valid Server-Timing metric name)
+        duration: Stage duration in seconds
+    """
+    timings = _request_timings.get()
+    if timings is not None:
+        timings[stage] = timings.get(stage, 0.0) + duration
+
+
+def format_server_timing(timings: dict[str, float], total: float) -> str:
+    """
+    Format stage durations as a Server-Timing header value.
+
+    Args:
+        timings: Stage durations in seconds, in recording order
+        total: Total request duration in seconds
+
+    Returns:
+        str: Header value with durations in milliseconds
+    """
+    entries = [f"{stage};dur={duration * 1000:.1f}" for stage, duration in timings.items()]
+    entries.append(f"total;dur={total * 1000:.1f}")
+    return ", ".join(entries)
+
+
+class ServerTimingMiddleware:
+    """
+    ASGI middleware adding a Server-Timing header to selected routes.
+
+    Implemented as a pure ASGI middleware (rather than BaseHTTPMiddleware) so
+    the stage timings context is shared with the route handler and the
+    response body is not buffered.
+
+    Attributes:
+        app: The wrapped ASGI application
+        path_prefixes: Only requests whose path starts with one of these get timed
+
+    Example:
+        >>> app.add_middleware(ServerTimingMiddleware, path_prefixes=("/conversation", "/quiz"))
+    """
+
+    def __init__(self, app: ASGIApp, path_prefixes: tuple[str, ...] = ("/conversation", "/quiz")):
+        self.app = app
+        self.path_prefixes = path_prefixes
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http" or not scope["path"].startswith(self.path_prefixes):
+            await self.app(scope, receive, send)
+            return
+
+        timings: dict[str, float] = {}
+        token = _request_timings.set(timings)
+        profile = start_request_profile(Request(scope))
+        start = time.perf_counter()
+
+        async def send_with_timing(message: Message) -> None:
+            if message["type"] == "http.response.start":
+                headers = MutableHeaders(scope=message)
+                headers.append("Server-Timing", format_server_timing(timings, time.perf_counter() - start))
+                if profile is not None:
+                    headers.append("X-Profile-Id", profile.profile_id)
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_with_timing)
+        finally:
+            _request_timings.reset(token)
+            if profile is not None:
+                # Writing the profile touches the filesystem, keep it off the event loop
+                await asyncio.to_thread(profile.stop_and_save)
@@ -0,0 +1,239 @@
+"""
+Per-call accounting of upstream usage and stage latency.
+
+Each unit of conversation work (the greeting of /start, one /reply or
+/stream turn, the analysis of /end) is tracked as a turn with
+`track_turn_usage`. While it runs, the service wrappers report what they
+consume from the upstreams:
+    - CLOVA Studio: prompt and completion tokens (from the response's usage),
+      and the prompt size in characters
+    - CLOVA Speech: seconds of recognized audio (end of the last segment)
+    - Google TTS: characters synthesized
+and `monitoring.metrics.track_stage` reports the duration of every stage.
+
+Turns are aggregated in memory per call and per senior (LRU caches sized by
+settings.usage_calls_cache_size and settings.usage_seniors_cache_size). When
+the call ends, /end takes the call's aggregate with `pop_call_usage` and
+stores it on the call document (the `usage` field), together with the
+per-turn breakdown, so costly calls and prompts can be found in Firestore.
+The aggregate only covers the turns handled by this instance.
+
+Example:
+    >>> with track_turn_usage(senior_id, call_id, "reply"):
+    ...     ai_text = await generate_reply_async(history, profile)
+"""
+
+import logging
+import threading
+from collections.abc import Iterator
+from contextlib import contextmanager
+from contextvars import ContextVar
+
+from cachetools import LRUCache
+
+from config import settings
+
+# Configure logger
+logger = logging.getLogger(__name__)
+
+
+class UsageTotals:
+    """
+    Upstream usage and stage latency, summed over one or more turns.
+
+    Attributes:
+        tokens_in: CLOVA Studio prompt tokens
+        tokens_out: CLOVA Studio completion tokens
+        prompt_chars: Characters of the prompts sent to CLOVA Studio
+        audio_seconds: Seconds of audio recognized by CLOVA Speech
+        tts_characters: Characters synthesized by Google TTS
+        stage_seconds: Duration of each pipeline stage, in seconds
+    """
+
+    __slots__ = ("tokens_in", "tokens_out", "prompt_chars", "audio_seconds", "tts_characters", "stage_seconds")
+
+    def __init__(self):
+        self.tokens_in = 0
+        self.tokens_out = 0
+        self.prompt_chars = 0
+        self.audio_seconds = 0.0
+        self.tts_characters = 0
+        self.stage_seconds: dict[str, float] = {}
+
+    def add(self, other: "UsageTotals") -> None:
+        self.tokens_in += other.tokens_in
+        self.tokens_out += other.tokens_out
+        self.prompt_chars += other.prompt_chars
+        self.audio_seconds += other.audio_seconds
+        self.tts_characters += other.tts_characters
+        for stage, seconds in other.stage_seconds.items():
+            self.stage_seconds[stage] = self.stage_seconds.get(stage, 0.0) + seconds
+
+    def to_dict(self) -> dict:
+        """Firestore representation (camelCase fields, stage durations in milliseconds)."""
+        return {
+            "tokensIn": self.tokens_in,
+            "tokensOut": self.tokens_out,
+            "promptChars": self.prompt_chars,
+            "audioSeconds": round(self.audio_seconds, 2),
+            "ttsCharacters": self.tts_characters,
+            "stageMs": {stage: round(seconds * 1000, 1) for stage, seconds in self.stage_seconds.items()},
+        }
+
+
+class TurnUsage(UsageTotals):
+    """Usage of one turn; `kind` is "greeting", "reply" or "analysis"."""
+
+    __slots__ = ("kind",)
+
+    def __init__(self, kind: str):
+        super().__init__()
+        self.kind = kind
+
+    def to_dict(self) -> dict:
+        return {"kind": self.kind, **super().to_dict()}
+
+
+class CallUsage:
+    """Aggregate usage of one call, with the breakdown of its first turns."""
+
+    __slots__ = ("senior_id", "totals", "turn_count", "turns")
+
+    def __init__(self, senior_id: str):
+        self.senior_id = senior_id
+        self.totals = UsageTotals()
+        self.turn_count = 0
+        self.turns: list[TurnUsage] = []
+
+    def to_dict(self) -> dict:
+        return {
+            **self.totals.to_dict(),
+            "turnCount": self.turn_count,
+            "turns": [turn.to_dict() for turn in self.turns],
+        }
+
+
+# Usage of the turn being processed; shared with child tasks and worker
+# threads, which get a copy of the context but still see the same object
+_current_turn: ContextVar[TurnUsage | None] = ContextVar("current_turn_usage", default=None)
+
+_lock = threading.Lock()
+_calls: LRUCache = LRUCache(maxsize=settings.usage_calls_cache_size)
+_seniors: LRUCache = LRUCache(maxsize=settings.usage_seniors_cache_size)
+
+
+@contextmanager
+def track_turn_usage(senior_id: str, call_id: str, kind: str) -> Iterator[TurnUsage]:
+    """
+    Account the upstream usage of the block as one turn of a call.
+
+    The turn is added to the call's and the senior's aggregates when the
+    block exits, also if it fails or is cancelled (the upstream work it did
+    is still billed).
+
+    Args:
+        senior_id: Unique identifier for the senior
+        call_id: The call session ID
+        kind: Kind of turn ("greeting", "reply" or "analysis")
+
+    Yields:
+        TurnUsage: The turn's usage, filled in as the block runs
+    """
+    usage = TurnUsage(kind)
+    token = _current_turn.set(usage)
+    try:
+        yield usage
+    finally:
+        _current_turn.reset(token)
+        _add_turn(senior_id, call_id, usage)
+
+
+def _add_turn(senior_id: str, call_id: str, usage: TurnUsage) -> None:
+    with _lock:
+        call = _calls.get(call_id)
+        if call is None:
+            call = _calls[call_id] = CallUsage(senior_id)
+        call.totals.add(usage)
+        call.turn_count += 1
+        if len(call.turns) < settings.usage_max_turns_per_call:
+            call.turns.append(usage)
+
+        senior = _seniors.get(senior_id)
+        if senior is None:
+            senior = _seniors[senior_id] = UsageTotals()
+        senior.add(usage)
+
+
+def record_llm_usage(tokens_in: int, tokens_out: int, prompt_chars: int) -> None:
+    """
+    Add a CLOVA Studio completion to the current turn (no-op outside of a turn).
+
+    Args:
+        tokens_in: Prompt tokens reported by CLOVA Studio
+        tokens_out: Completion tokens reported by CLOVA Studio
+        prompt_chars: Characters of the prompt messages
+    """
+    usage = _current_turn.get()
+    if usage is not None:
+        usage.tokens_in += tokens_in
+        usage.tokens_out += tokens_out
+        usage.prompt_chars += prompt_chars
+
+
+def record_audio_seconds(seconds: float) -> None:
+    """Add recognized audio to the current turn (no-op outside of a turn)."""
+    usage = _current_turn.get()
+    if usage is not None:
+        usage.audio_seconds += seconds
+
+
+def record_tts_characters(characters: int) -> None:
+    """Add synthesized characters to the current turn (no-op outside of a turn)."""
+    usage = _current_turn.get()
+    if usage is not None:
+        usage.tts_characters += characters
+
+
+def record_stage_usage(stage: str, duration: float) -> None:
+    """Add a stage duration, in seconds, to the current turn (no-op outside of a turn)."""
+    usage = _current_turn.get()
+    if usage is not None:
+        usage.stage_seconds[stage] = usage.stage_seconds.get(stage, 0.0) + duration
+
+
+def pop_call_usage(call_id: str) -> dict | None:
+    """
+    Remove a finished call's aggregate from memory and return it.
+
+    Args:
+        call_id: The call session ID
+
+    Returns:
+        dict | None: The aggregate in its Firestore representation, or None
+                     if this instance handled no turn of the call
+    """
+    with _lock:
+        call = _calls.pop(call_id, None)
+        if call is None:
+            return None
+        usage = call.to_dict()
+        senior = _seniors.get(call.senior_id)
+        senior_usage = senior.to_dict() if senior is not None else None
+    logger.info(
+        f"Usage of call {call_id}: {usage['tokensIn']}+{usage['tokensOut']} tokens, "
+        f"{usage['audioSeconds']}s audio, {usage['ttsCharacters']} TTS chars; "
+        f"senior {call.senior_id} total: {senior_usage}"
+    )
+    return usage
+
+
+def get_senior_usage(senior_id: str) -> dict | None:
+    """
+    Return the usage of a senior's calls handled by this instance.
+
+    Returns:
+        dict | None: Totals in their Firestore representation, or None if unknown
+    """
+    with _lock:
+        senior = _seniors.get(senior_id)
+        return senior.to_dict() if senior is not None else None
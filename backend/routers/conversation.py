@@ -6,9 +6,12 @@ with seniors, including starting calls, handling voice replies, and ending
 calls with analysis.
 """
 
+import asyncio
+import json
 import logging
 
-from fastapi import APIRouter, UploadFile, File, Form, HTTPException, status
+from fastapi import APIRouter, UploadFile, File, Form, HTTPException, Request, WebSocket, WebSocketDisconnect, status
+from starlette.websockets import WebSocketState
 
 from models.conversation import (
     ConversationStartRequest,
@@ -17,10 +20,17 @@ from models.conversation import (
     ConversationEndRequest,
     ConversationEndResponse,
 )
-from db.firestore_client import create_call_doc, append_turn, get_all_turns, finalize_call
-from services.clova_speech import transcribe_audio
-from services.clova_studio import generate_reply, analyze_conversation
+from db.async_firestore import create_call_doc, append_turn, get_all_turns, finalize_call
+from middleware.rate_limit import register_call, verify_call
+from services.call_turns import REPLY_STAGES, TurnCancelled, TurnToken, call_turn, cancel_turn
+from services.clova_speech import transcribe_audio_async
+from services.clova_studio import generate_reply_async, analyze_conversation_async, format_transcript
 from services.google_tts import synthesize_speech
+from services.speculative import SpeculativeReply
+from services.upstream_scheduler import background_priority
+from services.streaming_stt import get_streaming_recognizer
+from monitoring.metrics import track_stage, record_payload_size
+from monitoring.usage import pop_call_usage, track_turn_usage
 
 # Configure logger
 logger = logging.getLogger(__name__)
@@ -57,7 +67,9 @@ async def start_conversation(request: ConversationStartRequest):
         logger.info(f"Starting conversation for senior: {request.senior_id}")
         
         # Create call document in Firestore
-        call_id = create_call_doc(request.senior_id)
+        with track_stage("start", "create_call_doc"):
+            call_id = await create_call_doc(request.senior_id)
+        await register_call(call_id, request.senior_id)
         logger.info(f"Created call document: {call_id}")
         
         # TODO: Replace with actual senior profile from database
@@ -69,22 +81,27 @@ async def start_conversation(request: ConversationStartRequest):
         }
         
         # Generate initial AI greeting with empty conversation history
-        transcript_history = []
-        ai_text = generate_reply(transcript_history, senior_profile)
-        logger.info(f"Generated greeting: {ai_text[:50]}...")
-        
-        # Save AI greeting turn to Firestore
-        append_turn(request.senior_id, call_id, "ai", ai_text)
-        logger.info("Saved AI greeting turn to Firestore")
-        
-        # Synthesize speech audio (empty prompt for first greeting)
-        audio_bytes = synthesize_speech("안녕하세요. 오늘은 어떠신가요?")
-        logger.info(f"Synthesized speech audio: {len(audio_bytes)} bytes")
+        with track_turn_usage(request.senior_id, call_id, "greeting"):
+            transcript_history = []
+            with track_stage("start", "generate_reply"):
+                ai_text = await generate_reply_async(transcript_history, senior_profile)
+            logger.info(f"Generated greeting: {ai_text[:50]}...")
+            
+            # Save AI greeting turn to Firestore
+            with track_stage("start", "append_turn"):
+                await append_turn(request.senior_id, call_id, "ai", ai_text)
+            logger.info("Saved AI greeting turn to Firestore")
+            
+            # Synthesize speech audio (empty prompt for first greeting)
+            with track_stage("start", "synthesize_speech"):
+                audio_bytes = await asyncio.to_thread(synthesize_speech, "안녕하세요. 오늘은 어떠신가요?")
+            logger.info(f"Synthesized speech audio: {len(audio_bytes)} bytes")
         
         # Convert audio to base64 data URL for immediate playback
         import base64
         audio_base64 = base64.b64encode(audio_bytes).decode('utf-8')
         tts_url = f"data:audio/mp3;base64,{audio_base64}"
+        record_payload_size("client", "response", len(tts_url))
         # logger.info("Converted TTS audio to base64 data URL")
         logger.info("Greetings played")
 
@@ -106,6 +123,7 @@ async def start_conversation(request: ConversationStartRequest):
 
 @router.post("/reply", response_model=ConversationReplyResponse)
 async def reply_to_conversation(
+    request: Request,
     senior_id: str = Form(...),
     call_id: str = Form(...),
     audio: UploadFile = File(...),
@@ -117,7 +135,12 @@ async def reply_to_conversation(
     generates an AI response using conversation history, synthesizes
     the response to audio, and saves all turns to Firestore.
     
+    The reply runs as the call's active turn: it is cancelled when the
+    senior starts a newer turn of the call before it completes, or when the
+    client disconnects (services/call_turns.py).
+    
     Args:
+        request: The HTTP request (to detect client disconnects)
         senior_id: Unique identifier for the senior
         call_id: The call session ID
         audio: Audio file with the senior's voice input
@@ -126,51 +149,202 @@ async def reply_to_conversation(
         ConversationReplyResponse with ai_text and tts_url
         
     Raises:
-        HTTPException: If transcription, generation, or database operations fail
+        HTTPException: If transcription, generation, or database operations
+                       fail (409 if the turn was cancelled, 403 if the form
+                       names another senior or call than the X-Senior-Id and
+                       X-Call-Id headers the rate limits were applied to)
         
     Example:
         POST /conversation/reply
+        X-Senior-Id: senior_123
+        X-Call-Id: call_456
         Content-Type: multipart/form-data
         senior_id=senior_123&call_id=call_456&audio=<audio_file>
     """
+    verify_call(request, senior_id, call_id)
+    
     try:
         logger.info(f"Processing reply for call: {call_id}, senior: {senior_id}")
         
         # Read audio bytes from uploaded file
         audio_bytes = await audio.read()
+        record_payload_size("client", "request", len(audio_bytes))
         logger.info(f"Received audio file: {len(audio_bytes)} bytes, content_type: {audio.content_type}")
         
         # Determine MIME type
         mime_type = audio.content_type or "audio/wav"
         
-        # Transcribe audio to text using CLOVA Speech
-        senior_text = transcribe_audio(audio_bytes, mime_type)
-        logger.info(f"Transcribed senior speech: {senior_text[:100]}...")
-        
-        if not senior_text.strip():
-            logger.warning("Received empty transcript from CLOVA Speech")
-            raise HTTPException(
-                status_code=status.HTTP_400_BAD_REQUEST,
-                detail="Could not transcribe audio. Please try again."
-            )
-        
-        # Save senior's turn to Firestore
-        append_turn(senior_id, call_id, "senior", senior_text)
-        logger.info("Saved senior turn to Firestore")
-        
-        # Fetch recent conversation turns
-        all_turns = get_all_turns(senior_id, call_id)
-        logger.info(f"Retrieved {len(all_turns)} total turns from Firestore")
-        
-        # Limit context to recent turns to prevent context explosion
-        recent_turns = all_turns[-MAX_CONTEXT_TURNS:] if len(all_turns) > MAX_CONTEXT_TURNS else all_turns
+        # Run as the call's active turn (cancelled by a newer turn or a disconnect)
+        async with call_turn(call_id, REPLY_STAGES, request.receive) as turn:
+            with track_turn_usage(senior_id, call_id, "reply"):
+                # Transcribe audio to text using CLOVA Speech
+                with turn.stage("transcribe_audio"), track_stage("reply", "transcribe_audio"):
+                    senior_text = await transcribe_audio_async(audio_bytes, mime_type)
+                logger.info(f"Transcribed senior speech: {senior_text[:100]}...")
+                
+                if not senior_text.strip():
+                    logger.warning("Received empty transcript from CLOVA Speech")
+                    raise HTTPException(
+                        status_code=status.HTTP_400_BAD_REQUEST,
+                        detail="Could not transcribe audio. Please try again."
+                    )
+                
+                # Save senior's turn to Firestore
+                with track_stage("reply", "append_turn"):
+                    await append_turn(senior_id, call_id, "senior", senior_text)
+                logger.info("Saved senior turn to Firestore")
+                
+                # Fetch recent conversation turns
+                with track_stage("reply", "get_all_turns"):
+                    all_turns = await get_all_turns(senior_id, call_id)
+                logger.info(f"Retrieved {len(all_turns)} total turns from Firestore")
+                
+                # Limit context to recent turns to prevent context explosion
+                recent_turns = all_turns[-MAX_CONTEXT_TURNS:] if len(all_turns) > MAX_CONTEXT_TURNS else all_turns
+                
+                # Format turns for generate_reply function
+                transcript_history = [
+                    {"speaker": turn["speaker"], "text": turn["text"]}
+                    for turn in recent_turns
+                ]
+                
+                # TODO: Fetch actual senior profile from database
+                # For MVP, using dummy profile
+                senior_profile = {
+                    "name": "어르신",
+                    "age": 75,
+                    "preferences": "가족, 건강"
+                }
+                
+                # Generate AI response
+                with turn.stage("generate_reply"), track_stage("reply", "generate_reply"):
+                    ai_text = await generate_reply_async(transcript_history, senior_profile)
+                logger.info(f"Generated AI reply: {ai_text[:50]}...")
+                
+                # Save AI turn to Firestore
+                with track_stage("reply", "append_turn"):
+                    await append_turn(senior_id, call_id, "ai", ai_text)
+                logger.info("Saved AI reply turn to Firestore")
+                
+                # Synthesize AI response to speech audio
+                with turn.stage("synthesize_speech"), track_stage("reply", "synthesize_speech"):
+                    res_audio_bytes = await asyncio.to_thread(synthesize_speech, ai_text)
+                logger.info(f"Synthesized speech audio: {len(res_audio_bytes)} bytes")
+                
+                # Convert audio to base64 data URL for immediate playback
+                # This eliminates need for cloud storage and reduces latency
+                import base64
+                audio_base64 = base64.b64encode(res_audio_bytes).decode('utf-8')
+                tts_url = f"data:audio/mp3;base64,{audio_base64}"
+                record_payload_size("client", "response", len(tts_url))
+                # logger.info("Converted TTS audio to base64 data URL")
+                logger.info("Conversion reply played")
+                
+                return ConversationReplyResponse(
+                    success=True,
+                    ai_text=ai_text,
+                    senior_text=senior_text,  # Include transcript for UI
+                    tts_url=tts_url,
+                    message="Reply processed successfully"
+                )
+    
+    except HTTPException:
+        # Re-raise HTTP exceptions as-is
+        raise
+    
+    except TurnCancelled as e:
+        raise HTTPException(
+            status_code=status.HTTP_409_CONFLICT,
+            detail=f"Reply cancelled: {e.reason}"
+        )
+    
+    except Exception as e:
+        logger.error(f"Failed to process reply: {e}", exc_info=True)
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail=f"Failed to process reply: {str(e)}"
+        )
+
+
+@router.websocket("/stream")
+async def stream_conversation(
+    websocket: WebSocket,
+    senior_id: str,
+    call_id: str,
+    mime_type: str = "audio/wav",
+):
+    """
+    Process one voice reply streamed while the senior is speaking.
+    
+    Streaming counterpart of /reply. Audio is fed to the streaming recognizer
+    as it arrives; partial transcripts are sent back to the client, and the
+    AI reply is generated speculatively from a partial that looks like a
+    complete utterance (services/speculative.py), so it is often ready when
+    the final transcript arrives.
+    
+    Protocol:
+        client -> binary frames with audio chunks, then {"type": "end"}
+        server -> {"type": "partial", "text": ...} (zero or more),
+                  then {"type": "reply", "senior_text", "ai_text", "tts_url"}
+                  or {"type": "error", "detail"} and close code 1011,
+                  or {"type": "cancelled", "detail"} when a newer turn of
+                  the call supersedes this one (services/call_turns.py)
+    
+    Args:
+        websocket: The client connection
+        senior_id: Unique identifier for the senior
+        call_id: The call session ID
+        mime_type: MIME type of the audio chunks
         
-        # Format turns for generate_reply function
-        transcript_history = [
+    Example:
+        WS /conversation/stream?senior_id=senior_123&call_id=call_456&mime_type=audio/wav
+    """
+    await websocket.accept()
+    logger.info(f"Streaming reply for call: {call_id}, senior: {senior_id}")
+    
+    audio_queue: asyncio.Queue[bytes | None] = asyncio.Queue()
+    received_bytes = 0
+    
+    # Queue audio until the end message, then keep listening for a disconnect
+    async def receive_audio(turn: TurnToken) -> None:
+        nonlocal received_bytes
+        ended = False
+        try:
+            while True:
+                message = await websocket.receive()
+                if message["type"] == "websocket.disconnect":
+                    turn.cancel("disconnect")
+                    return
+                if ended:
+                    continue
+                if message.get("bytes"):
+                    received_bytes += len(message["bytes"])
+                    await audio_queue.put(message["bytes"])
+                elif message.get("text") and json.loads(message["text"]).get("type") == "end":
+                    ended = True
+                    await audio_queue.put(None)
+        finally:
+            if not ended:
+                await audio_queue.put(None)
+    
+    async def audio_chunks():
+        while (chunk := await audio_queue.get()) is not None:
+            yield chunk
+    
+    # Fetch the conversation history while the senior is still speaking
+    async def load_history() -> list[dict]:
+        with track_stage("stream", "get_all_turns"):
+            all_turns = await get_all_turns(senior_id, call_id)
+        return [
             {"speaker": turn["speaker"], "text": turn["text"]}
-            for turn in recent_turns
+            for turn in all_turns[-(MAX_CONTEXT_TURNS - 1):]
         ]
-        
+    
+    receiver: asyncio.Task | None = None
+    history_task = asyncio.create_task(load_history())
+    speculation: SpeculativeReply | None = None
+    
+    try:
         # TODO: Fetch actual senior profile from database
         # For MVP, using dummy profile
         senior_profile = {
@@ -179,48 +353,87 @@ async def reply_to_conversation(
             "preferences": "가족, 건강"
         }
         
-        # Generate AI response
-        ai_text = generate_reply(transcript_history, senior_profile)
-        logger.info(f"Generated AI reply: {ai_text[:50]}...")
-        
-        # Save AI turn to Firestore
-        append_turn(senior_id, call_id, "ai", ai_text)
-        logger.info("Saved AI reply turn to Firestore")
-        
-        # Synthesize AI response to speech audio
-        res_audio_bytes = synthesize_speech(ai_text)
-        logger.info(f"Synthesized speech audio: {len(res_audio_bytes)} bytes")
-        
-        # Convert audio to base64 data URL for immediate playback
-        # This eliminates need for cloud storage and reduces latency
-        import base64
-        audio_base64 = base64.b64encode(res_audio_bytes).decode('utf-8')
-        tts_url = f"data:audio/mp3;base64,{audio_base64}"
-        # logger.info("Converted TTS audio to base64 data URL")
-        logger.info("Conversion reply played")
-
-        return ConversationReplyResponse(
-            success=True,
-            ai_text=ai_text,
-            senior_text=senior_text,  # Include transcript for UI
-            tts_url=tts_url,
-            message="Reply processed successfully"
-        )
+        # Run as the call's active turn (cancelled by a newer turn or a disconnect)
+        async with call_turn(call_id) as turn:
+            with track_turn_usage(senior_id, call_id, "reply"):
+                receiver = asyncio.create_task(receive_audio(turn))
+                
+                # Transcribe as the audio arrives, speculating on partial transcripts
+                senior_text = ""
+                with turn.stage("transcribe_audio"), track_stage("stream", "transcribe_audio"):
+                    async for update in get_streaming_recognizer().recognize(audio_chunks(), mime_type):
+                        senior_text = update.text
+                        if update.is_final:
+                            break
+                        await websocket.send_json({"type": "partial", "text": update.text})
+                        if speculation is None and history_task.done():
+                            speculation = SpeculativeReply(history_task.result(), senior_profile)
+                        if speculation is not None:
+                            speculation.on_partial(update.text, update.end_of_utterance)
+                record_payload_size("client", "request", received_bytes)
+                logger.info(f"Transcribed senior speech: {senior_text[:100]}...")
+                
+                if not senior_text.strip():
+                    logger.warning("Received empty transcript from the streaming recognizer")
+                    await websocket.send_json({"type": "error", "detail": "Could not transcribe audio. Please try again."})
+                    await websocket.close(code=1011)
+                    return
+                
+                if speculation is None:
+                    speculation = SpeculativeReply(await history_task, senior_profile)
+                
+                # Save senior's turn while the reply is generated
+                with turn.stage("generate_reply"), track_stage("stream", "generate_reply"):
+                    _, ai_text = await asyncio.gather(
+                        append_turn(senior_id, call_id, "senior", senior_text),
+                        speculation.finish(senior_text),
+                    )
+                logger.info(f"Generated AI reply: {ai_text[:50]}...")
+                
+                # Save AI turn to Firestore
+                with track_stage("stream", "append_turn"):
+                    await append_turn(senior_id, call_id, "ai", ai_text)
+                
+                # Synthesize AI response to speech audio
+                with turn.stage("synthesize_speech"), track_stage("stream", "synthesize_speech"):
+                    res_audio_bytes = await asyncio.to_thread(synthesize_speech, ai_text)
+                
+                import base64
+                tts_url = f"data:audio/mp3;base64,{base64.b64encode(res_audio_bytes).decode('utf-8')}"
+                record_payload_size("client", "response", len(tts_url))
+                
+                await websocket.send_json({
+                    "type": "reply",
+                    "senior_text": senior_text,
+                    "ai_text": ai_text,
+                    "tts_url": tts_url,
+                })
+        await websocket.close()
     
-    except HTTPException:
-        # Re-raise HTTP exceptions as-is
-        raise
+    except TurnCancelled as e:
+        if e.reason != "disconnect" and websocket.client_state == WebSocketState.CONNECTED:
+            await websocket.send_json({"type": "cancelled", "detail": f"Reply cancelled: {e.reason}"})
+            await websocket.close()
+    
+    except WebSocketDisconnect:
+        logger.info(f"Client disconnected from stream of call: {call_id}")
     
     except Exception as e:
-        logger.error(f"Failed to process reply: {e}", exc_info=True)
-        raise HTTPException(
-            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
-            detail=f"Failed to process reply: {str(e)}"
-        )
+        logger.error(f"Failed to process streamed reply: {e}", exc_info=True)
+        if websocket.client_state == WebSocketState.CONNECTED:
+            await websocket.send_json({"type": "error", "detail": f"Failed to process reply: {str(e)}"})
+            await websocket.close(code=1011)
+    
+    finally:
+        if speculation is not None:
+            speculation.cancel()
+        if receiver is not None:
+            receiver.cancel()
+        history_task.cancel()
 
 
 @router.post("/end", response_model=ConversationEndResponse)
-async def end_conversation(request: ConversationEndRequest):
+async def end_conversation(request: ConversationEndRequest, http_request: Request):
     """
     End a conversation session and analyze the call.
     
@@ -230,6 +443,8 @@ async def end_conversation(request: ConversationEndRequest):
     
     Args:
         request: Contains senior_id and call_id
+        http_request: The HTTP request (with the call the rate limits were
+                      applied to)
         
     Returns:
         ConversationEndResponse with analysis results (summary, mood, risk_level)
@@ -241,11 +456,18 @@ async def end_conversation(request: ConversationEndRequest):
         POST /conversation/end
         {"senior_id": "senior_123", "call_id": "call_456"}
     """
+    verify_call(http_request, request.senior_id, request.call_id)
+    
     try:
         logger.info(f"Ending conversation for call: {request.call_id}, senior: {request.senior_id}")
         
+        # A reply still in progress will not be played anymore
+        if cancel_turn(request.call_id, "call_ended"):
+            logger.info("Cancelled the reply in progress")
+        
         # Fetch all turns for the call
-        all_turns = get_all_turns(request.senior_id, request.call_id)
+        with track_stage("end", "get_all_turns"):
+            all_turns = await get_all_turns(request.senior_id, request.call_id)
         logger.info(f"Retrieved {len(all_turns)} turns for analysis")
         
         if not all_turns:
@@ -256,10 +478,7 @@ async def end_conversation(request: ConversationEndRequest):
             )
         
         # Build full transcript string
-        full_transcript = "\n".join([
-            f"{'AI' if turn['speaker'] == 'ai' else '어르신'}: {turn['text']}"
-            for turn in all_turns
-        ])
+        full_transcript = format_transcript(all_turns)
         logger.info(f"Built full transcript: {len(full_transcript)} characters")
         
         # TODO: Fetch actual senior profile from database
@@ -270,8 +489,12 @@ async def end_conversation(request: ConversationEndRequest):
             "preferences": "가족, 건강"
         }
         
-        # Analyze conversation using CLOVA Studio
-        analysis = analyze_conversation(full_transcript, senior_profile)
+        # Analyze conversation using CLOVA Studio (background priority: yields
+        # the shared quota to conversation turns in progress; the wait for a
+        # slot holds no worker thread)
+        with track_turn_usage(request.senior_id, request.call_id, "analysis"), track_stage("end", "analyze_conversation"):
+            with background_priority():
+                analysis = await analyze_conversation_async(full_transcript, senior_profile)
         logger.info(f"Analysis complete: mood={analysis.get('mood')}, risk={analysis.get('risk_level')}")
         
         # Extract analysis fields with fallbacks
@@ -279,14 +502,16 @@ async def end_conversation(request: ConversationEndRequest):
         mood = analysis.get("mood", "neutral")
         risk_level = analysis.get("risk_level", "low")
         
-        # Finalize call document in Firestore
-        finalize_call(
-            request.senior_id,
-            request.call_id,
-            summary,
-            mood,
-            risk_level
-        )
+        # Finalize call document in Firestore, with the call's usage aggregate
+        with track_stage("end", "finalize_call"):
+            await finalize_call(
+                request.senior_id,
+                request.call_id,
+                summary,
+                mood,
+                risk_level,
+                usage=pop_call_usage(request.call_id),
+            )
         logger.info("Finalized call document in Firestore")
         
         return ConversationEndResponse(
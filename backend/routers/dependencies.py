@@ -0,0 +1,40 @@
+"""
+Shared route dependencies.
+
+Endpoints that expose call history, transcripts or data across seniors
+(call and turn listings, exports, the risk feed) are for operators and
+caregiver tooling, not for the senior app: they require the backend API key
+(settings.backend_api_key) in the X-API-Key header.
+"""
+
+import logging
+
+from fastapi import Header, HTTPException, status
+
+from config import settings
+from security import api_key_matches
+
+# Configure logger
+logger = logging.getLogger(__name__)
+
+
+def require_api_key(x_api_key: str | None = Header(None, description="Backend API key")) -> None:
+    """
+    Reject requests without the backend API key.
+
+    Used as a route dependency. With no backend API key configured, the
+    protected endpoints are disabled.
+
+    Raises:
+        HTTPException: 401 if the key is missing or wrong
+
+    Example:
+        >>> @router.get("/export", dependencies=[Depends(require_api_key)])
+    """
+    if not api_key_matches(x_api_key):
+        if not settings.backend_api_key:
+            logger.warning("Rejected a request to a protected endpoint: BACKEND_API_KEY is not configured")
+        raise HTTPException(
+            status_code=status.HTTP_401_UNAUTHORIZED,
+            detail="Invalid or missing API key",
+        )
@@ -1,11 +1,15 @@
 """
 Health check router for monitoring service availability.
 
-This module provides a simple endpoint to verify that the API is running
-and responsive.
+This module provides a liveness endpoint to verify that the API is running
+and responsive, and a readiness endpoint that reports whether Firestore and
+the upstream connections have been warmed up.
 """
 
 from fastapi import APIRouter
+from fastapi.responses import JSONResponse
+
+from services.warmup import get_status
 
 # Create health check router
 router = APIRouter(prefix="/health", tags=["health"])
@@ -22,9 +26,38 @@ async def health_check():
     
     Returns:
         dict: Status response with "ok" indicator
-        
+    
     Example:
         GET /health/
         Response: {"status": "ok"}
     """
     return {"status": "ok"}
+
+
+@router.get("/ready")
+async def readiness_check():
+    """
+    Readiness endpoint.
+    
+    Answers 503 until the startup warm-up has initialized the clients and
+    opened connections to Firestore and every configured upstream, then 200.
+    Use it as the startup/readiness probe so traffic only reaches warm
+    instances, and /health/ as the liveness probe.
+    
+    Returns:
+        JSONResponse: Readiness status with the warm-up state of each component
+    
+    Example:
+        GET /health/ready
+        Response (503 while warming up): {"status": "warming_up", "ready_at": null, "components": {...}}
+        Response (200 once warm): {"status": "ready", "ready_at": "2025-11-20T09:00:02+00:00", "components": {...}}
+    """
+    status = get_status()
+    return JSONResponse(
+        status_code=200 if status["ready"] else 503,
+        content={
+            "status": "ready" if status["ready"] else "warming_up",
+            "ready_at": status["ready_at"],
+            "components": status["components"],
+        },
+    )
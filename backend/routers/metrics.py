@@ -0,0 +1,32 @@
+"""
+Metrics router for Prometheus scraping.
+
+This module exposes the application metrics (per-stage latency histograms,
+upstream response counters, payload sizes) in the Prometheus text format.
+"""
+
+from fastapi import APIRouter, Response
+
+from monitoring.metrics import render_latest
+
+# Create metrics router
+router = APIRouter(tags=["metrics"])
+
+
+@router.get("/metrics", include_in_schema=False)
+def get_metrics():
+    """
+    Prometheus exposition endpoint.
+
+    Declared as a sync handler so rendering runs in the threadpool and never
+    blocks the event loop; the rendered output is also briefly cached.
+
+    Returns:
+        Response: Metrics in the Prometheus text exposition format
+
+    Example:
+        GET /metrics
+        Response: # HELP cooltiger_stage_duration_seconds ...
+    """
+    body, content_type = render_latest()
+    return Response(content=body, media_type=content_type)
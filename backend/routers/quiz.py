@@ -6,19 +6,29 @@ quiz answers for senior cognitive assessments.
 """
 
 import logging
+from datetime import datetime, timezone
 
-from fastapi import APIRouter, HTTPException, Query, status
-from google.cloud.firestore_v1 import SERVER_TIMESTAMP
+from fastapi import APIRouter, Header, HTTPException, Query, Response, status
+from fastapi.responses import FileResponse
 
 from models.quiz import (
     QuizListResponse,
     QuizSubmitRequest,
     QuizSubmitResponse,
-    QuizSession,
-    QuizQuestion,
-    QuizQuestionOption,
+    QuizTrendResponse,
+    QuizCategoryTrend,
+    QuizAudioManifestResponse,
+    QuizQuestionAudio,
 )
-from db.firestore_client import db
+from config import settings
+from db.async_firestore import record_quiz_submission, get_quiz_stats
+from services.quiz_catalog import get_catalog, etag_matches, QuizCatalogError
+from services.quiz_trends import update_aggregate, detect_decline
+from services.quiz_scoring import QuizScore
+from services.question_bank import get_question_bank, parse_adaptive_quiz_id, verify_adaptive_quiz_id
+from services.quiz_selection import get_selector
+from services.quiz_audio import get_audio_manifest, clip_path
+from monitoring.metrics import track_stage
 
 # Configure logger
 logger = logging.getLogger(__name__)
@@ -30,9 +40,12 @@ router = APIRouter(prefix="/quiz", tags=["quiz"])
 @router.get("/list", response_model=QuizListResponse)
 async def get_quiz_list(senior_id: str = Query(..., description="Senior user ID")):
     """
-    Retrieve a quiz session for a senior.
+    Retrieve a personalized quiz session for a senior.
     
-    Returns a quiz with questions and multiple choice options.
+    Assembles one question per category from the question bank, skipping
+    questions the senior has already seen and matching each category's
+    difficulty to the senior's recent accuracy there. The quiz ID returned
+    identifies the selected questions and must be sent back on submit.
     
     Args:
         senior_id: Unique identifier for the senior user
@@ -47,66 +60,20 @@ async def get_quiz_list(senior_id: str = Query(..., description="Senior user ID"
         GET /quiz/list?senior_id=senior_123
         
     TODO: Future enhancements:
-        - Fetch personalized quizzes based on senior_id from Firestore
-        - Implement difficulty levels and adaptive quizzes
-        - Track quiz history to avoid repeating recent questions
         - Generate dynamic quizzes using AI based on senior's profile
-        - Support multiple quiz categories (memory, language, math, etc.)
     """
     try:
         logger.info(f"Fetching quiz for senior: {senior_id}")
         
-        # TODO: For MVP, returning hardcoded quiz
-        # In production, you would:
-        # 1. Query Firestore for available quizzes
-        # 2. Select appropriate quiz based on senior's history and level
-        # 3. Filter out recently completed quizzes
-        # 4. Personalize based on senior's cognitive assessment history
-        
-        # Create hardcoded quiz session for MVP
-        quiz = QuizSession(
-            id="quiz_001",
-            title="기억력 평가",
-            questions=[
-                QuizQuestion(
-                    id="q1",
-                    question="오늘은 무슨 요일인가요?",
-                    options=[
-                        QuizQuestionOption(id="q1_opt1", text="월요일"),
-                        QuizQuestionOption(id="q1_opt2", text="화요일"),
-                        QuizQuestionOption(id="q1_opt3", text="수요일"),
-                        QuizQuestionOption(id="q1_opt4", text="목요일"),
-                    ]
-                ),
-                QuizQuestion(
-                    id="q2",
-                    question="다음 중 계절이 아닌 것은?",
-                    options=[
-                        QuizQuestionOption(id="q2_opt1", text="봄"),
-                        QuizQuestionOption(id="q2_opt2", text="여름"),
-                        QuizQuestionOption(id="q2_opt3", text="가을"),
-                        QuizQuestionOption(id="q2_opt4", text="구름"),
-                    ]
-                ),
-                QuizQuestion(
-                    id="q3",
-                    question="100에서 7을 빼면?",
-                    options=[
-                        QuizQuestionOption(id="q3_opt1", text="93"),
-                        QuizQuestionOption(id="q3_opt2", text="92"),
-                        QuizQuestionOption(id="q3_opt3", text="94"),
-                        QuizQuestionOption(id="q3_opt4", text="91"),
-                    ]
-                ),
-            ]
-        )
+        with track_stage("quiz_list", "select_questions"):
+            assembled = await get_selector().assemble(senior_id)
         
-        logger.info(f"Returning quiz: {quiz.id} with {len(quiz.questions)} questions")
+        logger.info(f"Returning quiz: {assembled.quiz_id} with {len(assembled.question_ids)} questions")
         
-        return QuizListResponse(
-            success=True,
-            quiz=quiz,
-            message="Quiz retrieved successfully"
+        return Response(
+            content=assembled.body,
+            media_type="application/json",
+            headers={"Cache-Control": "no-store"},
         )
     
     except Exception as e:
@@ -117,22 +84,216 @@ async def get_quiz_list(senior_id: str = Query(..., description="Senior user ID"
         )
 
 
+@router.get("/catalog/{quiz_id}", response_model=QuizListResponse)
+async def get_catalog_quiz(quiz_id: str, if_none_match: str | None = Header(None)):
+    """
+    Retrieve a fixed quiz from the quiz catalog.
+    
+    Served from the pre-serialized quiz catalog. The response carries an
+    ETag; when the client sends it back in If-None-Match and the quiz is
+    unchanged, an empty 304 response is returned instead.
+    
+    Args:
+        quiz_id: Unique identifier of the catalog quiz
+        if_none_match: ETag of the quiz version the client already has
+        
+    Returns:
+        QuizListResponse containing the QuizSession (or 304 Not Modified)
+        
+    Raises:
+        HTTPException: 404 if the quiz does not exist, 500 if retrieval fails
+        
+    Example:
+        GET /quiz/catalog/quiz_001
+        If-None-Match: "3f1c...e9"
+    """
+    try:
+        with track_stage("quiz_catalog", "lookup_catalog"):
+            entry = get_catalog().get(quiz_id)
+        
+        headers = {
+            "ETag": entry.etag,
+            "Cache-Control": f"private, max-age={settings.quiz_cache_max_age}",
+        }
+        
+        if etag_matches(if_none_match, entry.etag):
+            logger.info(f"Quiz {entry.quiz.id} not modified")
+            return Response(status_code=status.HTTP_304_NOT_MODIFIED, headers=headers)
+        
+        logger.info(f"Returning catalog quiz: {entry.quiz.id} with {len(entry.quiz.questions)} questions")
+        
+        return Response(content=entry.body, media_type="application/json", headers=headers)
+    
+    except QuizCatalogError:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail=f"Quiz not found: {quiz_id}"
+        )
+    
+    except Exception as e:
+        logger.error(f"Failed to retrieve catalog quiz: {e}", exc_info=True)
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail=f"Failed to retrieve quiz: {str(e)}"
+        )
+
+
+def _quiz_question_ids(quiz_id: str) -> list[str]:
+    """
+    List the question IDs of an assembled or catalog quiz.
+    
+    Raises:
+        QuizCatalogError: If the quiz (or one of its questions) does not exist
+    """
+    question_ids = parse_adaptive_quiz_id(quiz_id)
+    if question_ids is None:
+        return [question.id for question in get_catalog().get(quiz_id).quiz.questions]
+    
+    bank = get_question_bank()
+    unknown = [question_id for question_id in question_ids if bank.get(question_id) is None]
+    if unknown:
+        raise QuizCatalogError(f"Unknown question in quiz {quiz_id}: {unknown[0]}")
+    return question_ids
+
+
+@router.get("/audio/manifest", response_model=QuizAudioManifestResponse)
+async def get_quiz_audio_manifest(quiz_id: str = Query(..., description="Quiz ID (from /quiz/list or the catalog)")):
+    """
+    Retrieve the pre-synthesized audio clips of a quiz.
+    
+    Looks the quiz's questions up in the audio bundle manifest (built
+    offline with `python -m services.quiz_audio`), so reading a quiz aloud
+    never calls TTS at request time. Questions missing from the bundle (e.g.
+    generated after the last build) are listed in `missing`; clients fall
+    back to on-screen text for them.
+    
+    Args:
+        quiz_id: ID of the quiz to read aloud
+        
+    Returns:
+        QuizAudioManifestResponse with clip URLs per question and option
+        
+    Raises:
+        HTTPException: 404 if the quiz does not exist, 500 if retrieval fails
+        
+    Example:
+        GET /quiz/audio/manifest?quiz_id=quiz_001
+    """
+    try:
+        with track_stage("quiz_audio_manifest", "lookup_manifest"):
+            question_ids = _quiz_question_ids(quiz_id)
+            manifest = get_audio_manifest()
+            clips, missing = manifest.for_questions(question_ids)
+        
+        if missing:
+            logger.warning(f"Quiz {quiz_id}: no audio for {len(missing)} of {len(question_ids)} questions")
+        
+        return QuizAudioManifestResponse(
+            success=True,
+            quiz_id=quiz_id,
+            version=manifest.version or None,
+            questions={
+                question_id: QuizQuestionAudio(
+                    question=f"/quiz/audio/{entry['question']}.mp3",
+                    options={
+                        option_id: f"/quiz/audio/{clip}.mp3"
+                        for option_id, clip in entry["options"].items()
+                    },
+                )
+                for question_id, entry in clips.items()
+            },
+            missing=missing,
+            message="Quiz audio retrieved successfully"
+        )
+    
+    except QuizCatalogError:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail=f"Quiz not found: {quiz_id}"
+        )
+    
+    except Exception as e:
+        logger.error(f"Failed to retrieve quiz audio manifest: {e}", exc_info=True)
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail=f"Failed to retrieve quiz audio: {str(e)}"
+        )
+
+
+@router.get("/audio/{clip_id}.mp3")
+async def get_quiz_audio_clip(clip_id: str):
+    """
+    Serve a pre-synthesized quiz audio clip.
+    
+    Clip IDs are content hashes, so a clip never changes and is served with
+    an immutable, year-long Cache-Control.
+    
+    Args:
+        clip_id: Clip ID from the quiz audio manifest
+        
+    Returns:
+        The MP3 clip
+        
+    Raises:
+        HTTPException: 404 if the clip does not exist
+        
+    Example:
+        GET /quiz/audio/5d0c2f6e9a1b4c7d8e3f2a1b0c9d8e7f.mp3
+    """
+    path = clip_path(clip_id)
+    if path is None:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail=f"Audio clip not found: {clip_id}"
+        )
+    
+    return FileResponse(
+        path,
+        media_type="audio/mpeg",
+        headers={"Cache-Control": "public, max-age=31536000, immutable"},
+    )
+
+
+def _score_answers(quiz_id: str, answers: dict[str, str]) -> QuizScore:
+    """
+    Score answers against the key of an assembled or catalog quiz.
+    
+    Raises:
+        QuizCatalogError: If the quiz (or one of its questions) does not exist
+    """
+    question_ids = parse_adaptive_quiz_id(quiz_id)
+    if question_ids is None:
+        return get_catalog().get(quiz_id).answer_key.score(answers)
+    
+    answer_key = get_question_bank().answer_key
+    try:
+        mask = answer_key.mask_for(question_ids)
+    except KeyError as e:
+        raise QuizCatalogError(f"Unknown question in quiz {quiz_id}: {e}")
+    return answer_key.score(answers, mask)
+
+
 @router.post("/submit", response_model=QuizSubmitResponse)
 async def submit_quiz(request: QuizSubmitRequest):
     """
     Submit quiz answers for evaluation.
     
-    Stores the senior's quiz answers in Firestore for later analysis
-    and cognitive assessment tracking.
+    Scores the answers against the quiz's answer key and appends them, with
+    the score, to the senior's submissions in Firestore. The senior's trend
+    aggregate (see GET /quiz/trend) is updated in the same transaction.
     
     Args:
-        request: Contains senior_id, quiz_id, and answers dictionary
+        request: Contains senior_id, quiz_id (as returned by /quiz/list or a
+                 catalog quiz ID), and answers dictionary
         
     Returns:
-        QuizSubmitResponse indicating successful submission
+        QuizSubmitResponse with the score, per-question results and
+        per-category accuracy
         
     Raises:
-        HTTPException: If submission fails
+        HTTPException: 404 if the quiz does not exist, 403 if an assembled
+                      quiz was not issued to the senior (or has expired),
+                      400 if no answers were provided, 500 if submission fails
         
     Example:
         POST /quiz/submit
@@ -147,11 +308,8 @@ async def submit_quiz(request: QuizSubmitRequest):
         }
         
     TODO: Future enhancements:
-        - Validate answers against correct answers stored in Firestore
-        - Calculate score and cognitive metrics
         - Provide immediate feedback on performance
-        - Track performance trends over time
-        - Trigger alerts if significant cognitive decline detected
+        - Notify caregivers if significant cognitive decline detected
         - Generate personalized recommendations based on results
         - Integrate with caregiver dashboard for monitoring
     """
@@ -169,38 +327,74 @@ async def submit_quiz(request: QuizSubmitRequest):
                 detail="No answers provided"
             )
         
+        # Assembled quizzes are only scored if they were issued to this senior
+        if parse_adaptive_quiz_id(request.quiz_id) is not None and not verify_adaptive_quiz_id(
+            request.quiz_id, request.senior_id
+        ):
+            logger.warning(f"Quiz submission with an invalid or expired quiz ID: senior={request.senior_id}")
+            raise HTTPException(
+                status_code=status.HTTP_403_FORBIDDEN,
+                detail="Quiz was not issued to this senior or has expired"
+            )
+        
+        try:
+            with track_stage("quiz_submit", "score_answers"):
+                result = _score_answers(request.quiz_id, request.answers)
+        except QuizCatalogError:
+            logger.warning(f"Quiz submission for unknown quiz: {request.quiz_id}")
+            raise HTTPException(
+                status_code=status.HTTP_404_NOT_FOUND,
+                detail=f"Quiz not found: {request.quiz_id}"
+            )
+        
+        from google.cloud.firestore_v1 import SERVER_TIMESTAMP
+        
         # Prepare quiz submission document
         quiz_submission = {
             "quizId": request.quiz_id,
             "answers": request.answers,
+            "score": result.score,
+            "correctCount": result.correct_count,
+            "scoredCount": result.scored_count,
+            "categoryAccuracy": result.category_accuracy,
             "submittedAt": SERVER_TIMESTAMP,
         }
         
-        # Store submission in Firestore under seniors/{senior_id}/quizzes/{quiz_id}
-        quiz_ref = (
-            db.collection('seniors')
-            .document(request.senior_id)
-            .collection('quizzes')
-            .document(request.quiz_id)
-        )
-        
-        quiz_ref.set(quiz_submission)
+        # Append the submission under seniors/{senior_id}/quizzes and fold it
+        # into the senior's trend aggregate in one transaction
+        submitted_at = datetime.now(timezone.utc)
+        with track_stage("quiz_submit", "store_submission"):
+            submission_id, stats = await record_quiz_submission(
+                request.senior_id,
+                quiz_submission,
+                lambda current: update_aggregate(current, request.quiz_id, result, submitted_at),
+            )
         
         logger.info(
             f"Successfully stored quiz submission: "
-            f"seniors/{request.senior_id}/quizzes/{request.quiz_id}"
+            f"seniors/{request.senior_id}/quizzes/{submission_id} "
+            f"(score={result.score}, attempts={stats['attempts']})"
         )
         
+        get_selector().record_stats(request.senior_id, stats)
+        
+        if detect_decline(stats):
+            logger.warning(
+                f"Quiz accuracy decline for senior {request.senior_id}: "
+                f"rolling={stats['rollingAccuracy']}, lifetime={stats['accuracy']}, attempts={stats['attempts']}"
+            )
+        
         # TODO: In production, you would:
-        # 1. Validate answers against correct answers from quiz definition
-        # 2. Calculate score and accuracy metrics
-        # 3. Compare with previous quiz results to track trends
-        # 4. Update senior's cognitive profile
-        # 5. Trigger notifications if concerning patterns detected
-        # 6. Return score and feedback in the response
+        # 1. Update senior's cognitive profile
+        # 2. Notify caregivers when a decline is detected
         
         return QuizSubmitResponse(
             success=True,
+            score=result.score,
+            correct_count=result.correct_count,
+            scored_count=result.scored_count,
+            results=result.results,
+            category_accuracy=result.category_accuracy,
             message="Quiz submitted successfully"
         )
     
@@ -214,3 +408,64 @@ async def submit_quiz(request: QuizSubmitRequest):
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
             detail=f"Failed to submit quiz: {str(e)}"
         )
+
+
+@router.get("/trend", response_model=QuizTrendResponse)
+async def get_quiz_trend(senior_id: str = Query(..., description="Senior user ID")):
+    """
+    Retrieve a senior's cognitive quiz trend.
+    
+    Reads the senior's trend aggregate, which is updated on every quiz
+    submission, so this costs a single document read regardless of how many
+    quizzes the senior has taken.
+    
+    Args:
+        senior_id: Unique identifier for the senior user
+        
+    Returns:
+        QuizTrendResponse with accuracy, moving averages, recent scores,
+        per-category trends and the decline flag
+        
+    Raises:
+        HTTPException: If trend retrieval fails
+        
+    Example:
+        GET /quiz/trend?senior_id=senior_123
+    """
+    try:
+        logger.info(f"Fetching quiz trend for senior: {senior_id}")
+        
+        with track_stage("quiz_trend", "read_stats"):
+            stats = await get_quiz_stats(senior_id)
+        
+        if stats is None:
+            return QuizTrendResponse(success=True, message="No quiz submissions yet")
+        
+        last_submitted_at = stats.get("lastSubmittedAt")
+        
+        return QuizTrendResponse(
+            success=True,
+            attempts=stats["attempts"],
+            accuracy=stats["accuracy"],
+            rolling_accuracy=stats["rollingAccuracy"],
+            ewma_score=stats["ewmaScore"],
+            recent_scores=[entry["score"] for entry in stats.get("recent", [])],
+            categories={
+                category: QuizCategoryTrend(
+                    attempts=trend["attempts"],
+                    ewma=trend["ewma"],
+                    last_accuracy=trend["lastAccuracy"],
+                )
+                for category, trend in stats.get("categories", {}).items()
+            },
+            decline_detected=detect_decline(stats),
+            last_submitted_at=last_submitted_at.isoformat() if last_submitted_at else None,
+            message="Quiz trend retrieved successfully"
+        )
+    
+    except Exception as e:
+        logger.error(f"Failed to retrieve quiz trend: {e}", exc_info=True)
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail=f"Failed to retrieve quiz trend: {str(e)}"
+        )
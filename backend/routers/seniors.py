@@ -0,0 +1,321 @@
+"""
+Seniors router for caregiver dashboards.
+
+This module provides read endpoints over a senior's call history: a
+paginated list of past calls (summary fields only) and the paginated
+conversation turns of a call, plus a feed of recent risky calls across all
+seniors for care centers and streaming transcript exports for audits.
+
+Call summaries and transcripts are health-sensitive, so every endpoint
+requires the backend API key (X-API-Key, see routers/dependencies.py).
+"""
+
+import logging
+from datetime import datetime
+from typing import Literal
+
+from fastapi import APIRouter, Depends, HTTPException, Query, status
+from fastapi.responses import StreamingResponse
+
+from models.history import (
+    CallListResponse,
+    CallSummary,
+    CallTurn,
+    CallTurnsResponse,
+    RiskFeedCall,
+    RiskFeedResponse,
+)
+from config import settings
+from db.cursors import InvalidCursorError, decode_cursor, encode_cursor
+from db.firestore_client import get_calls_page, get_turns_page
+from routers.dependencies import require_api_key
+from services.risk_feed import get_risk_feed
+from services.transcript_export import MEDIA_TYPES, as_utc, export_transcripts
+from monitoring.metrics import track_stage
+
+# Configure logger
+logger = logging.getLogger(__name__)
+
+# Create seniors router
+router = APIRouter(prefix="/seniors", tags=["seniors"])
+
+
+def _decode_cursor(cursor: str | None):
+    """Decode a request cursor, rejecting malformed ones with 400."""
+    if cursor is None:
+        return None
+    try:
+        return decode_cursor(cursor)
+    except InvalidCursorError as e:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(e))
+
+
+# Firestore reads block: these are plain functions, which FastAPI runs in
+# its threadpool instead of on the event loop
+
+
+@router.get("/risk-feed", response_model=RiskFeedResponse, dependencies=[Depends(require_api_key)])
+def get_risk_alert_feed(
+    risk_level: list[Literal["low", "medium", "high"]] = Query(["high"], description="Risk levels to include"),
+    hours: int = Query(24, ge=1, le=24 * 30, description="Time window, in hours"),
+    limit: int = Query(settings.history_page_size, ge=1, le=settings.history_max_page_size),
+    cursor: str | None = Query(None, description="next_cursor of the previous page"),
+):
+    """
+    List recent calls at the given risk levels across all seniors.
+    
+    Served by a single indexed collection group query over every senior's
+    calls, newest first, and cached in memory for a short time (see
+    settings.risk_feed_cache_seconds), so polling dashboards do not add
+    Firestore load.
+    
+    Args:
+        risk_level: Risk levels to include (repeatable, default high)
+        hours: Only include calls that ended in the last `hours`
+        limit: Maximum number of calls per page
+        cursor: Cursor of the page to fetch (None for the first page)
+    
+    Returns:
+        RiskFeedResponse with the calls of the page and the next cursor
+    
+    Raises:
+        HTTPException: 400 if the cursor is malformed, 500 if retrieval fails
+    
+    Example:
+        GET /seniors/risk-feed?risk_level=high&hours=24
+        GET /seniors/risk-feed?risk_level=high&risk_level=medium&hours=72&limit=50
+    """
+    start_after = _decode_cursor(cursor)
+    try:
+        with track_stage("risk_feed", "query_calls"):
+            page = get_risk_feed(risk_level, hours, limit, start_after)
+    
+        return RiskFeedResponse(
+            success=True,
+            calls=[
+                RiskFeedCall(
+                    senior_id=call["seniorId"],
+                    call_id=call["id"],
+                    started_at=call["startedAt"],
+                    ended_at=call["endedAt"],
+                    summary=call["summary"],
+                    mood=call["mood"],
+                    risk_level=call["riskLevel"],
+                )
+                for call in page.calls
+            ],
+            since=page.since.isoformat(),
+            next_cursor=encode_cursor(*page.next_after) if page.next_after else None,
+            message="Risk feed retrieved successfully"
+        )
+    
+    except Exception as e:
+        logger.error(f"Failed to retrieve risk feed: {e}", exc_info=True)
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail=f"Failed to retrieve risk feed: {str(e)}"
+        )
+
+
+@router.get("/{senior_id}/calls", response_model=CallListResponse, dependencies=[Depends(require_api_key)])
+def list_calls(
+    senior_id: str,
+    limit: int = Query(settings.history_page_size, ge=1, le=settings.history_max_page_size),
+    cursor: str | None = Query(None, description="next_cursor of the previous page"),
+):
+    """
+    List a senior's past calls, newest first.
+    
+    Returns the summary fields of each call (summary, mood, risk level and
+    timestamps) without transcripts, one page at a time. Pass the returned
+    next_cursor to fetch the following page.
+    
+    Args:
+        senior_id: Unique identifier for the senior user
+        limit: Maximum number of calls per page
+        cursor: Cursor of the page to fetch (None for the first page)
+    
+    Returns:
+        CallListResponse with the calls of the page and the next cursor
+    
+    Raises:
+        HTTPException: 400 if the cursor is malformed, 500 if retrieval fails
+    
+    Example:
+        GET /seniors/senior_123/calls?limit=20
+        GET /seniors/senior_123/calls?limit=20&cursor=WyIyMDI1LTExLTIwVDA5...
+    """
+    start_after = _decode_cursor(cursor)
+    try:
+        with track_stage("senior_calls", "query_calls"):
+            calls, next_after = get_calls_page(senior_id, limit, start_after)
+    
+        logger.info(f"Returning {len(calls)} calls for senior {senior_id}")
+    
+        return CallListResponse(
+            success=True,
+            calls=[
+                CallSummary(
+                    call_id=call["id"],
+                    started_at=call["startedAt"],
+                    ended_at=call["endedAt"],
+                    summary=call["summary"],
+                    mood=call["mood"],
+                    risk_level=call["riskLevel"],
+                )
+                for call in calls
+            ],
+            next_cursor=encode_cursor(*next_after) if next_after else None,
+            message="Calls retrieved successfully"
+        )
+    
+    except Exception as e:
+        logger.error(f"Failed to retrieve calls: {e}", exc_info=True)
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail=f"Failed to retrieve calls: {str(e)}"
+        )
+
+
+@router.get(
+    "/{senior_id}/calls/{call_id}/turns",
+    response_model=CallTurnsResponse,
+    dependencies=[Depends(require_api_key)],
+)
+def list_call_turns(
+    senior_id: str,
+    call_id: str,
+    limit: int = Query(settings.history_page_size, ge=1, le=settings.history_max_page_size),
+    cursor: str | None = Query(None, description="next_cursor of the previous page"),
+):
+    """
+    List the conversation turns of a call, in chronological order.
+    
+    Args:
+        senior_id: Unique identifier for the senior user
+        call_id: Unique identifier of the call
+        limit: Maximum number of turns per page
+        cursor: Cursor of the page to fetch (None for the first page)
+    
+    Returns:
+        CallTurnsResponse with the turns of the page and the next cursor
+    
+    Raises:
+        HTTPException: 400 if the cursor is malformed, 500 if retrieval fails
+    
+    Example:
+        GET /seniors/senior_123/calls/call_456/turns?limit=50
+    """
+    start_after = _decode_cursor(cursor)
+    try:
+        with track_stage("senior_call_turns", "query_turns"):
+            turns, next_after = get_turns_page(senior_id, call_id, limit, start_after)
+    
+        return CallTurnsResponse(
+            success=True,
+            call_id=call_id,
+            turns=[
+                CallTurn(
+                    turn_id=turn["id"],
+                    speaker=turn["speaker"],
+                    text=turn["text"],
+                    timestamp=turn["timestamp"],
+                )
+                for turn in turns
+            ],
+            next_cursor=encode_cursor(*next_after) if next_after else None,
+            message="Turns retrieved successfully"
+        )
+    
+    except Exception as e:
+        logger.error(f"Failed to retrieve turns: {e}", exc_info=True)
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail=f"Failed to retrieve turns: {str(e)}"
+        )
+
+
+def _export_response(
+    senior_id: str | None,
+    export_format: str,
+    start: datetime | None,
+    end: datetime | None,
+) -> StreamingResponse:
+    """Stream an export as a chunked download."""
+    start, end = as_utc(start), as_utc(end)
+    if start is not None and end is not None and start >= end:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="start must be before end"
+        )
+    
+    filename = f"calls_{senior_id or 'all'}.{export_format}"
+    logger.info(f"Exporting {filename} (start={start}, end={end})")
+    
+    # The body is produced while it is sent: Firestore pages are read as the
+    # client consumes the response (in the threadpool, as the generator blocks)
+    return StreamingResponse(
+        export_transcripts(senior_id, export_format, start, end),
+        media_type=MEDIA_TYPES[export_format],
+        headers={"Content-Disposition": f'attachment; filename="{filename}"'},
+    )
+
+
+@router.get("/export", dependencies=[Depends(require_api_key)])
+def export_all_calls(
+    export_format: Literal["ndjson", "csv"] = Query("ndjson", alias="format"),
+    start: datetime | None = Query(None, description="Export calls started at or after (ISO 8601)"),
+    end: datetime | None = Query(None, description="Export calls started before (ISO 8601)"),
+):
+    """
+    Export the calls of all seniors, with their turns, as NDJSON or CSV.
+    
+    The export is streamed: calls and turns are read from Firestore page by
+    page while the response is sent, so memory use does not depend on the
+    size of the export.
+    
+    Args:
+        export_format: "ndjson" (call and turn records) or "csv" (one row per turn)
+        start: Only export calls started at or after this time
+        end: Only export calls started before this time
+    
+    Returns:
+        Chunked download of the export
+    
+    Raises:
+        HTTPException: 400 if the time range is empty
+    
+    Example:
+        GET /seniors/export?format=csv&start=2025-11-01T00:00:00Z&end=2025-12-01T00:00:00Z
+    """
+    return _export_response(None, export_format, start, end)
+
+
+@router.get("/{senior_id}/export", dependencies=[Depends(require_api_key)])
+def export_senior_calls(
+    senior_id: str,
+    export_format: Literal["ndjson", "csv"] = Query("ndjson", alias="format"),
+    start: datetime | None = Query(None, description="Export calls started at or after (ISO 8601)"),
+    end: datetime | None = Query(None, description="Export calls started before (ISO 8601)"),
+):
+    """
+    Export a senior's calls, with their turns, as NDJSON or CSV.
+    
+    Streamed like GET /seniors/export.
+    
+    Args:
+        senior_id: Unique identifier for the senior user
+        export_format: "ndjson" (call and turn records) or "csv" (one row per turn)
+        start: Only export calls started at or after this time
+        end: Only export calls started before this time
+    
+    Returns:
+        Chunked download of the export
+    
+    Raises:
+        HTTPException: 400 if the time range is empty
+    
+    Example:
+        GET /seniors/senior_123/export?format=ndjson
+    """
+    return _export_response(senior_id, export_format, start, end)
@@ -0,0 +1,69 @@
+"""
+Shared security helpers.
+
+Constant-time checks of client-provided secrets, used by the routers (API
+key dependencies) and by monitoring (profiling requests) alike, and HMAC
+signatures of the IDs the backend issues to clients (e.g., adaptive quiz
+IDs), so it can tell them apart from IDs a client made up.
+
+Signatures use settings.signing_key (or the backend API key). Without
+either, a random per-process key is used, which only works with a single
+worker.
+"""
+
+import base64
+import hashlib
+import hmac
+import logging
+import secrets
+
+from config import settings
+
+# Configure logger
+logger = logging.getLogger(__name__)
+
+# Bytes of the HMAC-SHA256 digest kept in signatures
+_SIGNATURE_BYTES = 16
+
+_process_key: bytes | None = None
+
+
+def api_key_matches(provided: str | None) -> bool:
+    """
+    Check a client-provided key against the backend API key (constant-time).
+
+    Always False when no backend API key is configured.
+    """
+    if not settings.backend_api_key or not provided:
+        return False
+    return hmac.compare_digest(provided.encode(), settings.backend_api_key.encode())
+
+
+def _signing_key() -> bytes:
+    global _process_key
+    key = settings.signing_key or settings.backend_api_key
+    if key:
+        return key.encode()
+    if _process_key is None:
+        logger.warning("No SIGNING_KEY or BACKEND_API_KEY configured: signing with a per-process key")
+        _process_key = secrets.token_bytes(32)
+    return _process_key
+
+
+def sign(message: str) -> str:
+    """
+    Sign a message issued to clients.
+
+    Args:
+        message: The message (e.g., an ID and who it was issued to)
+
+    Returns:
+        str: URL-safe signature (base64, without padding)
+    """
+    digest = hmac.new(_signing_key(), message.encode(), hashlib.sha256).digest()[:_SIGNATURE_BYTES]
+    return base64.urlsafe_b64encode(digest).rstrip(b"=").decode("ascii")
+
+
+def signature_matches(message: str, signature: str) -> bool:
+    """Check a signature returned by a client against the message (constant-time)."""
+    return hmac.compare_digest(sign(message).encode(), signature.encode())
@@ -0,0 +1,204 @@
+"""
+Cancellation of superseded conversation turns.
+
+Every /reply and /stream request of a call runs as a turn with a TurnToken.
+A call has at most one active turn: when the senior speaks again before the
+AI reply arrives, the new turn cancels the previous one, and a turn is also
+cancelled when its client disconnects or the call ends. Cancelling the
+request's task aborts the upstream call in flight (async HTTP requests to
+CLOVA Speech and CLOVA Studio are closed) and skips the stages that have not
+started, so no quota is spent on a reply that will never be played. A TTS
+synthesis runs in a worker thread that cannot be stopped: if the turn is
+cancelled during it, the synthesis still completes (and is billed) and its
+result is discarded. Semaphores and other limiter
+slots held with `async with` are released as the cancellation unwinds.
+
+Cancelled turns, and the upstream calls they aborted, skipped or discarded, are counted
+in the cooltiger_cancelled_turns_total and
+cooltiger_cancelled_upstream_calls_total metrics.
+
+Example:
+    >>> async with call_turn(call_id, REPLY_STAGES, request.receive) as turn:
+    ...     with turn.stage("generate_reply"):
+    ...         ai_text = await generate_reply_async(history, profile)
+"""
+
+import asyncio
+import logging
+import time
+from collections.abc import AsyncIterator, Awaitable, Callable, Iterator
+from contextlib import asynccontextmanager, contextmanager
+
+from monitoring.metrics import record_cancelled_turn
+
+# Configure logger
+logger = logging.getLogger(__name__)
+
+# Upstream called by each stage of a turn
+STAGE_UPSTREAMS = {
+    "transcribe_audio": "clova_speech",
+    "generate_reply": "clova_studio",
+    "synthesize_speech": "google_tts",
+}
+
+# Stages that run in a worker thread: cancelling the turn does not stop their
+# upstream call, whose result is discarded
+THREADED_STAGES = frozenset({"synthesize_speech"})
+
+# Stages of a /reply or /stream turn, in order
+REPLY_STAGES = ("transcribe_audio", "generate_reply", "synthesize_speech")
+
+
+class TurnCancelled(Exception):
+    """Raised in a turn that was cancelled by a newer turn, a disconnect or the end of the call."""
+
+    def __init__(self, reason: str):
+        super().__init__(f"Turn cancelled ({reason})")
+        self.reason = reason
+
+
+class TurnToken:
+    """
+    Cancellation token of one turn of a call.
+
+    Attributes:
+        call_id: The call the turn belongs to
+        stages: Stages the turn runs, in order (see STAGE_UPSTREAMS)
+        current: Stage in progress, if any
+        completed: Stages that have finished
+        reason: Why the turn was cancelled (None while it is not)
+    """
+
+    __slots__ = ("call_id", "stages", "current", "completed", "reason", "started_at", "_task", "_done")
+
+    def __init__(self, call_id: str, stages: tuple[str, ...], task: asyncio.Task):
+        self.call_id = call_id
+        self.stages = stages
+        self.current: str | None = None
+        self.completed: set[str] = set()
+        self.reason: str | None = None
+        self.started_at = time.monotonic()
+        self._task = task
+        self._done = False
+
+    @property
+    def cancelled(self) -> bool:
+        return self.reason is not None
+
+    def cancel(self, reason: str) -> None:
+        """
+        Cancel the turn, unless it has already finished or been cancelled.
+
+        Args:
+            reason: Why the turn is cancelled ("new_turn", "disconnect", "call_ended")
+        """
+        if self._done or self.reason is not None:
+            return
+        self.reason = reason
+        self._task.cancel()
+
+    @contextmanager
+    def stage(self, name: str) -> Iterator[None]:
+        """Mark a stage of the turn as in progress for the duration of the block."""
+        # Left as current if the block raises, so a cancellation knows what it aborted
+        self.current = name
+        yield
+        self.current = None
+        self.completed.add(name)
+
+
+# Active turn of each call
+_active: dict[str, TurnToken] = {}
+
+
+def cancel_turn(call_id: str, reason: str) -> bool:
+    """
+    Cancel the active turn of a call, if any.
+
+    Args:
+        call_id: The call session ID
+        reason: Why the turn is cancelled
+
+    Returns:
+        bool: True if a turn was cancelled
+    """
+    token = _active.pop(call_id, None)
+    if token is None or token._done:
+        return False
+    token.cancel(reason)
+    return True
+
+
+async def _cancel_on_disconnect(receive: Callable[[], Awaitable[dict]], token: TurnToken) -> None:
+    # The request body has been read: the next message is the disconnect
+    while True:
+        message = await receive()
+        if message["type"] == "http.disconnect":
+            token.cancel("disconnect")
+            return
+
+
+@asynccontextmanager
+async def call_turn(
+    call_id: str,
+    stages: tuple[str, ...] = REPLY_STAGES,
+    receive: Callable[[], Awaitable[dict]] | None = None,
+) -> AsyncIterator[TurnToken]:
+    """
+    Run the block as the active turn of a call.
+
+    Cancels the call's previous turn. The block runs in the current task,
+    which is cancelled if the turn is superseded, its client disconnects, or
+    the call ends; the cancellation surfaces as TurnCancelled.
+
+    Args:
+        call_id: The call session ID
+        stages: Stages the turn runs, in order, for the cancelled-work metrics
+        receive: ASGI receive callable of an HTTP request whose body has been
+                 read; the turn is cancelled when the client disconnects
+
+    Yields:
+        TurnToken: The turn's token (mark stages with token.stage(name))
+
+    Raises:
+        TurnCancelled: If the turn was cancelled
+    """
+    task = asyncio.current_task()
+    token = TurnToken(call_id, stages, task)
+    if cancel_turn(call_id, "new_turn"):
+        logger.info(f"Cancelled the previous turn of call: {call_id}")
+    _active[call_id] = token
+
+    watcher = asyncio.create_task(_cancel_on_disconnect(receive, token)) if receive is not None else None
+    try:
+        yield token
+    except asyncio.CancelledError:
+        if token.reason is None:
+            raise
+        task.uncancel()
+        _record(token)
+        raise TurnCancelled(token.reason) from None
+    finally:
+        token._done = True
+        if _active.get(call_id) is token:
+            del _active[call_id]
+        if watcher is not None:
+            watcher.cancel()
+
+
+def _record(token: TurnToken) -> None:
+    aborted, discarded = [], []
+    if token.current in STAGE_UPSTREAMS:
+        in_flight = discarded if token.current in THREADED_STAGES else aborted
+        in_flight.append(STAGE_UPSTREAMS[token.current])
+    skipped = [
+        STAGE_UPSTREAMS[stage]
+        for stage in token.stages
+        if stage in STAGE_UPSTREAMS and stage != token.current and stage not in token.completed
+    ]
+    record_cancelled_turn(token.reason, aborted, skipped, discarded)
+    logger.info(
+        f"Turn of call {token.call_id} cancelled ({token.reason}) after "
+        f"{time.monotonic() - token.started_at:.2f}s; aborted: {aborted or 'none'}, "
+        f"skipped: {skipped or 'none'}, discarded: {discarded or 'none'}"
+    )
@@ -3,14 +3,20 @@ Naver CLOVA Speech-to-Text service wrapper.
 
 This module provides functions to transcribe audio using Naver's CLOVA Speech API.
 It handles API authentication, request formatting, and response parsing.
+transcribe_audio_async is the variant for request handlers, on the shared
+async HTTP client.
 """
 
+import json
 import logging
 from typing import Any
 
 import httpx
 
 from config import settings
+from monitoring.metrics import record_upstream_response, record_payload_size
+from monitoring.usage import record_audio_seconds
+from services.http_clients import get_async_http_client, get_http_client
 
 # Configure logger
 logger = logging.getLogger(__name__)
@@ -46,6 +52,51 @@ def transcribe_audio(audio_bytes: bytes, mime_type: str = "audio/wav") -> str:
         >>> transcript = transcribe_audio(audio_data, mime_type="audio/wav")
         >>> print(f"Recognized: {transcript}")
     """
+    url, headers, files = _build_request(audio_bytes, mime_type)
+    
+    try:
+        # Send POST request to CLOVA Speech endpoint
+        logger.debug(f"Sending request to {url}")
+        response = get_http_client("clova_speech").post(url, headers=headers, files=files)
+        return _handle_response(response, len(audio_bytes))
+    
+    except httpx.HTTPError as e:
+        logger.error(f"HTTP error during CLOVA Speech request: {e}")
+        record_upstream_response("clova_speech", "error")
+        raise ClovaSpeechError(f"Failed to connect to CLOVA Speech API: {e}")
+    
+    except Exception as e:
+        logger.error(f"Unexpected error during transcription: {e}")
+        raise ClovaSpeechError(f"Transcription failed: {e}")
+
+
+async def transcribe_audio_async(audio_bytes: bytes, mime_type: str = "audio/wav") -> str:
+    """
+    Async counterpart of transcribe_audio for request handlers.
+    
+    Runs on the shared async client, so cancelling the awaiting task (e.g.,
+    a superseded turn) closes the request instead of leaving it running in
+    a worker thread.
+    """
+    url, headers, files = _build_request(audio_bytes, mime_type)
+    
+    try:
+        logger.debug(f"Sending request to {url}")
+        response = await get_async_http_client("clova_speech").post(url, headers=headers, files=files)
+        return _handle_response(response, len(audio_bytes))
+    
+    except httpx.HTTPError as e:
+        logger.error(f"HTTP error during CLOVA Speech request: {e}")
+        record_upstream_response("clova_speech", "error")
+        raise ClovaSpeechError(f"Failed to connect to CLOVA Speech API: {e}")
+    
+    except Exception as e:
+        logger.error(f"Unexpected error during transcription: {e}")
+        raise ClovaSpeechError(f"Transcription failed: {e}")
+
+
+def _build_request(audio_bytes: bytes, mime_type: str) -> tuple[str, dict[str, str], dict[str, tuple]]:
+    """Validate the configuration and build the upload URL, headers and multipart files."""
     # Validate required configuration
     if not settings.clova_speech_endpoint:
         logger.error("CLOVA Speech endpoint is not configured")
@@ -69,62 +120,63 @@ def transcribe_audio(audio_bytes: bytes, mime_type: str = "audio/wav") -> str:
         "completion": "sync"
     }
     
-    import json
     files = {
         "media": ("audio.wav", audio_bytes, mime_type),
         "params": (None, json.dumps(params), "application/json")
     }
+    return settings.clova_speech_endpoint + "/recognizer/upload", headers, files
 
-    try:
-        # Send POST request to CLOVA Speech endpoint
-        logger.debug(f"Sending request to {settings.clova_speech_endpoint}")
-        
-        with httpx.Client(timeout=30.0) as client:
-            response = client.post(
-                settings.clova_speech_endpoint + "/recognizer/upload",
-                headers=headers,
-                files=files,
-            )
-        
-        # Log response status
-        logger.info(f"CLOVA Speech API response status: {response.status_code}")
-        
-        # Handle HTTP errors
-        if response.status_code != 200:
-            error_message = f"CLOVA Speech API error: {response.status_code}"
-            try:
-                error_data = response.json()
-                error_message += f" - {error_data}"
-                logger.error(f"API error response: {error_data}")
-            except Exception:
-                error_message += f" - {response.text}"
-                logger.error(f"API error response (raw): {response.text}")
-            
-            raise ClovaSpeechError(error_message)
-        
-        # Parse JSON response
-        response_data: dict[str, Any] = response.json()
-        logger.debug(f"Received response data: {response_data}")
-        
-        # Extract transcript from response
-        # Note: Adjust the key path based on actual CLOVA Speech API response format
-        # Common patterns: response["text"], response["result"]["text"], response["transcript"]
-        transcript = _extract_transcript(response_data)
-        
-        if not transcript:
-            logger.warning("Received empty transcript from CLOVA Speech")
-            return ""
+
+def _handle_response(response: httpx.Response, request_size: int) -> str:
+    """Record the response metrics and extract the transcript, or raise ClovaSpeechError."""
+    # Log response status
+    logger.info(f"CLOVA Speech API response status: {response.status_code}")
+    record_upstream_response("clova_speech", response.status_code)
+    record_payload_size("clova_speech", "request", request_size)
+    record_payload_size("clova_speech", "response", len(response.content))
+    
+    # Handle HTTP errors
+    if response.status_code != 200:
+        error_message = f"CLOVA Speech API error: {response.status_code}"
+        try:
+            error_data = response.json()
+            error_message += f" - {error_data}"
+            logger.error(f"API error response: {error_data}")
+        except Exception:
+            error_message += f" - {response.text}"
+            logger.error(f"API error response (raw): {response.text}")
         
-        logger.info(f"Successfully transcribed audio (length: {len(transcript)} chars)")
-        return transcript
+        raise ClovaSpeechError(error_message)
     
-    except httpx.HTTPError as e:
-        logger.error(f"HTTP error during CLOVA Speech request: {e}")
-        raise ClovaSpeechError(f"Failed to connect to CLOVA Speech API: {e}")
+    # Parse JSON response
+    response_data: dict[str, Any] = response.json()
+    logger.debug(f"Received response data: {response_data}")
     
-    except Exception as e:
-        logger.error(f"Unexpected error during transcription: {e}")
-        raise ClovaSpeechError(f"Transcription failed: {e}")
+    # Extract transcript from response
+    # Note: Adjust the key path based on actual CLOVA Speech API response format
+    # Common patterns: response["text"], response["result"]["text"], response["transcript"]
+    transcript = _extract_transcript(response_data)
+    record_audio_seconds(_audio_seconds(response_data))
+    
+    if not transcript:
+        logger.warning("Received empty transcript from CLOVA Speech")
+        return ""
+    
+    logger.info(f"Successfully transcribed audio (length: {len(transcript)} chars)")
+    return transcript
+
+
+def _audio_seconds(response_data: dict[str, Any]) -> float:
+    """
+    Seconds of audio recognized, from the end of the last segment (in milliseconds).
+    
+    The response has no total duration; trailing silence is not counted.
+    """
+    segments = response_data.get("segments")
+    if not isinstance(segments, list):
+        return 0.0
+    ends = [seg.get("end") for seg in segments if isinstance(seg, dict)]
+    return max((end for end in ends if isinstance(end, (int, float))), default=0) / 1000
 
 
 def _extract_transcript(response_data: dict[str, Any]) -> str:
@@ -12,6 +12,10 @@ from typing import Any
 import httpx
 
 from config import settings
+from monitoring.metrics import record_upstream_response, record_payload_size
+from monitoring.usage import record_llm_usage
+from services.http_clients import get_async_http_client, get_http_client
+from services.upstream_scheduler import upstream_slot, upstream_slot_sync
 
 # Configure logger
 logger = logging.getLogger(__name__)
@@ -42,6 +46,52 @@ def generate_reply(transcript_history: list[dict], senior_profile: dict) -> str:
         ClovaStudioError: If the API request fails
         ValueError: If required configuration is missing
     """
+    payload = _build_reply_payload(transcript_history, senior_profile)
+
+    try:
+        # 4) Call CLOVA Studio
+        response_data = _call_clova_studio(payload)
+        return _reply_text(response_data)
+
+    except Exception as e:
+        logger.error(f"Failed to generate reply: {e}")
+        raise
+
+
+async def generate_reply_async(transcript_history: list[dict], senior_profile: dict) -> str:
+    """
+    Generate a conversational reply using CLOVA Studio LLM, without blocking the event loop.
+
+    Async counterpart of generate_reply for request handlers. Cancelling the
+    awaiting task aborts the upstream request (e.g. when a speculative reply
+    is discarded).
+
+    Args:
+        transcript_history: List of conversation turns ({"speaker", "text"})
+        senior_profile: Dictionary with senior information
+
+    Returns:
+        str: The generated AI response text (1-2 sentences in Korean)
+
+    Raises:
+        ClovaStudioError: If the API request fails
+        ValueError: If required configuration is missing
+
+    Example:
+        >>> ai_text = await generate_reply_async(history, {"name": "어르신", "age": 75})
+    """
+    payload = _build_reply_payload(transcript_history, senior_profile)
+
+    try:
+        response_data = await _call_clova_studio_async(payload)
+        return _reply_text(response_data)
+
+    except Exception as e:
+        logger.error(f"Failed to generate reply: {e}")
+        raise
+
+
+def _build_reply_payload(transcript_history: list[dict], senior_profile: dict) -> dict[str, Any]:
     # 1) Check env config
     _validate_config()
 
@@ -54,7 +104,7 @@ def generate_reply(transcript_history: list[dict], senior_profile: dict) -> str:
     # 3) Build CLOVA Studio v3/chat-completions payload
     #    - system: role / behavior
     #    - user:   actual prompt text
-    payload: dict[str, Any] = {
+    return {
         "messages": [
             {
                 "role": "system",
@@ -85,25 +135,19 @@ def generate_reply(transcript_history: list[dict], senior_profile: dict) -> str:
         "includeAiFilters": True,
     }
 
-    try:
-        # 4) Call CLOVA Studio
-        response_data = _call_clova_studio(payload)
 
-        # 5) Extract the assistant's text from the response
-        generated_text = _extract_generated_text(response_data)
+def _reply_text(response_data: dict[str, Any]) -> str:
+    # 5) Extract the assistant's text from the response
+    generated_text = _extract_generated_text(response_data)
 
-        if not generated_text:
-            logger.warning("Received empty response from CLOVA Studio")
-            return "죄송합니다, 다시 말씀해 주시겠어요?"  # Fallback reply
+    if not generated_text:
+        logger.warning("Received empty response from CLOVA Studio")
+        return "죄송합니다, 다시 말씀해 주시겠어요?"  # Fallback reply
 
-        logger.info(
-            f"Successfully generated reply (length: {len(generated_text)} chars)"
-        )
-        return generated_text.strip()
-
-    except Exception as e:
-        logger.error(f"Failed to generate reply: {e}")
-        raise
+    logger.info(
+        f"Successfully generated reply (length: {len(generated_text)} chars)"
+    )
+    return generated_text.strip()
 
 def analyze_conversation(full_transcript: str, senior_profile: dict) -> dict:
     """
@@ -128,6 +172,53 @@ def analyze_conversation(full_transcript: str, senior_profile: dict) -> dict:
         ClovaStudioError: If the API request fails or JSON parsing fails
         ValueError: If required configuration is missing
     """
+    payload = _build_analysis_payload(full_transcript, senior_profile)
+
+    try:
+        # 4) Call CLOVA Studio
+        response_data = _call_clova_studio(payload)
+        return _analysis_result(response_data)
+
+    except Exception as e:
+        logger.error(f"Failed to analyze conversation: {e}")
+        raise
+
+
+async def analyze_conversation_async(full_transcript: str, senior_profile: dict) -> dict:
+    """
+    Analyze a complete conversation transcript, without blocking the event loop.
+
+    Async counterpart of analyze_conversation for request handlers. While it
+    waits for a CLOVA Studio slot (e.g., as background work behind
+    conversation turns), no worker thread is held.
+
+    Args:
+        full_transcript: Complete conversation transcript as a single string
+        senior_profile: Dictionary with senior information
+
+    Returns:
+        dict: Analysis results with keys summary, mood and risk_level
+
+    Raises:
+        ClovaStudioError: If the API request fails or JSON parsing fails
+        ValueError: If required configuration is missing
+
+    Example:
+        >>> with background_priority():
+        ...     analysis = await analyze_conversation_async(transcript, profile)
+    """
+    payload = _build_analysis_payload(full_transcript, senior_profile)
+
+    try:
+        response_data = await _call_clova_studio_async(payload)
+        return _analysis_result(response_data)
+
+    except Exception as e:
+        logger.error(f"Failed to analyze conversation: {e}")
+        raise
+
+
+def _build_analysis_payload(full_transcript: str, senior_profile: dict) -> dict[str, Any]:
     # 1) Check env config
     _validate_config()
 
@@ -138,7 +229,7 @@ def analyze_conversation(full_transcript: str, senior_profile: dict) -> dict:
     logger.debug(f"Transcript length: {len(full_transcript)} chars")
 
     # 3) Build CLOVA Studio v3/chat-completions payload
-    payload: dict[str, Any] = {
+    return {
         "messages": [
             {
                 "role": "system",
@@ -167,28 +258,116 @@ def analyze_conversation(full_transcript: str, senior_profile: dict) -> dict:
         "includeAiFilters": True,
     }
 
-    try:
-        # 4) Call CLOVA Studio
-        response_data = _call_clova_studio(payload)
 
-        # 5) Get raw text (should be JSON or JSON + noise)
-        generated_text = _extract_generated_text(response_data)
-        if not generated_text:
-            logger.error("Received empty analysis from CLOVA Studio")
-            raise ClovaStudioError("Empty response from CLOVA Studio")
+def _analysis_result(response_data: dict[str, Any]) -> dict:
+    # 5) Get raw text (should be JSON or JSON + noise)
+    generated_text = _extract_generated_text(response_data)
+    if not generated_text:
+        logger.error("Received empty analysis from CLOVA Studio")
+        raise ClovaStudioError("Empty response from CLOVA Studio")
+
+    # 6) Parse JSON from the text (robust to extra explanation)
+    analysis = _parse_analysis_json(generated_text)
+
+    logger.info(
+        "Successfully analyzed conversation: "
+        f"mood={analysis.get('mood')}, risk={analysis.get('risk_level')}"
+    )
+    return analysis
+
+# JSON schema of generated quiz questions (CLOVA Studio structured outputs)
+QUIZ_QUESTIONS_SCHEMA: dict[str, Any] = {
+    "type": "object",
+    "properties": {
+        "questions": {
+            "type": "array",
+            "items": {
+                "type": "object",
+                "properties": {
+                    "question": {"type": "string"},
+                    "options": {
+                        "type": "array",
+                        "items": {"type": "string"},
+                        "minItems": 4,
+                        "maxItems": 4,
+                    },
+                    "answer_index": {"type": "integer", "minimum": 0, "maximum": 3},
+                    "difficulty": {"type": "integer", "minimum": 1, "maximum": 3},
+                },
+                "required": ["question", "options", "answer_index", "difficulty"],
+            },
+        },
+    },
+    "required": ["questions"],
+}
 
-        # 6) Parse JSON from the text (robust to extra explanation)
-        analysis = _parse_analysis_json(generated_text)
 
-        logger.info(
-            "Successfully analyzed conversation: "
-            f"mood={analysis.get('mood')}, risk={analysis.get('risk_level')}"
-        )
-        return analysis
+def generate_quiz_questions(category: str, description: str, count: int) -> list[dict]:
+    """
+    Generate a batch of multiple choice quiz questions using CLOVA Studio.
+
+    Requests `count` questions of one category in a single call, constrained
+    to QUIZ_QUESTIONS_SCHEMA with structured outputs. The items are returned
+    as produced by the model; callers must validate them.
+
+    Args:
+        category: Question category (e.g., "memory", "calculation")
+        description: What questions of the category should test (Korean)
+        count: Number of questions to request
+
+    Returns:
+        list[dict]: Items with question, options, answer_index and difficulty
+
+    Raises:
+        ClovaStudioError: If the API request fails or the output is not valid JSON
+        ValueError: If required configuration is missing
+    """
+    _validate_config()
+
+    logger.info(f"Generating {count} quiz questions for category {category} with CLOVA Studio")
+
+    payload: dict[str, Any] = {
+        "messages": [
+            {
+                "role": "system",
+                "content": [
+                    {
+                        "type": "text",
+                        "text": (
+                            "You write short cognitive screening quiz questions in Korean "
+                            "for elderly people. Every question has exactly 4 options and "
+                            "exactly one correct answer. Use polite, simple Korean."
+                        ),
+                    }
+                ],
+            },
+            {
+                "role": "user",
+                "content": [
+                    {
+                        "type": "text",
+                        "text": _build_quiz_prompt(description, count),
+                    }
+                ],
+            },
+        ],
+        "responseFormat": {"type": "json", "schema": QUIZ_QUESTIONS_SCHEMA},
+        "temperature": 0.8,  # varied questions across batches
+    }
+
+    response_data = _call_clova_studio(payload, model=settings.quiz_generation_model)
+    generated_text = _extract_generated_text(response_data)
+
+    try:
+        questions = json.loads(generated_text)["questions"]
+    except (json.JSONDecodeError, KeyError, TypeError):
+        logger.error(f"Invalid quiz generation output: {generated_text[:200]}")
+        raise ClovaStudioError("Failed to parse generated quiz questions from CLOVA Studio response")
+
+    if not isinstance(questions, list):
+        raise ClovaStudioError("Generated quiz questions are not a list")
+    return questions
 
-    except Exception as e:
-        logger.error(f"Failed to analyze conversation: {e}")
-        raise
 
 def _validate_config() -> None:
     """Validate that required CLOVA Studio configuration is present."""
@@ -199,12 +378,13 @@ def _validate_config() -> None:
         raise ValueError("CLOVA Studio API key is not configured in settings")
     
 
-def _call_clova_studio(payload: dict[str, Any]) -> dict[str, Any]:
+def _call_clova_studio(payload: dict[str, Any], model: str = "HCX-DASH-002") -> dict[str, Any]:
     """
     Make HTTP request to CLOVA Studio API.
 
     Args:
         payload: Request payload dictionary
+        model: Chat completions model name
 
     Returns:
         dict: JSON response from CLOVA Studio
@@ -212,45 +392,114 @@ def _call_clova_studio(payload: dict[str, Any]) -> dict[str, Any]:
     Raises:
         ClovaStudioError: If the request fails
     """
-
-    headers = {
-        "Content-Type": "application/json",
-        "Authorization": f"Bearer {settings.clova_studio_api_key}",
-    }
-
-    url = settings.clova_studio_endpoint + "v3/chat-completions/HCX-DASH-002"
+    url = settings.clova_studio_endpoint + f"v3/chat-completions/{model}"
 
     try:
         logger.debug(f"Calling CLOVA Studio endpoint: {url}")
 
-        with httpx.Client(timeout=60.0) as client:
-            response = client.post(
+        # Wait for a slot of the shared quota (interactive turns go first)
+        with upstream_slot_sync("clova_studio"):
+            response = get_http_client("clova_studio").post(
                 url,
-                headers=headers,
+                headers=_request_headers(),
                 json=payload,
             )
+        response_data = _handle_response(response)
+        _record_usage(payload, response_data)
+        return response_data
 
-        logger.info(f"CLOVA Studio API response status: {response.status_code}")
+    except httpx.HTTPError as e:
+        logger.error(f"HTTP error during CLOVA Studio request: {e}")
+        record_upstream_response("clova_studio", "error")
+        raise ClovaStudioError(f"Failed to connect to CLOVA Studio API: {e}")
 
-        # HTTP error handling
-        if response.status_code != 200:
-            error_message = f"CLOVA Studio API error: {response.status_code}"
-            try:
-                error_data = response.json()
-                error_message += f" - {error_data}"
-                logger.error(f"API error response: {error_data}")
-            except Exception:
-                error_message += f" - {response.text}"
-                logger.error(f"API error response (raw): {response.text}")
 
-            raise ClovaStudioError(error_message)
+async def _call_clova_studio_async(payload: dict[str, Any], model: str = "HCX-DASH-002") -> dict[str, Any]:
+    """Async counterpart of _call_clova_studio (on the shared async client)."""
+    url = settings.clova_studio_endpoint + f"v3/chat-completions/{model}"
 
-        return response.json()
+    try:
+        logger.debug(f"Calling CLOVA Studio endpoint: {url}")
+
+        async with upstream_slot("clova_studio"):
+            response = await get_async_http_client("clova_studio").post(
+                url,
+                headers=_request_headers(),
+                json=payload,
+            )
+        response_data = _handle_response(response)
+        _record_usage(payload, response_data)
+        return response_data
 
     except httpx.HTTPError as e:
         logger.error(f"HTTP error during CLOVA Studio request: {e}")
+        record_upstream_response("clova_studio", "error")
         raise ClovaStudioError(f"Failed to connect to CLOVA Studio API: {e}")
 
+
+def _request_headers() -> dict[str, str]:
+    return {
+        "Content-Type": "application/json",
+        "Authorization": f"Bearer {settings.clova_studio_api_key}",
+    }
+
+
+def _handle_response(response: httpx.Response) -> dict[str, Any]:
+    logger.info(f"CLOVA Studio API response status: {response.status_code}")
+    record_upstream_response("clova_studio", response.status_code)
+    record_payload_size("clova_studio", "request", len(response.request.content))
+    record_payload_size("clova_studio", "response", len(response.content))
+
+    # HTTP error handling
+    if response.status_code != 200:
+        error_message = f"CLOVA Studio API error: {response.status_code}"
+        try:
+            error_data = response.json()
+            error_message += f" - {error_data}"
+            logger.error(f"API error response: {error_data}")
+        except Exception:
+            error_message += f" - {response.text}"
+            logger.error(f"API error response (raw): {response.text}")
+
+        raise ClovaStudioError(error_message)
+
+    return response.json()
+
+def _record_usage(payload: dict[str, Any], response_data: dict[str, Any]) -> None:
+    # Token counts from result.usage ({"promptTokens", "completionTokens", "totalTokens"})
+    result = response_data.get("result")
+    usage = result.get("usage") if isinstance(result, dict) else None
+    if not isinstance(usage, dict):
+        usage = {}
+    prompt_chars = sum(
+        len(part.get("text", ""))
+        for message in payload.get("messages", [])
+        for part in message.get("content", [])
+        if isinstance(part, dict)
+    )
+    record_llm_usage(
+        int(usage.get("promptTokens") or 0),
+        int(usage.get("completionTokens") or 0),
+        prompt_chars,
+    )
+
+
+def format_transcript(turns: list[dict]) -> str:
+    """
+    Format conversation turns as a dialog transcript, one line per turn.
+    
+    Args:
+        turns: List of turns, each dict containing {"speaker": "senior" | "ai", "text": "..."}
+        
+    Returns:
+        str: Transcript such as "AI: 안녕하세요\n어르신: 네, 안녕하세요"
+    """
+    return "\n".join([
+        f"{'AI' if turn['speaker'] == 'ai' else '어르신'}: {turn['text']}"
+        for turn in turns
+    ])
+
+
 def _build_conversation_prompt(transcript_history: list[dict], senior_profile: dict) -> str:
     """
     Build a prompt for conversational reply generation.
@@ -274,10 +523,7 @@ def _build_conversation_prompt(transcript_history: list[dict], senior_profile: d
         profile_text += f"\n관심사: {preferences}"
     
     # Format conversation history
-    history_text = "\n".join([
-        f"{'AI' if turn['speaker'] == 'ai' else '어르신'}: {turn['text']}"
-        for turn in transcript_history[-5:]  # Last 5 turns for context
-    ])
+    history_text = format_transcript(transcript_history[-5:])  # Last 5 turns for context
     
     # Build complete prompt
     prompt = f"""{profile_text}
@@ -331,6 +577,28 @@ JSON만 출력하고 다른 설명은 포함하지 마세요."""
     return prompt
 
 
+def _build_quiz_prompt(description: str, count: int) -> str:
+    """
+    Build a prompt for quiz question generation.
+    
+    Args:
+        description: What the questions should test
+        count: Number of questions to generate
+        
+    Returns:
+        str: Formatted prompt for the LLM
+    """
+    return f"""어르신의 인지 기능을 확인하는 객관식 퀴즈 문제를 {count}개 만들어주세요.
+
+영역: {description}
+
+조건:
+- 문제는 한 문장으로 짧고 쉽게 작성
+- 보기는 4개, 정답은 1개 (answer_index는 0부터 시작)
+- difficulty는 1(쉬움), 2(보통), 3(어려움) 중 하나로, 세 난이도를 골고루 섞기
+- 날짜나 요일처럼 답이 매일 바뀌는 문제, 개인 정보를 묻는 문제는 제외"""
+
+
 def _extract_generated_text(response_data: dict[str, Any]) -> str:
     """
     Extract generated text from CLOVA Studio response.
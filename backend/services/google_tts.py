@@ -6,17 +6,27 @@ Google Cloud's Text-to-Speech API.
 """
 
 import logging
-from typing import Optional
+import threading
+import time
+from typing import TYPE_CHECKING, Optional
 
 import os
 from urllib import response
-from google.cloud import texttospeech
 
 from config import settings
+from monitoring.metrics import record_upstream_response, record_payload_size
+from monitoring.usage import record_tts_characters
+from services.upstream_fixtures import record_call, replay_call
+
+if TYPE_CHECKING:
+    from google.cloud import texttospeech
 
 # Configure logger
 logger = logging.getLogger(__name__)
 
+_client: 'texttospeech.TextToSpeechClient | None' = None
+_client_lock = threading.Lock()
+
 
 class GoogleTTSError(Exception):
     """Custom exception for Google TTS errors."""
@@ -62,9 +72,21 @@ def synthesize_speech(text: str) -> bytes:
     logger.info(f"Synthesizing speech with Google TTS (length: {len(text)} chars)")
     logger.debug(f"Voice: {settings.google_tts_voice_name}, Language: {settings.google_tts_language_code}")
     
+    # Identifies this synthesis request in upstream fixtures (record/replay mode)
+    fixture_key = f"{settings.google_tts_language_code}\n{text}".encode("utf-8")
+    
+    record_tts_characters(len(text))
+    
+    if settings.upstream_fixture_mode == "replay":
+        audio_bytes = replay_call("google_tts", fixture_key)
+        _record_synthesis(text, audio_bytes)
+        return audio_bytes
+    
     try:
-        # Create TTS client
-        client = texttospeech.TextToSpeechClient()
+        from google.cloud import texttospeech
+        
+        # Shared TTS client (channel and credentials set up once per process)
+        client = get_client()
         
         # Build synthesis input
         synthesis_input = texttospeech.SynthesisInput(text=text)
@@ -82,14 +104,19 @@ def synthesize_speech(text: str) -> bytes:
         
         # Perform TTS request
         logger.debug("Calling Google TTS API")
+        start = time.perf_counter()
         response = client.synthesize_speech(
             input=synthesis_input,
             voice=voice,
             audio_config=audio_config
         )
         
+        if settings.upstream_fixture_mode == "record":
+            record_call("google_tts", fixture_key, response.audio_content, time.perf_counter() - start)
+        
         # Extract audio content from response
         audio_bytes = response.audio_content
+        _record_synthesis(text, audio_bytes)
         
 
         if not response.audio_content:
@@ -101,12 +128,67 @@ def synthesize_speech(text: str) -> bytes:
     
     except Exception as e:
         logger.error(f"Failed to synthesize speech: {e}")
+        if not isinstance(e, GoogleTTSError):
+            record_upstream_response("google_tts", getattr(e, "code", None) or "error")
         raise GoogleTTSError(f"Google TTS synthesis failed: {e}")
     
     
 
 
-def _get_audio_encoding(encoding_str: str) -> texttospeech.AudioEncoding:
+def _record_synthesis(text: str, audio_bytes: bytes) -> None:
+    # Same metrics for live and replayed syntheses
+    record_upstream_response("google_tts", 200)
+    record_payload_size("google_tts", "request", len(text.encode("utf-8")))
+    record_payload_size("google_tts", "response", len(audio_bytes))
+
+
+def get_client() -> 'texttospeech.TextToSpeechClient':
+    """
+    Return the shared Google TTS client, creating it on first use.
+    
+    Uses the default gRPC client, unless `settings.google_tts_endpoint` points
+    to a custom server (e.g., the load-test fake), in which case the REST
+    transport is used without credentials. Creating the client discovers
+    credentials and sets up the channel, so it is done once per process (at
+    startup when warm-up is enabled, see services/warmup.py).
+    
+    Returns:
+        texttospeech.TextToSpeechClient: Configured TTS client
+    """
+    global _client
+    if _client is None:
+        with _client_lock:
+            if _client is None:
+                _client = _create_client()
+    return _client
+
+
+def close_client() -> None:
+    """Close the shared TTS client's channel (at shutdown)."""
+    global _client
+    with _client_lock:
+        client, _client = _client, None
+    if client is not None:
+        client.transport.close()
+
+
+def _create_client() -> 'texttospeech.TextToSpeechClient':
+    # The SDK (and the gRPC stack) is only imported when the first client is created
+    from google.api_core.client_options import ClientOptions
+    from google.auth.credentials import AnonymousCredentials
+    from google.cloud import texttospeech
+    
+    if settings.google_tts_endpoint:
+        return texttospeech.TextToSpeechClient(
+            transport="rest",
+            client_options=ClientOptions(api_endpoint=settings.google_tts_endpoint),
+            credentials=AnonymousCredentials(),
+        )
+    
+    return texttospeech.TextToSpeechClient()
+
+
+def _get_audio_encoding(encoding_str: str) -> 'texttospeech.AudioEncoding':
     """
     Convert audio encoding string to Google TTS AudioEncoding enum.
     
@@ -119,6 +201,8 @@ def _get_audio_encoding(encoding_str: str) -> texttospeech.AudioEncoding:
     Raises:
         ValueError: If the encoding string is not recognized
     """
+    from google.cloud import texttospeech
+    
     # Normalize the input string
     encoding_upper = encoding_str.upper().strip()
     
@@ -0,0 +1,117 @@
+"""
+Shared HTTP clients for the upstream APIs.
+
+The CLOVA services send every request through one long-lived client per
+upstream, so TCP connections and TLS sessions are pooled and reused across
+requests instead of being set up on every call. Clients are created on first
+use, or ahead of the first request by the startup warm-up (services/warmup.py).
+
+Two kinds of clients are kept:
+    get_http_client(upstream)        httpx.Client, for sync callers (worker
+                                     threads, CLI tools)
+    get_async_http_client(upstream)  httpx.AsyncClient bound to the running
+                                     event loop, for async request handlers
+                                     (cancelling the awaiting task aborts the
+                                     upstream request)
+
+Pooled connections are kept for settings.upstream_idle_connection_seconds;
+keep-alive probes (settings.upstream_keepalive_seconds) refresh them when the
+instance is idle.
+"""
+
+import asyncio
+import threading
+
+import httpx
+
+from config import settings
+from services.upstream_fixtures import get_transport
+
+# Request timeout per upstream, in seconds
+TIMEOUTS = {
+    "clova_speech": 30.0,
+    "clova_studio": 60.0,
+}
+
+# Clients per (upstream, fixture mode): recording and replay use their own transport
+_clients: dict[tuple[str, str], httpx.Client] = {}
+_clients_lock = threading.Lock()
+
+# Async clients per (upstream, fixture mode), with the event loop they belong to
+_async_clients: dict[tuple[str, str], tuple[asyncio.AbstractEventLoop, httpx.AsyncClient]] = {}
+
+
+def _client_options(upstream: str) -> dict:
+    return {
+        "timeout": TIMEOUTS.get(upstream, 30.0),
+        "limits": httpx.Limits(keepalive_expiry=settings.upstream_idle_connection_seconds),
+        "transport": get_transport(upstream),
+    }
+
+
+def get_http_client(upstream: str) -> httpx.Client:
+    """
+    Return the shared HTTP client for an upstream, creating it on first use.
+
+    Args:
+        upstream: Upstream name ("clova_speech" or "clova_studio")
+
+    Returns:
+        httpx.Client: Client with a connection pool for the upstream (using
+                      the recording or replay transport in fixture modes)
+
+    Example:
+        >>> response = get_http_client("clova_studio").post(url, json=payload)
+    """
+    key = (upstream, settings.upstream_fixture_mode)
+    client = _clients.get(key)
+    if client is None:
+        with _clients_lock:
+            client = _clients.get(key)
+            if client is None:
+                client = httpx.Client(**_client_options(upstream))
+                _clients[key] = client
+    return client
+
+
+def get_async_http_client(upstream: str) -> httpx.AsyncClient:
+    """
+    Return the shared async HTTP client for an upstream on the running event loop.
+
+    Must be called from a coroutine. A client created on another (e.g. a
+    closed test) event loop is replaced.
+
+    Args:
+        upstream: Upstream name ("clova_speech" or "clova_studio")
+
+    Returns:
+        httpx.AsyncClient: Client with a connection pool for the upstream
+
+    Example:
+        >>> response = await get_async_http_client("clova_studio").post(url, json=payload)
+    """
+    loop = asyncio.get_running_loop()
+    key = (upstream, settings.upstream_fixture_mode)
+    entry = _async_clients.get(key)
+    if entry is None or entry[0] is not loop:
+        entry = (loop, httpx.AsyncClient(**_client_options(upstream)))
+        _async_clients[key] = entry
+    return entry[1]
+
+
+def close_http_clients() -> None:
+    """Close all shared sync clients and their pooled connections (at shutdown)."""
+    with _clients_lock:
+        clients = list(_clients.values())
+        _clients.clear()
+    for client in clients:
+        client.close()
+
+
+async def aclose_http_clients() -> None:
+    """Close the shared async clients of the running event loop (at shutdown)."""
+    loop = asyncio.get_running_loop()
+    for key, (client_loop, client) in list(_async_clients.items()):
+        if client_loop is loop:
+            del _async_clients[key]
+            await client.aclose()
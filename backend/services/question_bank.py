@@ -0,0 +1,239 @@
+"""
+Question bank indexed by category and difficulty.
+
+Every question gets a bit index (its position in the bank). Each
+(category, difficulty) bucket is stored as a bitmask over those indices, so
+picking an unseen question for a senior is a couple of integer operations
+against the senior's seen bitset, independent of the bank size or the
+senior's history. Questions are also pre-serialized to their JSON fragment,
+so an assembled quiz is a concatenation of bytes.
+
+Bit indices follow the order questions were added to this process's bank
+and only ever grow (new questions are appended), so in-memory bitsets stay
+valid while the process runs. They differ between workers and restarts
+(pool questions are synced at different times, the bundled file may
+change), so anything persisted refers to questions by ID.
+
+Configured through settings:
+    quiz_bank_path:  bundled question bank file, relative to the backend directory
+"""
+
+import json
+import logging
+import os
+import threading
+import time
+
+from config import settings
+from models.quiz import QuizQuestion
+from security import sign, signature_matches
+from services.quiz_scoring import AnswerKey
+
+# Configure logger
+logger = logging.getLogger(__name__)
+
+# Backend root directory, for resolving the bundled bank path
+_BACKEND_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# Prefix of the IDs of quizzes assembled from the bank; the rest of the ID
+# lists the question IDs, so submissions can be scored without stored state,
+# followed by the issue time and a signature (see adaptive_quiz_id)
+ADAPTIVE_QUIZ_PREFIX = "adaptive."
+
+# Separates the question list, issue time and signature of an assembled quiz ID
+_QUIZ_ID_SEPARATOR = "~"
+
+
+class BankQuestion:
+    """
+    A question of the bank.
+
+    Attributes:
+        index: Bit index of the question in the bank
+        id: Question ID
+        category: Question category
+        difficulty: Difficulty level (1 = easiest)
+        fragment: JSON bytes of the question as served (QuizQuestion, no answer)
+    """
+
+    __slots__ = ("index", "id", "category", "difficulty", "fragment")
+
+    def __init__(self, index: int, question: QuizQuestion, category: str, difficulty: int):
+        self.index = index
+        self.id = question.id
+        self.category = category
+        self.difficulty = difficulty
+        self.fragment = question.model_dump_json().encode("utf-8")
+
+
+class QuestionBank:
+    """
+    Questions indexed by category and difficulty.
+
+    Attributes:
+        title: Title of quizzes assembled from the bank
+        questions: Questions by bit index
+        definitions: Question definitions (with answers) by bit index
+        answer_key: Answer key over all questions of the bank
+    """
+
+    def __init__(self, title: str, definitions: list[dict]):
+        self.title = title
+        self.questions: list[BankQuestion] = []
+        self._by_id: dict[str, BankQuestion] = {}
+        self.definitions: list[dict] = []
+        self._buckets: dict[tuple[str, int], int] = {}
+        self._lock = threading.Lock()
+        self.answer_key: AnswerKey | None = None
+        self.add_questions(definitions)
+
+    def add_questions(self, definitions: list[dict]) -> int:
+        """
+        Append questions to the bank.
+
+        Questions whose ID is already in the bank are skipped.
+
+        Args:
+            definitions: Question definitions (id, question, options, answer,
+                         category, difficulty)
+
+        Returns:
+            int: Number of questions added
+
+        Raises:
+            ValueError: If a definition is invalid
+        """
+        with self._lock:
+            added, added_ids = [], set()
+            for definition in definitions:
+                if definition["id"] in self._by_id or definition["id"] in added_ids:
+                    continue
+                QuizQuestion.model_validate(definition)
+                if definition.get("answer") is None:
+                    raise ValueError(f"Bank question {definition['id']!r} has no answer")
+                added.append(definition)
+                added_ids.add(definition["id"])
+            if not added:
+                return 0
+
+            # Validate the answers before touching the index
+            answer_key = AnswerKey.from_definition({"id": "bank", "questions": self.definitions + added})
+
+            # Readers use the bucket index without the lock: build a new one
+            # and swap it in once the questions it points to exist
+            buckets = dict(self._buckets)
+            for definition in added:
+                question = BankQuestion(
+                    len(self.questions),
+                    QuizQuestion.model_validate(definition),
+                    definition.get("category") or "general",
+                    int(definition.get("difficulty", 1)),
+                )
+                self.questions.append(question)
+                self.definitions.append(definition)
+                self._by_id[question.id] = question
+                bucket = (question.category, question.difficulty)
+                buckets[bucket] = buckets.get(bucket, 0) | (1 << question.index)
+
+            self._buckets = buckets
+            self.answer_key = answer_key
+            return len(added)
+
+    def __len__(self) -> int:
+        return len(self.questions)
+
+    @property
+    def categories(self) -> list[str]:
+        """Categories of the bank, in order of first appearance."""
+        return list(dict.fromkeys(category for category, _ in self._buckets))
+
+    def difficulties(self, category: str) -> list[int]:
+        """Difficulty levels available in a category, ascending."""
+        return sorted(difficulty for cat, difficulty in self._buckets if cat == category)
+
+    def count(self, category: str) -> int:
+        """Number of questions in a category."""
+        return sum(mask.bit_count() for (cat, _), mask in self._buckets.items() if cat == category)
+
+    def bucket_mask(self, category: str, difficulty: int) -> int:
+        """Bitmask of the questions in a (category, difficulty) bucket."""
+        return self._buckets.get((category, difficulty), 0)
+
+    def get(self, question_id: str) -> BankQuestion | None:
+        return self._by_id.get(question_id)
+
+
+def _signed_message(senior_id: str, quiz: str, issued_at: str) -> str:
+    return f"{senior_id}\n{quiz}{_QUIZ_ID_SEPARATOR}{issued_at}"
+
+
+def adaptive_quiz_id(question_ids: list[str], senior_id: str) -> str:
+    """
+    Build the ID of a quiz assembled from the given bank questions for a senior.
+
+    The ID is signed for the senior, with its issue time, so a submission can
+    be checked against a quiz the backend actually issued (see
+    verify_adaptive_quiz_id).
+
+    Example:
+        >>> adaptive_quiz_id(["mem_1_01", "lang_1_02"], "senior_123")
+        'adaptive.mem_1_01.lang_1_02~6710a3c2~3q2Jx...'
+    """
+    quiz = ADAPTIVE_QUIZ_PREFIX + ".".join(question_ids)
+    issued_at = f"{int(time.time()):x}"
+    signature = sign(_signed_message(senior_id, quiz, issued_at))
+    return _QUIZ_ID_SEPARATOR.join((quiz, issued_at, signature))
+
+
+def parse_adaptive_quiz_id(quiz_id: str) -> list[str] | None:
+    """Return the question IDs of an assembled quiz, or None if `quiz_id` is not one (not verified)."""
+    if not quiz_id.startswith(ADAPTIVE_QUIZ_PREFIX):
+        return None
+    quiz = quiz_id.split(_QUIZ_ID_SEPARATOR, 1)[0]
+    return [question_id for question_id in quiz[len(ADAPTIVE_QUIZ_PREFIX):].split(".") if question_id]
+
+
+def verify_adaptive_quiz_id(quiz_id: str, senior_id: str) -> bool:
+    """
+    Check that an assembled quiz was issued to the senior and has not expired.
+
+    Args:
+        quiz_id: Assembled quiz ID, as returned by /quiz/list
+        senior_id: Senior submitting the quiz
+
+    Returns:
+        bool: True if the signature matches and the quiz was issued within
+              settings.quiz_id_max_age_seconds
+    """
+    parts = quiz_id.split(_QUIZ_ID_SEPARATOR)
+    if len(parts) != 3:
+        return False
+    quiz, issued_at, signature = parts
+    if not signature_matches(_signed_message(senior_id, quiz, issued_at), signature):
+        return False
+    return time.time() - int(issued_at, 16) <= settings.quiz_id_max_age_seconds
+
+
+def load_question_bank(path: str) -> QuestionBank:
+    """Load the bank from a JSON file ({"title": ..., "questions": [...]})."""
+    if not os.path.isabs(path):
+        path = os.path.join(_BACKEND_DIR, path)
+    with open(path, encoding="utf-8") as f:
+        data = json.load(f)
+    return QuestionBank(data["title"], data["questions"])
+
+
+_bank: QuestionBank | None = None
+_bank_lock = threading.Lock()
+
+
+def get_question_bank() -> QuestionBank:
+    """Return the question bank, loading it on first use."""
+    global _bank
+    if _bank is None:
+        with _bank_lock:
+            if _bank is None:
+                bank = load_question_bank(settings.quiz_bank_path)
+                logger.info(f"Loaded question bank: {len(bank)} questions in {len(bank.categories)} categories")
+                _bank = bank
+    return _bank
@@ -0,0 +1,216 @@
+"""
+Pre-synthesized audio for quiz questions and options.
+
+Every question and option text of the catalog quizzes and the question bank
+is synthesized once by the bundle builder (below), stored as an MP3 named by
+the hash of the text and voice, and listed in a manifest. The quiz API then
+serves the manifest and the clips as static files, so reading a quiz aloud
+costs no TTS call at request time, and unchanged texts are never
+re-synthesized when the bundle is rebuilt.
+
+Clips are addressed by content, so the bundle version follows the question
+texts: an edited question gets a new clip, and its old clip is left behind
+until the directory is rebuilt from scratch.
+
+Layout of the audio directory (settings.quiz_audio_dir):
+    {clip_id}.mp3     one clip per distinct text (clip_id: 32 hex chars)
+    manifest.json     {"version": ..., "questions": {question_id: {"question": clip_id,
+                                                                   "options": {option_id: clip_id}}}}
+
+Building the bundle (from the backend directory, with Google TTS configured):
+    python -m services.quiz_audio                 # catalog quizzes and question bank
+    python -m services.quiz_audio --pool          # also generated questions from Firestore
+"""
+
+import argparse
+import hashlib
+import json
+import logging
+import os
+import re
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+from config import settings
+
+# Configure logger
+logger = logging.getLogger(__name__)
+
+# Backend root directory, for resolving the audio directory
+_BACKEND_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+MANIFEST_FILENAME = "manifest.json"
+
+_CLIP_ID_PATTERN = re.compile(r"^[0-9a-f]{32}$")
+
+
+def audio_dir() -> str:
+    """Absolute path of the quiz audio directory."""
+    path = settings.quiz_audio_dir
+    return path if os.path.isabs(path) else os.path.join(_BACKEND_DIR, path)
+
+
+def clip_id(text: str) -> str:
+    """Content hash identifying the clip of a text with the configured voice."""
+    key = f"{settings.google_tts_language_code}\n{settings.google_tts_voice_name}\n{text}"
+    return hashlib.sha256(key.encode("utf-8")).hexdigest()[:32]
+
+
+def option_speech_text(position: int, text: str) -> str:
+    """Text read aloud for an option (numbered, e.g. "2번, 여름")."""
+    return f"{position}번, {text}"
+
+
+def clip_path(clip: str) -> str | None:
+    """Path of a clip file, or None if the ID is malformed or the clip does not exist."""
+    if not _CLIP_ID_PATTERN.match(clip):
+        return None
+    path = os.path.join(audio_dir(), f"{clip}.mp3")
+    return path if os.path.exists(path) else None
+
+
+class AudioManifest:
+    """
+    Clip IDs of every question with pre-synthesized audio.
+
+    Attributes:
+        version: Hash of the manifest content
+        questions: Per question ID: {"question": clip_id, "options": {option_id: clip_id}}
+    """
+
+    def __init__(self, questions: dict[str, dict], version: str):
+        self.questions = questions
+        self.version = version
+
+    @classmethod
+    def load(cls, directory: str) -> "AudioManifest":
+        """Load the manifest of an audio directory (empty if it was never built)."""
+        path = os.path.join(directory, MANIFEST_FILENAME)
+        if not os.path.exists(path):
+            logger.warning(f"No quiz audio manifest at {path}; quizzes will have no audio")
+            return cls({}, "")
+        with open(path, encoding="utf-8") as f:
+            data = json.load(f)
+        return cls(data["questions"], data["version"])
+
+    def for_questions(self, question_ids: list[str]) -> tuple[dict[str, dict], list[str]]:
+        """
+        Look up the clips of the given questions.
+
+        Returns:
+            tuple[dict[str, dict], list[str]]: Clip IDs per question with audio,
+                                               and the question IDs without audio
+        """
+        clips, missing = {}, []
+        for question_id in question_ids:
+            entry = self.questions.get(question_id)
+            if entry is None:
+                missing.append(question_id)
+            else:
+                clips[question_id] = entry
+        return clips, missing
+
+
+_manifest: AudioManifest | None = None
+_manifest_lock = threading.Lock()
+
+
+def get_audio_manifest() -> AudioManifest:
+    """Return the audio manifest, loading it on first use."""
+    global _manifest
+    if _manifest is None:
+        with _manifest_lock:
+            if _manifest is None:
+                _manifest = AudioManifest.load(audio_dir())
+    return _manifest
+
+
+def build_audio_bundle(questions: list[dict], directory: str, workers: int = 4) -> dict[str, dict]:
+    """
+    Synthesize the clips of quiz questions that are not in the directory yet.
+
+    Args:
+        questions: Question definitions (id, question, options)
+        directory: Audio directory
+        workers: Concurrent TTS requests
+
+    Returns:
+        dict[str, dict]: Manifest entries per question ID
+    """
+    # Deferred: only the builder needs the TTS client
+    from services.google_tts import synthesize_speech
+
+    os.makedirs(directory, exist_ok=True)
+
+    entries: dict[str, dict] = {}
+    texts: dict[str, str] = {}
+    for question in questions:
+        if question["id"] in entries:
+            logger.warning(f"Duplicate question ID {question['id']!r}; keeping the first one")
+            continue
+        question_clip = clip_id(question["question"])
+        texts[question_clip] = question["question"]
+        option_clips = {}
+        for position, option in enumerate(question["options"], start=1):
+            spoken = option_speech_text(position, option["text"])
+            option_clips[option["id"]] = clip_id(spoken)
+            texts[option_clips[option["id"]]] = spoken
+        entries[question["id"]] = {"question": question_clip, "options": option_clips}
+
+    missing = {clip: text for clip, text in texts.items()
+               if not os.path.exists(os.path.join(directory, f"{clip}.mp3"))}
+    logger.info(f"{len(texts)} distinct clips, {len(missing)} to synthesize")
+
+    def synthesize(item: tuple[str, str]) -> None:
+        clip, text = item
+        audio = synthesize_speech(text)
+        # Write to a temporary file first so a crashed build never leaves a truncated clip
+        path = os.path.join(directory, f"{clip}.mp3")
+        with open(f"{path}.tmp", "wb") as f:
+            f.write(audio)
+        os.replace(f"{path}.tmp", path)
+
+    with ThreadPoolExecutor(max_workers=workers) as executor:
+        for _ in executor.map(synthesize, missing.items()):
+            pass
+
+    return entries
+
+
+def write_manifest(entries: dict[str, dict], directory: str) -> str:
+    """Write the manifest of an audio directory and return its version."""
+    content = json.dumps(entries, sort_keys=True, ensure_ascii=False)
+    version = hashlib.sha256(content.encode("utf-8")).hexdigest()[:16]
+    with open(os.path.join(directory, MANIFEST_FILENAME), "w", encoding="utf-8") as f:
+        json.dump({"version": version, "questions": entries}, f, ensure_ascii=False, indent=2)
+    return version
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Synthesize quiz question and option audio")
+    parser.add_argument("--pool", action="store_true", help="Include generated questions from Firestore")
+    parser.add_argument("--output", default=None, help="Audio directory (default: settings.quiz_audio_dir)")
+    parser.add_argument("--workers", type=int, default=4, help="Concurrent TTS requests")
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.INFO, format="%(levelname)s %(message)s")
+
+    from services.question_bank import get_question_bank
+    from services.quiz_catalog import get_catalog
+
+    questions = [question.model_dump() for entry in get_catalog() for question in entry.quiz.questions]
+
+    bank = get_question_bank()
+    if args.pool:
+        from services.quiz_generator import QuizPoolGenerator
+        QuizPoolGenerator(bank).sync()
+    questions += bank.definitions
+
+    directory = args.output or audio_dir()
+    entries = build_audio_bundle(questions, directory, args.workers)
+    version = write_manifest(entries, directory)
+    print(f"✅ Quiz audio bundle {version}: {len(entries)} questions in {directory}")
+
+
+if __name__ == "__main__":
+    main()
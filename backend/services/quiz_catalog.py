@@ -0,0 +1,161 @@
+"""
+In-memory quiz catalog with pre-serialized responses.
+
+Quiz definitions are loaded once (from the bundled JSON file or the Firestore
+quizzes collection, depending on settings), validated, and serialized to the
+exact response bytes of /quiz/catalog/{quiz_id}. Each entry carries a content
+hash used as its ETag, so serving a quiz costs neither model construction nor
+JSON encoding, and clients holding the current version get a 304. (/quiz/list
+assembles an adaptive quiz per senior and is not cached.)
+
+Answer keys and categories stay server-side: they are compiled into each
+entry's AnswerKey for scoring and never appear in the served bytes.
+
+Configured through settings:
+    quiz_catalog_source:  "file" (default) or "firestore"
+    quiz_catalog_path:    bundled catalog file, relative to the backend directory
+"""
+
+import hashlib
+import json
+import logging
+import os
+import threading
+
+from config import settings
+from models.quiz import QuizListResponse, QuizSession
+from services.quiz_scoring import AnswerKey
+
+# Configure logger
+logger = logging.getLogger(__name__)
+
+# Backend root directory, for resolving the bundled catalog path
+_BACKEND_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+class QuizCatalogError(Exception):
+    """Custom exception for missing quizzes or invalid quiz definitions."""
+    pass
+
+
+class CatalogEntry:
+    """
+    A quiz serialized once for serving.
+
+    Attributes:
+        quiz: The validated quiz session
+        answer_key: Answer key used to score submissions of the quiz
+        body: JSON bytes of the QuizListResponse wrapping the quiz
+        etag: Quoted strong ETag (SHA-256 of body)
+    """
+
+    __slots__ = ("quiz", "answer_key", "body", "etag")
+
+    def __init__(self, quiz: QuizSession, answer_key: AnswerKey):
+        self.quiz = quiz
+        self.answer_key = answer_key
+        self.body = QuizListResponse(
+            success=True,
+            quiz=quiz,
+            message="Quiz retrieved successfully",
+        ).model_dump_json().encode("utf-8")
+        self.etag = f'"{hashlib.sha256(self.body).hexdigest()}"'
+
+
+class QuizCatalog:
+    """
+    Immutable index of quizzes by ID.
+
+    Attributes:
+        default_quiz_id: Quiz served when no specific quiz is requested
+    """
+
+    def __init__(self, definitions: list[dict], default_quiz_id: str | None = None):
+        self._entries: dict[str, CatalogEntry] = {}
+        for definition in definitions:
+            try:
+                quiz = QuizSession.model_validate(definition)
+                answer_key = AnswerKey.from_definition(definition)
+            except (KeyError, ValueError) as e:
+                raise QuizCatalogError(f"Invalid quiz definition {definition.get('id')!r}: {e}")
+            self._entries[quiz.id] = CatalogEntry(quiz, answer_key)
+
+        if not self._entries:
+            raise QuizCatalogError("Quiz catalog is empty")
+
+        self.default_quiz_id = default_quiz_id or min(self._entries)
+        if self.default_quiz_id not in self._entries:
+            raise QuizCatalogError(f"Default quiz {self.default_quiz_id!r} is not in the catalog")
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def __iter__(self):
+        return iter(self._entries.values())
+
+    def get(self, quiz_id: str | None = None) -> CatalogEntry:
+        """
+        Look up a quiz by ID.
+
+        Args:
+            quiz_id: Quiz ID, or None for the default quiz
+
+        Returns:
+            CatalogEntry: The pre-serialized quiz
+
+        Raises:
+            QuizCatalogError: If the quiz does not exist
+        """
+        entry = self._entries.get(quiz_id or self.default_quiz_id)
+        if entry is None:
+            raise QuizCatalogError(f"Quiz not found: {quiz_id}")
+        return entry
+
+
+def load_catalog_file(path: str) -> QuizCatalog:
+    """Load the catalog from a JSON file ({"default_quiz_id": ..., "quizzes": [...]})."""
+    if not os.path.isabs(path):
+        path = os.path.join(_BACKEND_DIR, path)
+    with open(path, encoding="utf-8") as f:
+        data = json.load(f)
+    return QuizCatalog(data["quizzes"], data.get("default_quiz_id"))
+
+
+def load_catalog_firestore() -> QuizCatalog:
+    """Load the catalog from the Firestore quizzes collection."""
+    from db.firestore_client import get_quiz_definitions
+    return QuizCatalog(get_quiz_definitions())
+
+
+_catalog: QuizCatalog | None = None
+_catalog_lock = threading.Lock()
+
+
+def get_catalog() -> QuizCatalog:
+    """Return the quiz catalog, loading it from the configured source on first use."""
+    global _catalog
+    if _catalog is None:
+        with _catalog_lock:
+            if _catalog is None:
+                if settings.quiz_catalog_source == "firestore":
+                    catalog = load_catalog_firestore()
+                else:
+                    catalog = load_catalog_file(settings.quiz_catalog_path)
+                logger.info(f"Loaded quiz catalog from {settings.quiz_catalog_source}: {len(catalog)} quizzes")
+                _catalog = catalog
+    return _catalog
+
+
+def etag_matches(if_none_match: str | None, etag: str) -> bool:
+    """
+    Check an If-None-Match header against an ETag.
+
+    Handles lists of ETags, weak validators (W/"...") and "*".
+    """
+    if not if_none_match:
+        return False
+    for candidate in if_none_match.split(","):
+        candidate = candidate.strip()
+        if candidate == "*" or candidate.removeprefix("W/") == etag:
+            return True
+    return False
@@ -0,0 +1,192 @@
+"""
+Background generation of quiz questions into the question pool.
+
+Quiz requests never call the LLM: /quiz/list only reads the in-memory
+question bank. This module keeps the bank topped up in the background:
+
+    1. sync: append questions from the Firestore questionPool collection that
+       this worker has not loaded yet (in creation order, re-reading the
+       questions created at the last synced timestamp and skipping the IDs
+       already in the bank)
+    2. refill: for each category below the target size, request a batch of
+       questions from CLOVA Studio (one call per batch, JSON schema
+       constrained), validate them, drop duplicates of questions already in
+       the bank, store them in questionPool and sync again
+
+Generated question IDs are derived from the normalized question text, so the
+same question generated twice (or by two workers) is stored only once.
+
+Configured through settings:
+    quiz_pool_enabled:              run the background job (started in the app lifespan)
+    quiz_generation_batch_size:     questions requested per CLOVA Studio call
+    quiz_pool_target_per_category:  questions per category to keep in the bank
+    quiz_pool_interval_seconds:     seconds between runs
+"""
+
+import asyncio
+import hashlib
+import logging
+import re
+from datetime import datetime
+
+from config import settings
+from db.firestore_client import add_pool_questions, get_question_pool
+from services.clova_studio import generate_quiz_questions
+from services.question_bank import QuestionBank
+from services.upstream_scheduler import run_in_background
+
+# Configure logger
+logger = logging.getLogger(__name__)
+
+# What each category of the bank tests, given to the LLM
+CATEGORY_DESCRIPTIONS = {
+    "memory": "기억력 - 문제 안에 제시된 단어나 숫자 목록을 기억해 답하기",
+    "language": "언어 능력 - 반대말, 속담, 같은 종류가 아닌 낱말 고르기",
+    "calculation": "계산 능력 - 간단한 덧셈, 뺄셈, 물건값과 거스름돈 계산",
+    "attention": "주의력 - 수열의 다음 숫자, 순서 거꾸로 말하기",
+    "knowledge": "일반 상식 - 명절, 계절, 시간, 우리나라 문화에 대한 상식",
+}
+
+# Length limits of generated questions and options (characters)
+MAX_QUESTION_LENGTH = 120
+MAX_OPTION_LENGTH = 40
+
+
+def normalize_question_text(text: str) -> str:
+    """Normalize a question for duplicate detection (no spaces, punctuation or case)."""
+    return re.sub(r"[\W_]+", "", text).lower()
+
+
+def validate_generated_question(item: dict, category: str) -> dict | None:
+    """
+    Validate a generated question and convert it to a bank definition.
+
+    Args:
+        item: Question as generated (question, options, answer_index, difficulty)
+        category: Category the question was generated for
+
+    Returns:
+        dict | None: Bank question definition, or None if the item is invalid
+    """
+    if not isinstance(item, dict):
+        return None
+
+    question = item.get("question")
+    options = item.get("options")
+    answer_index = item.get("answer_index")
+    difficulty = item.get("difficulty")
+
+    if not isinstance(question, str) or not 5 <= len(question.strip()) <= MAX_QUESTION_LENGTH:
+        return None
+    if not isinstance(options, list) or len(options) != 4:
+        return None
+    if not all(isinstance(option, str) and 0 < len(option.strip()) <= MAX_OPTION_LENGTH for option in options):
+        return None
+    if len({option.strip() for option in options}) != 4:
+        return None
+    # bool is an int subclass; reject it explicitly
+    if not isinstance(answer_index, int) or isinstance(answer_index, bool) or not 0 <= answer_index <= 3:
+        return None
+    if not isinstance(difficulty, int) or isinstance(difficulty, bool) or not 1 <= difficulty <= 3:
+        return None
+
+    digest = hashlib.sha1(normalize_question_text(question).encode("utf-8")).hexdigest()[:10]
+    question_id = f"gen_{category}_{digest}"
+    return {
+        "id": question_id,
+        "category": category,
+        "difficulty": difficulty,
+        "question": question.strip(),
+        "options": [
+            {"id": f"{question_id}_opt{i + 1}", "text": option.strip()}
+            for i, option in enumerate(options)
+        ],
+        "answer": f"{question_id}_opt{answer_index + 1}",
+    }
+
+
+class QuizPoolGenerator:
+    """Keeps the question bank topped up with validated generated questions."""
+
+    def __init__(self, bank: QuestionBank):
+        self.bank = bank
+        self._synced_until: datetime | None = None
+
+    def _known_texts(self) -> set[str]:
+        return {normalize_question_text(definition["question"]) for definition in self.bank.definitions}
+
+    def sync(self) -> int:
+        """
+        Append questions stored in the pool since the last sync to the bank.
+
+        Questions at the last synced timestamp are read again (another one
+        may share it) and skipped by ID if already in the bank.
+
+        Returns:
+            int: Number of questions added to the bank
+        """
+        questions = get_question_pool(self._synced_until)
+        if not questions:
+            return 0
+        self._synced_until = questions[-1]["createdAt"]
+        return self.bank.add_questions([
+            {key: value for key, value in question.items() if key != "createdAt"}
+            for question in questions
+        ])
+
+    def generate(self, category: str) -> int:
+        """
+        Generate one batch of questions for a category and store the valid, new ones.
+
+        Returns:
+            int: Number of questions stored in the pool
+        """
+        generated = generate_quiz_questions(
+            category, CATEGORY_DESCRIPTIONS.get(category, category), settings.quiz_generation_batch_size
+        )
+
+        known = self._known_texts()
+        accepted = []
+        for item in generated:
+            definition = validate_generated_question(item, category)
+            if definition is None:
+                logger.debug(f"Dropping invalid generated question: {item}")
+                continue
+            text = normalize_question_text(definition["question"])
+            if text in known:
+                continue
+            known.add(text)
+            accepted.append(definition)
+
+        logger.info(
+            f"Generated {len(generated)} questions for {category}: "
+            f"{len(accepted)} valid and new"
+        )
+        return add_pool_questions(accepted) if accepted else 0
+
+    def refill(self) -> None:
+        """Sync the pool, then top up every category below the target size."""
+        added = self.sync()
+        if added:
+            logger.info(f"Synced {added} pool questions into the question bank")
+
+        for category in self.bank.categories:
+            missing = settings.quiz_pool_target_per_category - self.bank.count(category)
+            if missing <= 0:
+                continue
+            try:
+                self.generate(category)
+            except Exception as e:
+                # One failing category (or upstream hiccup) must not stop the others
+                logger.warning(f"Quiz generation failed for {category}: {e}")
+
+        self.sync()
+
+    async def run(self) -> None:
+        """Refill the pool every quiz_pool_interval_seconds until cancelled (as background work)."""
+        while True:
+            try:
+                await run_in_background(self.refill)
+            except Exception as e:
+                logger.error(f"Question pool refill failed: {e}", exc_info=True)
+            await asyncio.sleep(settings.quiz_pool_interval_seconds)
@@ -0,0 +1,219 @@
+"""
+Vectorized quiz scoring against stored answer keys.
+
+An answer key holds, for each question of a quiz, the index of the correct
+option and the question's category as compact numpy arrays. Submissions are
+encoded to option-index arrays, so scoring one submission or a whole history
+of them is a handful of array operations: per-question correctness,
+per-category accuracy and the overall score come out of the same pass.
+
+Questions without a fixed answer (e.g. "what day is it today?") are kept in
+the key as unscored: they are encoded but excluded from accuracy.
+
+Example:
+    >>> key = AnswerKey.from_definition(quiz_definition)
+    >>> result = key.score({"q2": "q2_opt4", "q3": "q3_opt2"})
+    >>> result.score, result.category_accuracy
+    (0.5, {'language': 1.0, 'calculation': 0.0})
+
+    >>> batch = key.score_batch(key.encode_batch(history))   # thousands of submissions
+    >>> batch.scores.mean()
+"""
+
+import numpy as np
+
+# Option index used for missing, unknown and unscored answers
+NO_ANSWER = -1
+
+
+class QuizScore:
+    """
+    Scoring result of a single submission.
+
+    Attributes:
+        score: Fraction of scored questions answered correctly (0.0-1.0)
+        correct_count: Number of scored questions answered correctly
+        scored_count: Number of scored questions in the quiz
+        results: Correctness per scored question ID
+        category_accuracy: Accuracy per category (categories with scored questions only)
+    """
+
+    __slots__ = ("score", "correct_count", "scored_count", "results", "category_accuracy")
+
+    def __init__(self, score: float, correct_count: int, scored_count: int,
+                 results: dict[str, bool], category_accuracy: dict[str, float]):
+        self.score = score
+        self.correct_count = correct_count
+        self.scored_count = scored_count
+        self.results = results
+        self.category_accuracy = category_accuracy
+
+
+class BatchScores:
+    """
+    Scoring results of many submissions of the same quiz.
+
+    Attributes:
+        correct: Boolean matrix (submissions x questions); unscored questions are False
+        scores: Overall score per submission
+        category_accuracy: Accuracy matrix (submissions x categories)
+        categories: Category names, in column order of category_accuracy
+    """
+
+    __slots__ = ("correct", "scores", "category_accuracy", "categories")
+
+    def __init__(self, correct: np.ndarray, scores: np.ndarray,
+                 category_accuracy: np.ndarray, categories: list[str]):
+        self.correct = correct
+        self.scores = scores
+        self.category_accuracy = category_accuracy
+        self.categories = categories
+
+
+class AnswerKey:
+    """
+    Answer key of one quiz, stored as arrays indexed by question position.
+
+    Attributes:
+        quiz_id: ID of the quiz
+        question_ids: Question IDs in quiz order
+        categories: Distinct categories in order of first appearance
+        correct_options: Correct option index per question (int8, NO_ANSWER if unscored)
+        category_codes: Category index per question (int16)
+    """
+
+    def __init__(self, quiz_id: str, question_ids: list[str], option_ids: list[list[str]],
+                 correct_options: list[int], question_categories: list[str]):
+        self.quiz_id = quiz_id
+        self.question_ids = question_ids
+        self.categories = list(dict.fromkeys(question_categories))
+
+        # Lookups used to encode submissions: question ID -> position,
+        # (position, option ID) -> option index
+        self._question_index = {qid: i for i, qid in enumerate(question_ids)}
+        self._option_index = [{oid: j for j, oid in enumerate(options)} for options in option_ids]
+
+        self.correct_options = np.asarray(correct_options, dtype=np.int8)
+        self.category_codes = np.asarray(
+            [self.categories.index(c) for c in question_categories], dtype=np.int16
+        )
+        self._scored = self.correct_options != NO_ANSWER
+
+        # Question -> category one-hot matrix restricted to scored questions,
+        # so per-category counts of a whole batch are a single matrix product
+        self._category_matrix = np.zeros((len(question_ids), len(self.categories)), dtype=np.float32)
+        self._category_matrix[np.arange(len(question_ids)), self.category_codes] = self._scored
+        self._scored_per_category = self._category_matrix.sum(axis=0)
+
+    @classmethod
+    def from_definition(cls, definition: dict) -> "AnswerKey":
+        """
+        Build the key from a quiz definition (as stored in the quiz catalog).
+
+        Each question may carry "answer" (the correct option ID, or null when
+        the question is not scored) and "category" (defaults to "general").
+
+        Raises:
+            ValueError: If an answer is not one of its question's options
+        """
+        question_ids, option_ids, correct_options, categories = [], [], [], []
+        for question in definition["questions"]:
+            options = [option["id"] for option in question["options"]]
+            answer = question.get("answer")
+            if answer is not None and answer not in options:
+                raise ValueError(f"Answer {answer!r} of question {question['id']!r} is not one of its options")
+            question_ids.append(question["id"])
+            option_ids.append(options)
+            correct_options.append(options.index(answer) if answer is not None else NO_ANSWER)
+            categories.append(question.get("category") or "general")
+        return cls(definition["id"], question_ids, option_ids, correct_options, categories)
+
+    @property
+    def scored_count(self) -> int:
+        return int(self._scored.sum())
+
+    def encode(self, answers: dict[str, str]) -> np.ndarray:
+        """
+        Encode a submission to option indices in question order.
+
+        Unknown question IDs are ignored; unanswered questions and unknown
+        option IDs are encoded as NO_ANSWER.
+        """
+        encoded = np.full(len(self.question_ids), NO_ANSWER, dtype=np.int8)
+        for question_id, option_id in answers.items():
+            position = self._question_index.get(question_id)
+            if position is not None:
+                encoded[position] = self._option_index[position].get(option_id, NO_ANSWER)
+        return encoded
+
+    def encode_batch(self, submissions: list[dict[str, str]]) -> np.ndarray:
+        """Encode many submissions into a (submissions x questions) int8 matrix."""
+        encoded = np.empty((len(submissions), len(self.question_ids)), dtype=np.int8)
+        # Column by column: one dict lookup per answer, no per-submission arrays
+        for position, question_id in enumerate(self.question_ids):
+            options = self._option_index[position]
+            encoded[:, position] = [options.get(answers.get(question_id), NO_ANSWER) for answers in submissions]
+        return encoded
+
+    def mask_for(self, question_ids: list[str]) -> np.ndarray:
+        """
+        Build a question mask restricting scoring to a subset of the key.
+
+        Used when a quiz is assembled from part of a larger key (e.g. the
+        question bank), so unasked questions do not count as wrong.
+
+        Raises:
+            KeyError: If a question ID is not in the key
+        """
+        mask = np.zeros(len(self.question_ids), dtype=bool)
+        mask[[self._question_index[question_id] for question_id in question_ids]] = True
+        return mask
+
+    def _scored_selection(self, mask: np.ndarray | None) -> tuple[np.ndarray, np.ndarray, np.ndarray]:
+        # Scored questions, question -> category matrix and scored questions
+        # per category, restricted to the mask
+        if mask is None:
+            return self._scored, self._category_matrix, self._scored_per_category
+        category_matrix = self._category_matrix * mask[:, np.newaxis]
+        return self._scored & mask, category_matrix, category_matrix.sum(axis=0)
+
+    def score_batch(self, encoded: np.ndarray, mask: np.ndarray | None = None) -> BatchScores:
+        """
+        Score encoded submissions.
+
+        Args:
+            encoded: (submissions x questions) option-index matrix from encode_batch
+            mask: Optional question mask from mask_for; all questions if None
+
+        Returns:
+            BatchScores: Correctness matrix, scores and per-category accuracy
+        """
+        scored, category_matrix, scored_per_category = self._scored_selection(mask)
+        correct = (encoded == self.correct_options) & scored
+        correct_per_category = correct.astype(np.float32) @ category_matrix
+
+        with np.errstate(divide="ignore", invalid="ignore"):
+            category_accuracy = correct_per_category / scored_per_category
+        scored_count = int(scored.sum())
+        scores = correct_per_category.sum(axis=1) / scored_count if scored_count else np.zeros(len(encoded))
+
+        return BatchScores(correct, scores, category_accuracy, self.categories)
+
+    def score(self, answers: dict[str, str], mask: np.ndarray | None = None) -> QuizScore:
+        """Score a single submission (question ID -> selected option ID), optionally restricted by a mask."""
+        scored, _, scored_per_category = self._scored_selection(mask)
+        batch = self.score_batch(self.encode(answers)[np.newaxis, :], mask)
+        correct = batch.correct[0]
+        return QuizScore(
+            score=round(float(batch.scores[0]), 4),
+            correct_count=int(correct.sum()),
+            scored_count=int(scored.sum()),
+            results={
+                self.question_ids[i]: bool(correct[i]) for i in np.flatnonzero(scored)
+            },
+            category_accuracy={
+                category: round(float(batch.category_accuracy[0, c]), 4)
+                for c, category in enumerate(self.categories)
+                if scored_per_category[c]
+            },
+        )
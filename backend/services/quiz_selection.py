@@ -0,0 +1,252 @@
+"""
+Adaptive, non-repeating quiz selection from the question bank.
+
+For each senior, the selector keeps in memory (LRU-bounded):
+    - a bitset of the bank questions already shown, over this worker's bank
+      indices (persisted as the list of the questions' IDs in
+      seniors/{senior_id}/stats/quizSelection, since bank indices differ
+      between workers and restarts)
+    - the per-category accuracy EWMAs from the senior's quiz trend aggregate
+
+Both are loaded with a single Firestore round trip (on the async client) the
+first time a senior is seen by this worker. Updated bitsets are not written
+on every quiz: they are held for settings.quiz_seen_flush_seconds and the
+updates of all seniors made meanwhile are written in one batch (and flushed
+at shutdown). Assembling a quiz then picks, per category, an unseen
+question of the difficulty matching the senior's recent accuracy (bitmask
+operations, constant time per question) and concatenates the questions'
+pre-serialized JSON fragments.
+
+Configured through settings:
+    quiz_questions_per_category:  questions per category in an assembled quiz
+    quiz_selection_cache_size:    seniors whose selection state is kept in memory
+    quiz_seen_flush_seconds:      delay of the batched seen-questions writes
+"""
+
+import asyncio
+import json
+import logging
+import threading
+
+from cachetools import LRUCache
+
+from config import settings
+from db.async_firestore import get_quiz_selection_state, save_quiz_seen
+from services.question_bank import QuestionBank, adaptive_quiz_id, get_question_bank
+
+# Configure logger
+logger = logging.getLogger(__name__)
+
+# Difficulty used for categories without quiz history
+DEFAULT_DIFFICULTY = 2
+
+# Category accuracy EWMA below which easier questions are chosen, and from
+# which harder ones are chosen
+EASIER_BELOW = 0.5
+HARDER_FROM = 0.8
+
+
+class SelectionState:
+    """
+    In-memory selection state of one senior.
+
+    Attributes:
+        seen: Bitset of bank question indices already shown
+        unresolved: IDs of questions already shown that are not (yet) in
+                    this worker's bank; kept so they are persisted again
+        accuracy: Accuracy EWMA per category (from the trend aggregate)
+    """
+
+    __slots__ = ("seen", "unresolved", "accuracy")
+
+    def __init__(self, seen: int, unresolved: set[str], accuracy: dict[str, float]):
+        self.seen = seen
+        self.unresolved = unresolved
+        self.accuracy = accuracy
+
+
+class AssembledQuiz:
+    """
+    A quiz assembled for a senior.
+
+    Attributes:
+        quiz_id: Quiz ID (encodes the question IDs, signed for the senior, see adaptive_quiz_id)
+        question_ids: IDs of the selected questions
+        body: JSON bytes of the QuizListResponse
+    """
+
+    __slots__ = ("quiz_id", "question_ids", "body")
+
+    def __init__(self, quiz_id: str, question_ids: list[str], body: bytes):
+        self.quiz_id = quiz_id
+        self.question_ids = question_ids
+        self.body = body
+
+
+def _category_accuracy(stats: dict | None) -> dict[str, float]:
+    categories = (stats or {}).get("categories", {})
+    return {category: trend["ewma"] for category, trend in categories.items()}
+
+
+def target_difficulty(accuracy: float | None) -> int:
+    """Difficulty level matching a senior's accuracy EWMA in a category."""
+    if accuracy is None:
+        return DEFAULT_DIFFICULTY
+    if accuracy < EASIER_BELOW:
+        return DEFAULT_DIFFICULTY - 1
+    if accuracy >= HARDER_FROM:
+        return DEFAULT_DIFFICULTY + 1
+    return DEFAULT_DIFFICULTY
+
+
+class QuizSelector:
+    """Assembles personalized quizzes from a question bank."""
+
+    def __init__(self, bank: QuestionBank, cache_size: int):
+        self.bank = bank
+        self._states: LRUCache = LRUCache(maxsize=cache_size)
+        self._lock = threading.Lock()
+        # Seniors whose seen questions changed since the last flush
+        self._dirty: dict[str, SelectionState] = {}
+        self._flush_task: asyncio.Task | None = None
+
+    async def _get_state(self, senior_id: str) -> SelectionState:
+        with self._lock:
+            state = self._states.get(senior_id)
+        if state is not None:
+            return state
+
+        seen_ids, stats = await get_quiz_selection_state(senior_id)
+        state = SelectionState(0, set(seen_ids or ()), _category_accuracy(stats))
+        self._resolve(state)
+        with self._lock:
+            return self._states.setdefault(senior_id, state)
+
+    def _resolve(self, state: SelectionState) -> None:
+        """Move the unresolved seen IDs that are now in the bank into the bitset."""
+        for question_id in list(state.unresolved):
+            question = self.bank.get(question_id)
+            if question is not None:
+                state.seen |= 1 << question.index
+                state.unresolved.discard(question_id)
+
+    def _seen_ids(self, state: SelectionState) -> list[str]:
+        """IDs of the questions a senior has seen, for persisting."""
+        seen_ids, bits = [], state.seen
+        while bits:
+            lowest = bits & -bits
+            seen_ids.append(self.bank.questions[lowest.bit_length() - 1].id)
+            bits ^= lowest
+        return seen_ids + sorted(state.unresolved)
+
+    def _pick(self, state: SelectionState, category: str, taken: int) -> int | None:
+        """Pick the bit index of an unseen question of a category, or None if the category is empty."""
+        target = target_difficulty(state.accuracy.get(category))
+        # Closest difficulty first, easier before harder on ties
+        for difficulty in sorted(self.bank.difficulties(category), key=lambda d: (abs(d - target), d)):
+            bucket = self.bank.bucket_mask(category, difficulty) & ~taken
+            if not bucket:
+                continue
+            unseen = bucket & ~state.seen
+            if not unseen:
+                # Every question of the bucket was shown: start it over
+                state.seen &= ~bucket
+                unseen = bucket
+            # Lowest unseen bit
+            return (unseen & -unseen).bit_length() - 1
+        return None
+
+    async def assemble(self, senior_id: str) -> AssembledQuiz:
+        """
+        Assemble a quiz for a senior and mark its questions as seen.
+
+        Args:
+            senior_id: Unique identifier for the senior user
+
+        Returns:
+            AssembledQuiz: The quiz ID, question IDs and response bytes
+        """
+        state = await self._get_state(senior_id)
+
+        with self._lock:
+            if state.unresolved:
+                # Questions added to the bank since the state was loaded
+                self._resolve(state)
+            taken, picked = 0, []
+            for category in self.bank.categories:
+                for _ in range(settings.quiz_questions_per_category):
+                    index = self._pick(state, category, taken)
+                    if index is None:
+                        break
+                    taken |= 1 << index
+                    picked.append(index)
+            state.seen |= taken
+            self._dirty[senior_id] = state
+
+        if self._flush_task is None or self._flush_task.done():
+            self._flush_task = asyncio.create_task(self._flush_later())
+
+        questions = [self.bank.questions[index] for index in picked]
+
+        question_ids = [question.id for question in questions]
+        quiz_id = adaptive_quiz_id(question_ids, senior_id)
+        body = b"".join((
+            b'{"success":true,"quiz":{"id":',
+            json.dumps(quiz_id).encode("utf-8"),
+            b',"title":',
+            json.dumps(self.bank.title, ensure_ascii=False).encode("utf-8"),
+            b',"questions":[',
+            b",".join(question.fragment for question in questions),
+            b']},"message":"Quiz retrieved successfully"}',
+        ))
+        return AssembledQuiz(quiz_id, question_ids, body)
+
+    async def _flush_later(self) -> None:
+        await asyncio.sleep(settings.quiz_seen_flush_seconds)
+        await self.flush()
+
+    async def flush(self) -> None:
+        """Write the seen questions of the seniors changed since the last flush."""
+        with self._lock:
+            dirty, self._dirty = self._dirty, {}
+            seen_by_senior = {senior_id: self._seen_ids(state) for senior_id, state in dirty.items()}
+        if not seen_by_senior:
+            return
+
+        try:
+            await save_quiz_seen(seen_by_senior)
+        except Exception as e:
+            # Keep them for the next flush (newer changes are already marked)
+            logger.error(f"Failed to save seen questions of {len(dirty)} seniors: {e}")
+            with self._lock:
+                for senior_id, state in dirty.items():
+                    self._dirty.setdefault(senior_id, state)
+
+    def record_stats(self, senior_id: str, stats: dict) -> None:
+        """Refresh a cached senior's category accuracy after a quiz submission."""
+        with self._lock:
+            state = self._states.get(senior_id)
+            if state is not None:
+                state.accuracy = _category_accuracy(stats)
+
+
+_selector: QuizSelector | None = None
+_selector_lock = threading.Lock()
+
+
+def get_selector() -> QuizSelector:
+    """Return the quiz selector over the question bank (created on first use)."""
+    global _selector
+    if _selector is None:
+        with _selector_lock:
+            if _selector is None:
+                _selector = QuizSelector(get_question_bank(), settings.quiz_selection_cache_size)
+    return _selector
+
+
+async def flush_quiz_selections() -> None:
+    """Write the pending seen-question updates (at shutdown)."""
+    if _selector is not None:
+        if _selector._flush_task is not None:
+            _selector._flush_task.cancel()
+        await _selector.flush()
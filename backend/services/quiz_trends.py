@@ -0,0 +1,109 @@
+"""
+Incrementally maintained cognitive trend aggregates.
+
+Every quiz submission folds into a single per-senior aggregate document
+(seniors/{senior_id}/stats/quiz), so trends and decline checks never need to
+read the submission history. The aggregate holds:
+
+    attempts            number of submissions
+    totalCorrect        correct answers over all submissions
+    totalScored         scored questions over all submissions
+    accuracy            lifetime accuracy (totalCorrect / totalScored)
+    ewmaScore           exponentially weighted moving average of the score
+    categories          per category: attempts, ewma, lastAccuracy
+    recent              last N submissions (quizId, score, correctCount, scoredCount,
+                        submittedAt), oldest first
+    rollingAccuracy     accuracy over the recent window
+    lastSubmittedAt     time of the latest submission
+
+Configured through settings:
+    quiz_trend_window:          size of the recent window (N)
+    quiz_ewma_alpha:            EWMA smoothing factor (weight of the newest score)
+    quiz_decline_threshold:     drop of rolling accuracy below the earlier accuracy flagged as decline
+    quiz_decline_min_attempts:  submissions before the recent window required to evaluate decline
+"""
+
+from datetime import datetime
+
+from config import settings
+from services.quiz_scoring import QuizScore
+
+
+def _ewma(previous: float | None, value: float, alpha: float) -> float:
+    return value if previous is None else alpha * value + (1 - alpha) * previous
+
+
+def update_aggregate(aggregate: dict | None, quiz_id: str, result: QuizScore, submitted_at: datetime) -> dict:
+    """
+    Fold one scored submission into a senior's trend aggregate.
+
+    Args:
+        aggregate: Current aggregate document, or None for the first submission
+        quiz_id: ID of the submitted quiz
+        result: Score of the submission
+        submitted_at: Submission time (stored in the recent window, where
+                      server timestamps are not allowed)
+
+    Returns:
+        dict: The new aggregate document
+    """
+    aggregate = aggregate or {}
+    alpha = settings.quiz_ewma_alpha
+
+    attempts = aggregate.get("attempts", 0) + 1
+    total_correct = aggregate.get("totalCorrect", 0) + result.correct_count
+    total_scored = aggregate.get("totalScored", 0) + result.scored_count
+
+    categories = dict(aggregate.get("categories", {}))
+    for category, accuracy in result.category_accuracy.items():
+        previous = categories.get(category, {})
+        categories[category] = {
+            "attempts": previous.get("attempts", 0) + 1,
+            "ewma": round(_ewma(previous.get("ewma"), accuracy, alpha), 4),
+            "lastAccuracy": accuracy,
+        }
+
+    recent = list(aggregate.get("recent", []))
+    recent.append({
+        "quizId": quiz_id,
+        "score": result.score,
+        "correctCount": result.correct_count,
+        "scoredCount": result.scored_count,
+        "submittedAt": submitted_at,
+    })
+    recent = recent[-settings.quiz_trend_window:]
+    recent_scored = sum(entry["scoredCount"] for entry in recent)
+
+    return {
+        "attempts": attempts,
+        "totalCorrect": total_correct,
+        "totalScored": total_scored,
+        "accuracy": round(total_correct / total_scored, 4) if total_scored else 0.0,
+        "ewmaScore": round(_ewma(aggregate.get("ewmaScore"), result.score, alpha), 4),
+        "categories": categories,
+        "recent": recent,
+        "rollingAccuracy": (
+            round(sum(entry["correctCount"] for entry in recent) / recent_scored, 4) if recent_scored else 0.0
+        ),
+        "lastSubmittedAt": submitted_at,
+    }
+
+
+def detect_decline(aggregate: dict) -> bool:
+    """
+    Check an aggregate for a cognitive decline signal.
+
+    Compares the accuracy of the recent window with the accuracy of all
+    submissions before it, and flags a decline when it dropped by at least
+    the configured threshold. Needs enough submissions before the window to
+    have a meaningful baseline.
+    """
+    recent = aggregate.get("recent", [])
+    if aggregate.get("attempts", 0) - len(recent) < settings.quiz_decline_min_attempts:
+        return False
+
+    earlier_correct = aggregate["totalCorrect"] - sum(entry["correctCount"] for entry in recent)
+    earlier_scored = aggregate["totalScored"] - sum(entry["scoredCount"] for entry in recent)
+    if not earlier_scored:
+        return False
+    return earlier_correct / earlier_scored - aggregate["rollingAccuracy"] >= settings.quiz_decline_threshold
@@ -0,0 +1,81 @@
+"""
+Cross-senior risk alert feed.
+
+Recent calls at the requested risk levels across all seniors come from one
+indexed collection group query (see get_risk_calls_page). Care center
+dashboards poll the feed, so each page is kept in a short-lived in-memory
+cache: any number of dashboards polling the same view cost one Firestore
+query per cache period.
+
+Configured through settings:
+    risk_feed_cache_seconds:  how long a feed page is served from memory
+    risk_feed_cache_size:     feed pages (distinct views and cursors) kept in memory
+"""
+
+import logging
+import threading
+from datetime import datetime, timedelta, timezone
+
+from cachetools import TTLCache
+
+from config import settings
+from db.firestore_client import get_risk_calls_page
+
+# Configure logger
+logger = logging.getLogger(__name__)
+
+
+class RiskFeedPage:
+    """
+    One page of the risk feed.
+
+    Attributes:
+        calls: Calls of the page, most recently ended first
+        next_after: Position of the next page (None on the last page)
+        since: Start of the time window the page was queried with
+    """
+
+    __slots__ = ("calls", "next_after", "since")
+
+    def __init__(self, calls: list[dict], next_after: tuple[datetime, str] | None, since: datetime):
+        self.calls = calls
+        self.next_after = next_after
+        self.since = since
+
+
+_cache: TTLCache = TTLCache(maxsize=settings.risk_feed_cache_size, ttl=settings.risk_feed_cache_seconds)
+_cache_lock = threading.Lock()
+
+
+def get_risk_feed(
+    risk_levels: list[str],
+    hours: int,
+    limit: int,
+    start_after: tuple[datetime, str] | None = None,
+) -> RiskFeedPage:
+    """
+    Return a page of calls at the given risk levels that ended in the last `hours`.
+
+    Args:
+        risk_levels: Risk levels to include
+        hours: Size of the time window, in hours
+        limit: Maximum number of calls per page
+        start_after: Position returned with the previous page, or None
+
+    Returns:
+        RiskFeedPage: The calls and the position of the next page
+    """
+    key = (tuple(sorted(set(risk_levels))), hours, limit, start_after)
+    with _cache_lock:
+        page = _cache.get(key)
+    if page is not None:
+        return page
+
+    since = datetime.now(timezone.utc) - timedelta(hours=hours)
+    calls, next_after = get_risk_calls_page(list(key[0]), since, limit, start_after)
+    page = RiskFeedPage(calls, next_after, since)
+    logger.info(f"Risk feed {key[0]} over {hours}h: {len(calls)} calls")
+
+    with _cache_lock:
+        _cache[key] = page
+    return page
@@ -0,0 +1,191 @@
+"""
+Speculative reply generation from partial transcripts.
+
+While the senior is still speaking, a streaming recognizer
+(services/streaming_stt.py) yields partial transcripts. As soon as a partial
+looks like a complete utterance (the recognizer detected a pause, or the text
+ends like a finished Korean sentence), the reply is generated from it in the
+background. When the final transcript arrives:
+    - hit      the final transcript matches the speculated one closely
+               enough (settings.speculative_match_threshold); the speculative
+               reply is used, and its head start is saved from the turn latency
+    - restart  the final transcript diverges materially; the speculative
+               request is cancelled and the reply is generated from the final
+               transcript
+    - miss     no partial looked complete; the reply is generated as usual
+
+A later partial that diverges from the speculated text cancels the running
+generation and starts a new one, so at most one speculative request per turn
+is in flight.
+"""
+
+import asyncio
+import difflib
+import logging
+import re
+import time
+from collections.abc import Awaitable, Callable
+
+from config import settings
+from monitoring.metrics import record_speculation
+from services.clova_studio import generate_reply_async
+
+# Configure logger
+logger = logging.getLogger(__name__)
+
+# Polite/declarative/interrogative sentence endings of spoken Korean
+_FINAL_ENDINGS = ("요", "다", "죠", "까", "네", "니")
+
+# Characters ignored when comparing transcripts
+_IGNORED = re.compile(r"[\s.,!?~…]+")
+
+ReplyGenerator = Callable[[list[dict], dict], Awaitable[str]]
+
+
+def _normalize(text: str) -> str:
+    return _IGNORED.sub("", text)
+
+
+def _retrieve_exception(task: asyncio.Task) -> None:
+    # Discarded speculative requests may fail unobserved; don't log them as unretrieved
+    if not task.cancelled():
+        task.exception()
+
+
+def utterance_complete(text: str, end_of_utterance: bool = False) -> bool:
+    """
+    Guess whether a partial transcript is a complete utterance.
+
+    Args:
+        text: Partial transcript
+        end_of_utterance: Whether the recognizer detected the end of speech
+
+    Returns:
+        bool: True if it is worth generating a reply from the transcript
+    """
+    normalized = _normalize(text)
+    if len(normalized) < settings.speculative_min_chars:
+        return False
+    if end_of_utterance:
+        return True
+    stripped = text.rstrip()
+    return stripped.endswith((".", "?", "!")) or normalized.endswith(_FINAL_ENDINGS)
+
+
+def diverges(speculated: str, final: str) -> bool:
+    """
+    Whether a transcript differs materially from the one a reply was speculated on.
+
+    Whitespace and punctuation are ignored; the remaining texts must have a
+    similarity of at least settings.speculative_match_threshold.
+
+    Example:
+        >>> diverges("오늘 산책 다녀왔어요", "오늘 산책 다녀왔어요.")
+        False
+    """
+    a, b = _normalize(speculated), _normalize(final)
+    if a == b:
+        return False
+    return difflib.SequenceMatcher(None, a, b).ratio() < settings.speculative_match_threshold
+
+
+class SpeculativeReply:
+    """
+    Reply of one turn, possibly generated ahead of the final transcript.
+
+    Must be used from the event loop of the request handling the turn.
+
+    Example:
+        >>> speculation = SpeculativeReply(history, profile)
+        >>> async for update in recognizer.recognize(chunks, mime_type):
+        ...     if not update.is_final:
+        ...         speculation.on_partial(update.text, update.end_of_utterance)
+        >>> ai_text = await speculation.finish(update.text)
+    """
+
+    __slots__ = ("history", "profile", "_generate", "_task", "_text", "_started_at")
+
+    def __init__(self, history: list[dict], profile: dict, generate: ReplyGenerator | None = None):
+        """
+        Args:
+            history: Conversation turns before this utterance ({"speaker", "text"})
+            profile: Senior profile passed to the reply generator
+            generate: Reply generator (generate_reply_async by default)
+        """
+        self.history = history
+        self.profile = profile
+        self._generate = generate or generate_reply_async
+        self._task: asyncio.Task | None = None
+        self._text = ""
+        self._started_at = 0.0
+
+    def _start(self, text: str) -> None:
+        self.cancel()
+        self._text = text
+        self._started_at = time.monotonic()
+        history = self.history + [{"speaker": "senior", "text": text}]
+        self._task = asyncio.create_task(self._generate(history, self.profile))
+        self._task.add_done_callback(_retrieve_exception)
+
+    def on_partial(self, text: str, end_of_utterance: bool = False) -> None:
+        """
+        Start (or restart) generating the reply from a partial transcript.
+
+        Does nothing when speculation is disabled, the partial does not look
+        complete, or a reply is already being generated from a matching text.
+
+        Args:
+            text: Partial transcript of the utterance so far
+            end_of_utterance: Whether the recognizer detected the end of speech
+        """
+        if not settings.speculative_replies_enabled or not utterance_complete(text, end_of_utterance):
+            return
+        if self._task is not None and not diverges(self._text, text):
+            return
+        if self._task is not None:
+            logger.debug(f"Restarting speculative reply: {self._text!r} -> {text!r}")
+        self._start(text)
+
+    async def finish(self, final_text: str) -> str:
+        """
+        Return the reply to the final transcript.
+
+        Args:
+            final_text: Final transcript of the utterance
+
+        Returns:
+            str: The AI reply, speculative if the final transcript matches
+
+        Raises:
+            ClovaStudioError: If generating the reply fails
+        """
+        task, self._task = self._task, None
+        if task is not None and not diverges(self._text, final_text):
+            head_start = time.monotonic() - self._started_at
+            try:
+                ai_text = await task
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                logger.warning(f"Speculative reply failed, generating again: {e}")
+            else:
+                record_speculation("hit", head_start)
+                logger.info(f"Used speculative reply ({head_start * 1000:.0f} ms head start)")
+                return ai_text
+            outcome = "restart"
+        elif task is not None:
+            task.cancel()
+            outcome = "restart"
+            logger.info(f"Final transcript diverged from speculation: {self._text!r} -> {final_text!r}")
+        else:
+            outcome = "miss"
+
+        record_speculation(outcome)
+        history = self.history + [{"speaker": "senior", "text": final_text}]
+        return await self._generate(history, self.profile)
+
+    def cancel(self) -> None:
+        """Cancel the speculative generation in flight, if any (e.g. on disconnect)."""
+        if self._task is not None:
+            self._task.cancel()
+            self._task = None
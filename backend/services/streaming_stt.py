@@ -0,0 +1,95 @@
+"""
+Streaming speech recognition interface.
+
+A streaming recognizer consumes the audio of one utterance as it is being
+recorded and yields transcript updates: partial transcripts while the senior
+is still speaking, then one final transcript. Speculative reply generation
+(services/speculative.py) starts on the partials.
+
+Recognizers:
+    UploadRecognizer  buffers the audio and transcribes it with the CLOVA
+                      Speech upload API (services/clova_speech.py) once the
+                      audio ends; yields only the final transcript, so
+                      speculation never starts (the default)
+
+CLOVA Speech's real-time recognition is a gRPC streaming API; its generated
+stubs are not part of this project. A recognizer built on them (or a local
+stand-in for tests) implements StreamingRecognizer.recognize and is installed
+with set_streaming_recognizer().
+"""
+
+import logging
+from collections.abc import AsyncIterator
+
+from services.clova_speech import transcribe_audio_async
+
+# Configure logger
+logger = logging.getLogger(__name__)
+
+
+class TranscriptUpdate:
+    """
+    One transcript update of a streaming recognizer.
+
+    Attributes:
+        text: Transcript of the utterance so far (the whole utterance, not a delta)
+        is_final: Whether this is the final transcript of the utterance
+        end_of_utterance: Whether the recognizer detected the end of speech
+                          (a pause), which may come before the final transcript
+    """
+
+    __slots__ = ("text", "is_final", "end_of_utterance")
+
+    def __init__(self, text: str, is_final: bool = False, end_of_utterance: bool = False):
+        self.text = text
+        self.is_final = is_final
+        self.end_of_utterance = end_of_utterance
+
+
+class StreamingRecognizer:
+    """Base class of streaming recognizers."""
+
+    def recognize(self, audio_chunks: AsyncIterator[bytes], mime_type: str) -> AsyncIterator[TranscriptUpdate]:
+        """
+        Recognize one utterance from audio chunks as they arrive.
+
+        Implemented as an async generator by subclasses.
+
+        Args:
+            audio_chunks: Audio of the utterance, ending when the senior stops speaking
+            mime_type: MIME type of the audio
+
+        Returns:
+            AsyncIterator[TranscriptUpdate]: Partial transcripts, then exactly
+                                             one final transcript
+        """
+        raise NotImplementedError
+
+
+class UploadRecognizer(StreamingRecognizer):
+    """Recognizer that transcribes the buffered audio with the upload API once it ends."""
+
+    async def recognize(self, audio_chunks: AsyncIterator[bytes], mime_type: str) -> AsyncIterator[TranscriptUpdate]:
+        chunks = [chunk async for chunk in audio_chunks]
+        text = await transcribe_audio_async(b"".join(chunks), mime_type)
+        yield TranscriptUpdate(text, is_final=True, end_of_utterance=True)
+
+
+_recognizer: StreamingRecognizer = UploadRecognizer()
+
+
+def get_streaming_recognizer() -> StreamingRecognizer:
+    """Return the streaming recognizer used by /conversation/stream."""
+    return _recognizer
+
+
+def set_streaming_recognizer(recognizer: StreamingRecognizer) -> None:
+    """
+    Install the streaming recognizer used by /conversation/stream.
+
+    Example:
+        >>> set_streaming_recognizer(recognizer)
+    """
+    global _recognizer
+    _recognizer = recognizer
+    logger.info(f"Using streaming recognizer: {type(recognizer).__name__}")
@@ -0,0 +1,197 @@
+"""
+Streaming export of call transcripts and analyses.
+
+Exports are generator pipelines: calls are read page by page with Firestore
+cursors, each call's turns page by page (in either turn storage layout), and
+records are encoded and yielded in chunks as they are read. Memory stays
+bounded by one page, however many calls or turns are exported, and the HTTP
+response (or output file) starts before the export is complete.
+
+Formats:
+    ndjson  one JSON object per line: {"type": "call", ...} followed by
+            {"type": "turn", ...} lines for each of its turns
+    csv     one row per turn, with the call's fields repeated (calls without
+            turns get a single row with empty turn columns)
+
+Usage (from the backend directory):
+    python -m services.transcript_export --senior-id senior_123 --format csv --output calls.csv
+    python -m services.transcript_export --start 2025-11-01 --end 2025-12-01 > november.ndjson
+"""
+
+import argparse
+import csv
+import io
+import json
+import sys
+from collections.abc import Iterable, Iterator
+from datetime import datetime, timezone
+
+from config import settings
+from db.firestore_client import get_export_calls_page, get_turns_page
+
+EXPORT_FORMATS = ("ndjson", "csv")
+
+MEDIA_TYPES = {
+    "ndjson": "application/x-ndjson",
+    "csv": "text/csv; charset=utf-8",
+}
+
+CSV_COLUMNS = [
+    "senior_id", "call_id", "started_at", "ended_at", "mood", "risk_level", "summary",
+    "turn_index", "speaker", "text", "timestamp",
+]
+
+# Encoded output is yielded in pieces of about this size
+CHUNK_BYTES = 64 * 1024
+
+
+def as_utc(value: datetime | None) -> datetime | None:
+    """Interpret a time without a UTC offset as UTC."""
+    if value is not None and value.tzinfo is None:
+        return value.replace(tzinfo=timezone.utc)
+    return value
+
+
+def _parse_time(value: str) -> datetime:
+    return as_utc(datetime.fromisoformat(value))
+
+
+def iter_calls(
+    senior_id: str | None,
+    started_from: datetime | None = None,
+    started_before: datetime | None = None,
+) -> Iterator[dict]:
+    """Yield the calls to export, oldest first, one Firestore page at a time."""
+    start_after = None
+    while True:
+        calls, start_after = get_export_calls_page(
+            senior_id, started_from, started_before, settings.export_page_size, start_after
+        )
+        yield from calls
+        if start_after is None:
+            return
+
+
+def iter_turns(senior_id: str, call_id: str) -> Iterator[dict]:
+    """Yield the turns of a call in order, one Firestore page at a time."""
+    start_after = None
+    while True:
+        turns, start_after = get_turns_page(senior_id, call_id, settings.export_page_size, start_after)
+        yield from turns
+        if start_after is None:
+            return
+
+
+def _ndjson_records(calls: Iterable[dict]) -> Iterator[bytes]:
+    for call in calls:
+        yield _ndjson_line({
+            "type": "call",
+            "senior_id": call["seniorId"],
+            "call_id": call["id"],
+            "started_at": call["startedAt"],
+            "ended_at": call["endedAt"],
+            "mood": call["mood"],
+            "risk_level": call["riskLevel"],
+            "summary": call["summary"],
+        })
+        for index, turn in enumerate(iter_turns(call["seniorId"], call["id"])):
+            yield _ndjson_line({
+                "type": "turn",
+                "call_id": call["id"],
+                "turn_index": index,
+                "speaker": turn["speaker"],
+                "text": turn["text"],
+                "timestamp": turn["timestamp"],
+            })
+
+
+def _ndjson_line(record: dict) -> bytes:
+    return json.dumps(record, ensure_ascii=False).encode("utf-8") + b"\n"
+
+
+def _csv_records(calls: Iterable[dict]) -> Iterator[bytes]:
+    buffer = io.StringIO()
+    writer = csv.writer(buffer)
+
+    def row(values: list) -> bytes:
+        buffer.seek(0)
+        buffer.truncate()
+        writer.writerow(values)
+        return buffer.getvalue().encode("utf-8")
+
+    yield row(CSV_COLUMNS)
+    for call in calls:
+        call_values = [
+            call["seniorId"], call["id"], call["startedAt"], call["endedAt"],
+            call["mood"], call["riskLevel"], call["summary"],
+        ]
+        has_turns = False
+        for index, turn in enumerate(iter_turns(call["seniorId"], call["id"])):
+            has_turns = True
+            yield row(call_values + [index, turn["speaker"], turn["text"], turn["timestamp"]])
+        if not has_turns:
+            yield row(call_values + [None, None, None, None])
+
+
+def _coalesce(pieces: Iterable[bytes], size: int = CHUNK_BYTES) -> Iterator[bytes]:
+    """Group small encoded records into pieces of about `size` bytes."""
+    pending, pending_bytes = [], 0
+    for piece in pieces:
+        pending.append(piece)
+        pending_bytes += len(piece)
+        if pending_bytes >= size:
+            yield b"".join(pending)
+            pending, pending_bytes = [], 0
+    if pending:
+        yield b"".join(pending)
+
+
+def export_transcripts(
+    senior_id: str | None,
+    export_format: str,
+    started_from: datetime | None = None,
+    started_before: datetime | None = None,
+) -> Iterator[bytes]:
+    """
+    Stream an export of calls and their turns.
+
+    Args:
+        senior_id: Senior whose calls to export, or None for all seniors
+        export_format: "ndjson" or "csv"
+        started_from: Only export calls started at or after this time
+        started_before: Only export calls started before this time
+
+    Returns:
+        Iterator[bytes]: The encoded export, in pieces of about CHUNK_BYTES
+
+    Raises:
+        ValueError: If the format is not supported
+    """
+    if export_format not in EXPORT_FORMATS:
+        raise ValueError(f"Unsupported export format: {export_format}")
+
+    calls = iter_calls(senior_id, as_utc(started_from), as_utc(started_before))
+    records = _ndjson_records(calls) if export_format == "ndjson" else _csv_records(calls)
+    return _coalesce(records)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Export call transcripts and analyses")
+    parser.add_argument("--senior-id", default=None, help="Only export this senior's calls (default: all seniors)")
+    parser.add_argument("--start", type=_parse_time, default=None, help="Calls started at or after (ISO date/time, UTC by default)")
+    parser.add_argument("--end", type=_parse_time, default=None, help="Calls started before (ISO date/time)")
+    parser.add_argument("--format", choices=EXPORT_FORMATS, default="ndjson")
+    parser.add_argument("--output", default=None, help="Output file (default: stdout)")
+    args = parser.parse_args()
+
+    output = open(args.output, "wb") if args.output else sys.stdout.buffer
+    try:
+        for piece in export_transcripts(args.senior_id, args.format, args.start, args.end):
+            output.write(piece)
+    finally:
+        if args.output:
+            output.close()
+
+
+if __name__ == "__main__":
+    main()
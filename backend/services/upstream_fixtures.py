@@ -0,0 +1,270 @@
+"""
+Record-and-replay of upstream API exchanges.
+
+In record mode, every exchange with CLOVA Speech, CLOVA Studio and Google TTS
+is appended to a JSON Lines fixture file together with its latency. In replay
+mode, the service modules are served from that file instead of the network,
+with either the recorded latencies or a fixed one, so the same conversation
+can be replayed repeatedly for deterministic performance comparisons.
+
+Configured through settings:
+    upstream_fixture_mode:    "off" (default), "record" or "replay"
+    upstream_fixture_path:    fixture file (JSON Lines)
+    upstream_replay_latency:  "recorded", or a fixed latency in milliseconds
+
+Exchanges are matched by upstream and a hash of the request (method, path
+and body, with multipart boundaries normalized). Recorded exchanges of async
+clients are written from a worker thread, so file writes do not hold up the
+event loop (and the latencies of concurrent requests) during recorded runs. When the same request was
+recorded several times, the recorded responses are served in order and then
+cycled.
+"""
+
+import asyncio
+import base64
+import hashlib
+import json
+import logging
+import os
+import threading
+import time
+from collections import defaultdict
+
+import httpx
+
+from config import settings
+
+# Configure logger
+logger = logging.getLogger(__name__)
+
+
+class UpstreamFixtureError(Exception):
+    """Custom exception for missing or invalid upstream fixtures."""
+    pass
+
+
+class FixtureStore:
+    """
+    Recorded upstream exchanges loaded from (or appended to) a fixture file.
+
+    Attributes:
+        path: Path of the JSON Lines fixture file
+    """
+
+    def __init__(self, path: str):
+        self.path = path
+        self._lock = threading.Lock()
+        self._entries: dict[tuple[str, str], list[dict]] = defaultdict(list)
+        self._cursors: dict[tuple[str, str], int] = defaultdict(int)
+
+        if os.path.exists(path):
+            with open(path, encoding="utf-8") as f:
+                for line in f:
+                    if line.strip():
+                        entry = json.loads(line)
+                        self._entries[(entry["upstream"], entry["request_key"])].append(entry)
+
+    def record(self, entry: dict) -> None:
+        """Append an exchange to the fixture file."""
+        with self._lock:
+            os.makedirs(os.path.dirname(os.path.abspath(self.path)), exist_ok=True)
+            with open(self.path, "a", encoding="utf-8") as f:
+                f.write(json.dumps(entry, ensure_ascii=False) + "\n")
+            self._entries[(entry["upstream"], entry["request_key"])].append(entry)
+
+    def next_entry(self, upstream: str, request_key: str) -> dict:
+        """
+        Return the next recorded exchange for a request.
+
+        Raises:
+            UpstreamFixtureError: If the request was never recorded
+        """
+        key = (upstream, request_key)
+        with self._lock:
+            entries = self._entries.get(key)
+            if not entries:
+                raise UpstreamFixtureError(
+                    f"No recorded {upstream} exchange for request {request_key[:12]} in {self.path}"
+                )
+            entry = entries[self._cursors[key] % len(entries)]
+            self._cursors[key] += 1
+            return entry
+
+
+_stores: dict[str, FixtureStore] = {}
+_stores_lock = threading.Lock()
+
+
+def get_store() -> FixtureStore:
+    """Return the fixture store for the configured fixture path (loaded once)."""
+    path = settings.upstream_fixture_path
+    with _stores_lock:
+        if path not in _stores:
+            _stores[path] = FixtureStore(path)
+        return _stores[path]
+
+
+def request_key(method: str, path: str, body: bytes, content_type: str = "") -> str:
+    """
+    Compute the matching key of a request.
+
+    Multipart boundaries are random per request, so they are replaced by a
+    constant before hashing.
+    """
+    if "boundary=" in content_type:
+        boundary = content_type.split("boundary=", 1)[1].split(";", 1)[0].strip('"').encode()
+        body = body.replace(boundary, b"BOUNDARY")
+    digest = hashlib.sha256()
+    digest.update(f"{method} {path}\n".encode())
+    digest.update(body)
+    return digest.hexdigest()
+
+
+def replay_delay(entry: dict) -> float:
+    """Return how long a replayed exchange should take, in seconds."""
+    if settings.upstream_replay_latency == "recorded":
+        return entry["elapsed_ms"] / 1000
+    return float(settings.upstream_replay_latency) / 1000
+
+
+def _make_entry(upstream: str, key: str, path: str, status_code: int, content_type: str, body: bytes, elapsed: float) -> dict:
+    return {
+        "upstream": upstream,
+        "request_key": key,
+        "path": path,
+        "status_code": status_code,
+        "content_type": content_type,
+        "body_b64": base64.b64encode(body).decode("ascii"),
+        "elapsed_ms": round(elapsed * 1000, 3),
+    }
+
+
+class RecordingTransport(httpx.BaseTransport, httpx.AsyncBaseTransport):
+    """httpx transport (sync and async) that forwards requests to the network and records each exchange."""
+
+    def __init__(self, upstream: str):
+        self.upstream = upstream
+        self._transport = httpx.HTTPTransport()
+        self._async_transport = httpx.AsyncHTTPTransport()
+
+    def handle_request(self, request: httpx.Request) -> httpx.Response:
+        start = time.perf_counter()
+        response = self._transport.handle_request(request)
+        body = response.read()
+        elapsed = time.perf_counter() - start
+        response.close()
+        get_store().record(self._entry(request, response, body, elapsed))
+        return self._response(request, response, body)
+
+    async def handle_async_request(self, request: httpx.Request) -> httpx.Response:
+        start = time.perf_counter()
+        response = await self._async_transport.handle_async_request(request)
+        body = await response.aread()
+        elapsed = time.perf_counter() - start
+        await response.aclose()
+        await asyncio.to_thread(get_store().record, self._entry(request, response, body, elapsed))
+        return self._response(request, response, body)
+
+    def _entry(self, request: httpx.Request, response: httpx.Response, body: bytes, elapsed: float) -> dict:
+        key = request_key(
+            request.method, request.url.path, request.read(), request.headers.get("content-type", "")
+        )
+        return _make_entry(
+            self.upstream, key, request.url.path, response.status_code,
+            response.headers.get("content-type", ""), body, elapsed,
+        )
+
+    def _response(self, request: httpx.Request, response: httpx.Response, body: bytes) -> httpx.Response:
+        # The body is already decoded, so drop the transfer-related headers
+        headers = [
+            (name, value) for name, value in response.headers.items()
+            if name.lower() not in ("content-encoding", "content-length", "transfer-encoding")
+        ]
+        return httpx.Response(
+            status_code=response.status_code,
+            headers=headers,
+            content=body,
+            request=request,
+        )
+
+    def close(self) -> None:
+        self._transport.close()
+
+    async def aclose(self) -> None:
+        await self._async_transport.aclose()
+
+
+class ReplayTransport(httpx.BaseTransport, httpx.AsyncBaseTransport):
+    """httpx transport (sync and async) that serves recorded exchanges without touching the network."""
+
+    def __init__(self, upstream: str):
+        self.upstream = upstream
+
+    def handle_request(self, request: httpx.Request) -> httpx.Response:
+        entry = self._next_entry(request)
+        time.sleep(replay_delay(entry))
+        return self._response(request, entry)
+
+    async def handle_async_request(self, request: httpx.Request) -> httpx.Response:
+        entry = self._next_entry(request)
+        await asyncio.sleep(replay_delay(entry))
+        return self._response(request, entry)
+
+    def _next_entry(self, request: httpx.Request) -> dict:
+        key = request_key(
+            request.method, request.url.path, request.read(), request.headers.get("content-type", "")
+        )
+        return get_store().next_entry(self.upstream, key)
+
+    def _response(self, request: httpx.Request, entry: dict) -> httpx.Response:
+        return httpx.Response(
+            status_code=entry["status_code"],
+            headers={"content-type": entry["content_type"]},
+            content=base64.b64decode(entry["body_b64"]),
+            request=request,
+        )
+
+
+def get_transport(upstream: str) -> RecordingTransport | ReplayTransport | None:
+    """
+    Return the httpx transport to use for an upstream (with a sync or an async client).
+
+    Args:
+        upstream: Upstream name (e.g., "clova_speech", "clova_studio")
+
+    Returns:
+        RecordingTransport | ReplayTransport | None: A recording or replay
+            transport, or None to use the default network transport
+    """
+    mode = settings.upstream_fixture_mode
+    if mode == "record":
+        return RecordingTransport(upstream)
+    if mode == "replay":
+        return ReplayTransport(upstream)
+    return None
+
+
+def record_call(upstream: str, key_material: bytes, body: bytes, elapsed: float) -> None:
+    """
+    Record a non-HTTP upstream call (e.g., the gRPC Google TTS client).
+
+    Args:
+        upstream: Upstream name
+        key_material: Bytes identifying the request (e.g., text and voice)
+        body: Response payload
+        elapsed: Call duration in seconds
+    """
+    key = request_key("CALL", upstream, key_material)
+    get_store().record(_make_entry(upstream, key, upstream, 200, "application/octet-stream", body, elapsed))
+
+
+def replay_call(upstream: str, key_material: bytes) -> bytes:
+    """
+    Serve a recorded non-HTTP upstream call, sleeping for the replay latency.
+
+    Raises:
+        UpstreamFixtureError: If the call was never recorded
+    """
+    entry = get_store().next_entry(upstream, request_key("CALL", upstream, key_material))
+    time.sleep(replay_delay(entry))
+    return base64.b64decode(entry["body_b64"])
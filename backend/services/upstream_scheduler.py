@@ -0,0 +1,328 @@
+"""
+Priority scheduling of the shared upstream quota.
+
+Interactive conversation turns and background work (the /end analysis, the
+quiz pool generator) share the same CLOVA Studio quota. Every request to a
+scheduled upstream first takes a slot from that upstream's scheduler, which
+allows at most the upstream's concurrency (settings.clova_studio_max_concurrency)
+in flight:
+    interactive  granted whenever a slot is free; queued interactive requests
+                 are always served before queued background ones
+    background   granted only while no interactive request is waiting, and
+                 only up to the capacity left after the interactive reserve
+                 (settings.upstream_interactive_reserve), so bursts of turns
+                 always find free slots
+
+Requests already in flight are never interrupted. The priority class is
+carried in a ContextVar: code runs as interactive unless it is inside
+`background_priority()` (which also covers child tasks started from it).
+Time spent waiting for a slot is exported per upstream and priority as
+cooltiger_upstream_queue_wait_seconds.
+
+A background request may wait a long time for its slot, so it must not wait
+in a thread of the default executor, which interactive STT/TTS calls run on
+(asyncio.to_thread): background work uses the async path, or blocking code
+runs in the background executor (`run_in_background`, bounded by
+settings.background_worker_threads).
+
+Example:
+    >>> async with upstream_slot("clova_studio"):
+    ...     response = await client.post(url, json=payload)
+    >>> with background_priority():
+    ...     analysis = await analyze_conversation_async(transcript, profile)
+    >>> await run_in_background(generate_quiz_questions, category, 5)
+"""
+
+import asyncio
+import functools
+import logging
+import threading
+import time
+from collections import deque
+from collections.abc import AsyncIterator, Callable, Iterator
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import asynccontextmanager, contextmanager
+from contextvars import ContextVar, copy_context
+from typing import Any, TypeVar
+
+from config import settings
+from monitoring.metrics import record_queue_wait
+
+# Configure logger
+logger = logging.getLogger(__name__)
+
+INTERACTIVE = "interactive"
+BACKGROUND = "background"
+
+_priority: ContextVar[str] = ContextVar("upstream_priority", default=INTERACTIVE)
+
+T = TypeVar("T")
+
+
+def current_priority() -> str:
+    """Return the priority class of the running code ("interactive" or "background")."""
+    return _priority.get()
+
+
+@contextmanager
+def background_priority() -> Iterator[None]:
+    """Run the block (and the tasks and threads it starts) as background work."""
+    token = _priority.set(BACKGROUND)
+    try:
+        yield
+    finally:
+        _priority.reset(token)
+
+
+class _Waiter:
+    __slots__ = ("priority", "enqueued_at", "granted", "wake")
+
+    def __init__(self, priority: str, wake: Callable[[], None]):
+        self.priority = priority
+        self.enqueued_at = time.perf_counter()
+        self.granted = False
+        self.wake = wake
+
+
+class UpstreamScheduler:
+    """
+    Concurrency slots of one upstream, granted by priority class.
+
+    Usable from coroutines (`slot`) and worker threads (`slot_sync`).
+
+    Attributes:
+        upstream: Upstream name
+        capacity: Maximum requests in flight
+        background_capacity: Maximum requests in flight while granting background work
+    """
+
+    __slots__ = ("upstream", "capacity", "background_capacity", "_lock", "_in_flight", "_waiting")
+
+    def __init__(self, upstream: str, capacity: int, interactive_reserve: float):
+        self.upstream = upstream
+        self.capacity = capacity
+        self.background_capacity = max(1, capacity - round(capacity * interactive_reserve))
+        self._lock = threading.Lock()
+        self._in_flight = 0
+        self._waiting: dict[str, deque[_Waiter]] = {INTERACTIVE: deque(), BACKGROUND: deque()}
+
+    @property
+    def in_flight(self) -> int:
+        return self._in_flight
+
+    def queued(self, priority: str) -> int:
+        return len(self._waiting[priority])
+
+    def _can_grant(self, priority: str) -> bool:
+        # Called with the lock held
+        if priority == INTERACTIVE:
+            return self._in_flight < self.capacity
+        return not self._waiting[INTERACTIVE] and self._in_flight < self.background_capacity
+
+    def _grant(self, waiter: _Waiter) -> None:
+        self._in_flight += 1
+        waiter.granted = True
+        record_queue_wait(self.upstream, waiter.priority, time.perf_counter() - waiter.enqueued_at)
+
+    def _enqueue(self, priority: str, wake: Callable[[], None]) -> _Waiter:
+        """Grant a slot right away if possible, or queue a waiter that `wake` notifies."""
+        waiter = _Waiter(priority, wake)
+        with self._lock:
+            if not self._waiting[priority] and self._can_grant(priority):
+                self._grant(waiter)
+            else:
+                self._waiting[priority].append(waiter)
+        return waiter
+
+    def _dispatch(self) -> None:
+        # Called with the lock held: interactive waiters first, then background
+        for priority in (INTERACTIVE, BACKGROUND):
+            queue = self._waiting[priority]
+            while queue and self._can_grant(priority):
+                waiter = queue.popleft()
+                self._grant(waiter)
+                waiter.wake()
+
+    def release(self) -> None:
+        """Return a slot and grant it to the next waiter."""
+        with self._lock:
+            self._in_flight -= 1
+            self._dispatch()
+
+    def _abandon(self, waiter: _Waiter) -> None:
+        """Withdraw a waiter whose caller gave up (cancelled), releasing its slot if granted."""
+        with self._lock:
+            if not waiter.granted:
+                self._waiting[waiter.priority].remove(waiter)
+                # A background waiter may have been blocked behind it
+                self._dispatch()
+                return
+        self.release()
+
+    @asynccontextmanager
+    async def slot(self, priority: str | None = None) -> AsyncIterator[None]:
+        """
+        Hold a slot for the duration of the block, waiting for one if needed.
+
+        Args:
+            priority: Priority class (the current priority by default)
+        """
+        loop = asyncio.get_running_loop()
+        granted = loop.create_future()
+
+        def wake() -> None:
+            loop.call_soon_threadsafe(lambda: granted.done() or granted.set_result(None))
+
+        waiter = self._enqueue(priority or _priority.get(), wake)
+        if not waiter.granted:
+            try:
+                await granted
+            except asyncio.CancelledError:
+                # Cancelled while queued (e.g. a superseded turn): give the slot back
+                self._abandon(waiter)
+                raise
+        try:
+            yield
+        finally:
+            self.release()
+
+    @contextmanager
+    def slot_sync(self, priority: str | None = None) -> Iterator[None]:
+        """
+        Blocking counterpart of `slot` for worker threads.
+
+        Must not be called on the event loop's thread, whose coroutines may
+        hold the slots it waits for. Background work calls it only from the
+        background executor (see `run_in_background`), so waiting threads
+        never take default-executor threads from interactive calls.
+
+        Raises:
+            RuntimeError: If called on a thread running an event loop
+        """
+        try:
+            asyncio.get_running_loop()
+        except RuntimeError:
+            pass
+        else:
+            raise RuntimeError(f"Blocking {self.upstream} slot requested on the event loop; use slot()")
+
+        granted = threading.Event()
+        waiter = self._enqueue(priority or _priority.get(), granted.set)
+        if not waiter.granted:
+            granted.wait()
+        try:
+            yield
+        finally:
+            self.release()
+
+
+# Schedulers per upstream, created on first use
+_schedulers: dict[str, UpstreamScheduler] = {}
+_schedulers_lock = threading.Lock()
+
+
+def _capacity(upstream: str) -> int:
+    if upstream == "clova_studio":
+        return settings.clova_studio_max_concurrency
+    return 0
+
+
+def get_scheduler(upstream: str) -> UpstreamScheduler | None:
+    """
+    Return the scheduler of an upstream.
+
+    Args:
+        upstream: Upstream name (only "clova_studio" is scheduled)
+
+    Returns:
+        UpstreamScheduler | None: The scheduler, or None if the upstream is
+                                  not scheduled (capacity 0)
+    """
+    scheduler = _schedulers.get(upstream)
+    if scheduler is None:
+        capacity = _capacity(upstream)
+        if capacity <= 0:
+            return None
+        with _schedulers_lock:
+            scheduler = _schedulers.get(upstream)
+            if scheduler is None:
+                scheduler = UpstreamScheduler(upstream, capacity, settings.upstream_interactive_reserve)
+                _schedulers[upstream] = scheduler
+                logger.info(
+                    f"Scheduling {upstream}: {capacity} slots, "
+                    f"{scheduler.background_capacity} usable by background work"
+                )
+    return scheduler
+
+
+@asynccontextmanager
+async def upstream_slot(upstream: str) -> AsyncIterator[None]:
+    """Hold a slot of the upstream's scheduler (at the current priority) during the block."""
+    scheduler = get_scheduler(upstream)
+    if scheduler is None:
+        yield
+        return
+    async with scheduler.slot():
+        yield
+
+
+@contextmanager
+def upstream_slot_sync(upstream: str) -> Iterator[None]:
+    """Blocking counterpart of `upstream_slot` for worker threads."""
+    scheduler = get_scheduler(upstream)
+    if scheduler is None:
+        yield
+        return
+    with scheduler.slot_sync():
+        yield
+
+
+# Worker threads of blocking background work, created on first use
+_background_executor: ThreadPoolExecutor | None = None
+_background_executor_lock = threading.Lock()
+
+
+def _get_background_executor() -> ThreadPoolExecutor:
+    global _background_executor
+    if _background_executor is None:
+        with _background_executor_lock:
+            if _background_executor is None:
+                _background_executor = ThreadPoolExecutor(
+                    max_workers=max(1, settings.background_worker_threads),
+                    thread_name_prefix="background",
+                )
+    return _background_executor
+
+
+async def run_in_background(func: Callable[..., T], /, *args: Any) -> T:
+    """
+    Run a blocking function as background work, in the background executor.
+
+    Counterpart of asyncio.to_thread for background jobs: the function runs
+    at background priority (with a copy of the caller's context) on one of
+    settings.background_worker_threads dedicated threads, so its slot waits
+    never occupy the default executor used by interactive calls.
+
+    Args:
+        func: Blocking function
+        *args: Positional arguments of func
+
+    Returns:
+        T: The function's return value
+
+    Example:
+        >>> await run_in_background(generator.refill)
+    """
+    context = copy_context()
+    context.run(_priority.set, BACKGROUND)
+    loop = asyncio.get_running_loop()
+    return await loop.run_in_executor(_get_background_executor(), functools.partial(context.run, func, *args))
+
+
+def shutdown_background_executor() -> None:
+    """Stop the background executor's threads (at shutdown), dropping queued work."""
+    global _background_executor
+    with _background_executor_lock:
+        executor, _background_executor = _background_executor, None
+    if executor is not None:
+        executor.shutdown(wait=False, cancel_futures=True)
@@ -0,0 +1,239 @@
+"""
+Startup warm-up and readiness of Firestore and the upstream APIs.
+
+Importing the SDKs, credential discovery, TLS handshakes and gRPC channel
+setup otherwise happen on the first request after a cold start. At startup,
+the application imports the SDKs in a worker thread, then runs warm-up
+probes in the background: each component makes one cheap round trip
+through its shared client, which leaves an authenticated, pooled connection
+behind for the first real request.
+
+Components:
+    firestore        sync Firestore client (db.firestore_client)
+    firestore_async  async Firestore client (db.async_firestore)
+    clova_speech     HEAD request to the CLOVA Speech endpoint
+    clova_studio     HEAD requests to the CLOVA Studio endpoint, on both the
+                     sync and the async shared client
+    google_tts       voice listing on the shared Google TTS client
+
+Upstreams that are not configured, or that are served from fixtures, are
+skipped. Components that fail are probed again every
+settings.warmup_retry_seconds. The instance is ready (GET /health/ready) once
+every component has warmed up, and stays ready afterwards. Once ready, probes
+are repeated every settings.upstream_keepalive_seconds (when set) so idle
+connections are not closed.
+"""
+
+import asyncio
+import importlib
+import logging
+import time
+from collections.abc import Awaitable, Callable
+from datetime import datetime, timezone
+
+from config import settings
+from db import async_firestore, firestore_client
+from services import google_tts
+from services.http_clients import aclose_http_clients, close_http_clients, get_async_http_client, get_http_client
+
+# Configure logger
+logger = logging.getLogger(__name__)
+
+COMPONENTS = ("firestore", "firestore_async", "clova_speech", "clova_studio", "google_tts")
+
+# SDKs the service modules import on first use, imported in a worker thread
+# before the probes so neither the event loop nor the first request pays for it
+SDK_MODULES = (
+    "firebase_admin.firestore",
+    "firebase_admin.firestore_async",
+    "google.cloud.firestore",
+    "google.cloud.texttospeech",
+    "google.api_core.exceptions",
+)
+
+
+class ComponentStatus:
+    """
+    Warm-up state of one component.
+
+    Attributes:
+        state: "pending", "ok", "failed" or "skipped"
+        latency_ms: Duration of the last probe
+        checked_at: When the component was last probed
+        error: Error of the last failed probe
+    """
+
+    __slots__ = ("state", "latency_ms", "checked_at", "error")
+
+    def __init__(self, state: str = "pending"):
+        self.state = state
+        self.latency_ms: float | None = None
+        self.checked_at: datetime | None = None
+        self.error: str | None = None
+
+    def to_dict(self) -> dict:
+        return {
+            "state": self.state,
+            "latency_ms": None if self.latency_ms is None else round(self.latency_ms, 1),
+            "checked_at": self.checked_at.isoformat() if self.checked_at else None,
+            "error": self.error,
+        }
+
+
+_status: dict[str, ComponentStatus] = {name: ComponentStatus() for name in COMPONENTS}
+_ready_at: datetime | None = None
+
+
+def is_ready() -> bool:
+    """Return whether every component has warmed up (readiness is kept once reached)."""
+    return _ready_at is not None
+
+
+def get_status() -> dict:
+    """
+    Return the readiness and per-component warm-up state.
+
+    Example:
+        >>> get_status()
+        {'ready': True, 'ready_at': '2025-11-20T09:00:02+00:00', 'components': {'firestore': {...}, ...}}
+    """
+    return {
+        "ready": is_ready(),
+        "ready_at": _ready_at.isoformat() if _ready_at else None,
+        "components": {name: status.to_dict() for name, status in _status.items()},
+    }
+
+
+def mark_ready() -> None:
+    """Mark the instance ready without warming up (when settings.warmup_enabled is off)."""
+    global _ready_at
+    if _ready_at is None:
+        _ready_at = datetime.now(timezone.utc)
+
+
+def import_sdks() -> None:
+    """Import the SDK modules listed in SDK_MODULES."""
+    for name in SDK_MODULES:
+        importlib.import_module(name)
+
+
+def _probe_http(upstream: str, endpoint: str) -> None:
+    # Any response means the connection (and TLS session) is established and pooled
+    get_http_client(upstream).head(endpoint)
+
+
+async def _probe_studio() -> None:
+    # Replies use the async client, call analysis the sync one
+    endpoint = settings.clova_studio_endpoint
+    await asyncio.gather(
+        get_async_http_client("clova_studio").head(endpoint),
+        asyncio.to_thread(_probe_http, "clova_studio", endpoint),
+    )
+
+
+def _probe_tts() -> None:
+    from google.api_core.exceptions import DeadlineExceeded, GoogleAPICallError, ServiceUnavailable
+
+    try:
+        google_tts.get_client().list_voices(language_code=settings.google_tts_language_code)
+    except (ServiceUnavailable, DeadlineExceeded):
+        raise
+    except GoogleAPICallError as e:
+        # The API answered (e.g., a test server without voice listing)
+        logger.debug(f"Google TTS warm-up probe answered with {e.code}")
+
+
+def _probes() -> dict[str, Callable[[], Awaitable[None]] | None]:
+    """Return the probe of each component, None for skipped components."""
+    upstreams_live = settings.upstream_fixture_mode == "off"
+    probes: dict[str, Callable[[], Awaitable[None]] | None] = {
+        "firestore": lambda: asyncio.to_thread(firestore_client.ping, settings.warmup_timeout_seconds),
+        "firestore_async": lambda: async_firestore.ping(settings.warmup_timeout_seconds),
+        "clova_speech": None,
+        "clova_studio": None,
+        "google_tts": None,
+    }
+    if upstreams_live and settings.clova_speech_endpoint:
+        probes["clova_speech"] = lambda: get_async_http_client("clova_speech").head(settings.clova_speech_endpoint)
+    if upstreams_live and settings.clova_studio_endpoint:
+        probes["clova_studio"] = _probe_studio
+    if upstreams_live and settings.google_tts_language_code:
+        probes["google_tts"] = lambda: asyncio.to_thread(_probe_tts)
+    return probes
+
+
+async def _run_probe(name: str, probe: Callable[[], Awaitable[None]] | None) -> None:
+    status = _status[name]
+    if probe is None:
+        status.state = "skipped"
+        return
+
+    start = time.perf_counter()
+    try:
+        await asyncio.wait_for(probe(), timeout=settings.warmup_timeout_seconds)
+    except Exception as e:
+        status.state = "failed"
+        status.error = str(e) or type(e).__name__
+        logger.warning(f"Warm-up of {name} failed: {status.error}")
+    else:
+        status.state = "ok"
+        status.error = None
+    finally:
+        status.latency_ms = (time.perf_counter() - start) * 1000
+        status.checked_at = datetime.now(timezone.utc)
+
+
+async def warm_up(components: list[str] | None = None) -> bool:
+    """
+    Probe components concurrently and update their warm-up state.
+
+    Args:
+        components: Components to probe (default: all)
+
+    Returns:
+        bool: Whether the instance is ready
+    """
+    global _ready_at
+    probes = _probes()
+    names = components if components is not None else list(COMPONENTS)
+    await asyncio.gather(*(_run_probe(name, probes[name]) for name in names))
+
+    if _ready_at is None and all(status.state in ("ok", "skipped") for status in _status.values()):
+        _ready_at = datetime.now(timezone.utc)
+        timings = ", ".join(
+            f"{name} {status.latency_ms:.0f}ms" for name, status in _status.items() if status.state == "ok"
+        )
+        logger.info(f"Warm-up complete: {timings}")
+    return is_ready()
+
+
+async def run_warmup() -> None:
+    """
+    Background job: warm up, retry failed components until ready, then keep connections alive.
+
+    Example:
+        >>> task = asyncio.create_task(run_warmup())
+    """
+    started = time.perf_counter()
+    await asyncio.to_thread(import_sdks)
+    logger.info(f"Imported SDKs in {(time.perf_counter() - started) * 1000:.0f}ms")
+
+    await warm_up()
+    while True:
+        if is_ready():
+            interval = settings.upstream_keepalive_seconds
+            components = None
+        else:
+            interval = settings.warmup_retry_seconds
+            components = [name for name, status in _status.items() if status.state == "failed"]
+        if interval <= 0:
+            return
+        await asyncio.sleep(interval)
+        await warm_up(components)
+
+
+async def close_clients() -> None:
+    """Close the shared upstream clients (at shutdown)."""
+    await aclose_http_clients()
+    close_http_clients()
+    google_tts.close_client()
@@ -261,6 +261,11 @@ class _SeniorCallScreenState extends State<SeniorCallScreen> {
       final response = await _dio.post(
         '$kBaseApiUrl/conversation/reply',
         data: formData,
+        // Identify the call before the upload (checked by the rate limits)
+        options: Options(headers: {
+          'X-Senior-Id': widget.seniorId,
+          'X-Call-Id': _callId,
+        }),
       );
 
       if (response.statusCode == 200) {